@@ -0,0 +1,48 @@
+"""Micro-benchmarks for Actor and ZRect attribute access.
+
+Run with::
+
+    python benchmarks/bench_actor.py
+
+"""
+import os
+from timeit import repeat
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from pgzero.actor import Actor  # noqa: E402
+from pgzero.loaders import set_root  # noqa: E402
+from pgzero.rect import ZRect  # noqa: E402
+
+
+class Plain:
+    __slots__ = ('left',)
+
+
+def bench(label, stmt, namespace, number=1_000_000):
+    best = min(repeat(stmt, globals=namespace, number=number, repeat=5))
+    print(f"{label:<30} {best / number * 1e9:8.1f} ns")
+
+
+def main():
+    pygame.display.set_mode((100, 100))
+    set_root(os.path.join(os.path.dirname(__file__), '..', 'test'))
+
+    plain = Plain()
+    plain.left = 0
+    ns = {'actor': Actor('alien'), 'plain': plain, 'zrect': ZRect(1, 2, 3, 4)}
+
+    bench("slot read", "plain.left", ns)
+    bench("slot write", "plain.left = 1", ns)
+    bench("zrect.left read", "zrect.left", ns)
+    bench("zrect.centerx read", "zrect.centerx", ns)
+    bench("actor.left read", "actor.left", ns)
+    bench("actor.left write", "actor.left = 1", ns)
+    bench("actor.center read", "actor.center", ns)
+    bench("actor.x += 1", "actor.x += 1", ns)
+
+
+if __name__ == '__main__':
+    main()
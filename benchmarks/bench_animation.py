@@ -0,0 +1,32 @@
+"""Benchmark stepping many animations at once.
+
+Run with::
+
+    python benchmarks/bench_animation.py
+
+"""
+from time import perf_counter
+from types import SimpleNamespace
+
+from pgzero.animation import animate
+from pgzero.clock import Clock
+
+FRAMES = 120
+
+
+def bench(n, tween):
+    clock = Clock()
+    objs = [SimpleNamespace(x=0, pos=(0, 0)) for _ in range(n)]
+    for i, obj in enumerate(objs):
+        animate(obj, tween, duration=10, clock=clock, x=i, pos=(i, i))
+    start = perf_counter()
+    for _ in range(FRAMES):
+        clock.tick(1 / 60)
+    elapsed = perf_counter() - start
+    print(f"{n:6} animations {tween:<16} {elapsed * 1e3 / FRAMES:8.3f} ms/frame")
+
+
+if __name__ == '__main__':
+    for n in (10, 100, 1000, 5000):
+        for tween in ('linear', 'in_out_elastic', 'bounce_start_end'):
+            bench(n, tween)
@@ -0,0 +1,76 @@
+"""Benchmark drawing sprites from separate surfaces and from an atlas.
+
+Run with::
+
+    python benchmarks/bench_atlas.py
+
+"""
+import os
+import random
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from pgzero.atlas import build_atlas  # noqa: E402
+
+SPRITES = 2000
+IMAGES = 50
+FRAMES = 50
+
+
+def timeit(draw):
+    start = perf_counter()
+    for _ in range(FRAMES):
+        draw()
+    return (perf_counter() - start) * 1e3 / FRAMES
+
+
+def main(tmp):
+    screen = pygame.display.set_mode((800, 600))
+    rng = random.Random(0)
+    paths = {}
+    for i in range(IMAGES):
+        surf = pygame.Surface((rng.randint(16, 48), rng.randint(16, 48)),
+                              pygame.SRCALPHA)
+        surf.fill((rng.randrange(256), rng.randrange(256), 255, 200))
+        paths[f'img{i}'] = os.path.join(tmp, f'img{i}.png')
+        pygame.image.save(surf, paths[f'img{i}'])
+
+    separate = {
+        name: pygame.image.load(p).convert_alpha() for name, p in paths.items()
+    }
+    atlas = build_atlas(paths)
+    atlas.convert_alpha()
+    sprites = [
+        (f'img{rng.randrange(IMAGES)}', (rng.randrange(800), rng.randrange(600)))
+        for _ in range(SPRITES)
+    ]
+
+    def draw_separate():
+        for name, pos in sprites:
+            screen.blit(separate[name], pos)
+
+    def draw_subsurfaces():
+        for name, pos in sprites:
+            screen.blit(atlas[name], pos)
+
+    def draw_batched():
+        screen.blits(
+            [(page, pos, rect) for page, rect, pos in batch], doreturn=False
+        )
+
+    batch = [(*atlas.source(name), pos) for name, pos in sprites]
+    for name, draw in [
+        ('separate surfaces', draw_separate),
+        ('atlas subsurfaces', draw_subsurfaces),
+        ('atlas, one blits()', draw_batched),
+    ]:
+        print(f"{name:<20} {timeit(draw):7.2f} ms for {SPRITES} sprites")
+
+
+if __name__ == '__main__':
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        main(tmp)
@@ -0,0 +1,84 @@
+"""Benchmark scheduling and unscheduling with many clock events.
+
+Run with::
+
+    python benchmarks/bench_clock.py
+
+"""
+from time import perf_counter
+
+from pgzero.clock import Clock
+
+N = 10000
+
+
+def make_callbacks(n):
+    callbacks = []
+    for i in range(n):
+        def cb():
+            pass
+        callbacks.append(cb)
+    return callbacks
+
+
+def bench(name, func):
+    clock = Clock()
+    callbacks = make_callbacks(N)
+    for i, cb in enumerate(callbacks):
+        clock.schedule(cb, 1 + i % 100)
+    start = perf_counter()
+    func(clock, callbacks)
+    elapsed = perf_counter() - start
+    print(f"{name:<20} {elapsed * 1e6 / N:8.2f} us per call")
+
+
+def unschedule(clock, callbacks):
+    for cb in callbacks:
+        clock.unschedule(cb)
+
+
+def schedule_unique(clock, callbacks):
+    for cb in callbacks:
+        clock.schedule_unique(cb, 50)
+
+
+def tick(clock, callbacks):
+    for _ in range(100):
+        clock.tick(1)
+
+
+def bench_intervals():
+    clock = Clock()
+    callbacks = make_callbacks(1000)
+    for cb in callbacks:
+        clock.schedule_interval(cb, 0.01)
+    frames = 600
+    start = perf_counter()
+    for _ in range(frames):
+        clock.tick(1 / 60)
+    elapsed = perf_counter() - start
+    print(f"{'tick (intervals)':<20} {elapsed * 1e3 / frames:8.2f} ms per frame"
+          " (1000 timers)")
+
+
+def bench_each_tick():
+    clock = Clock()
+    callbacks = [lambda dt: None for _ in range(500)]
+    for cb in callbacks:
+        clock.each_tick(cb)
+    frames = 600
+    start = perf_counter()
+    for _ in range(frames):
+        clock.tick(1 / 60)
+    elapsed = perf_counter() - start
+    print(f"{'tick (each_tick)':<20} {elapsed * 1e3 / frames:8.2f} ms per frame"
+          " (500 callbacks)")
+
+
+if __name__ == '__main__':
+    print(f"{N} scheduled events")
+    bench('unschedule', unschedule)
+    bench('schedule_unique', schedule_unique)
+    bench('tick (all events)', tick)
+    bench_intervals()
+    bench_each_tick()
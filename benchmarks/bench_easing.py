@@ -0,0 +1,76 @@
+"""Benchmark evaluating tween functions directly and from lookup tables.
+
+Run with::
+
+    python benchmarks/bench_easing.py
+
+"""
+from time import perf_counter
+from types import SimpleNamespace
+
+import numpy as np
+
+from pgzero.animation import (
+    animate, cubic_bezier, use_lookup_tables, lookup_table,
+    TWEEN_FUNCTIONS, VECTORISED_TWEENS, _lookup
+)
+from pgzero.clock import Clock
+
+TWEENS = ('linear', 'in_out_elastic', 'bounce_start_end', 'ease')
+SAMPLES = 10000
+FRAMES = 120
+
+
+def timeit(func, repeat=20):
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def bench_evaluate(name):
+    func = TWEEN_FUNCTIONS[name]
+    n = np.random.default_rng(0).random(SAMPLES)
+    values = n.tolist()
+    use_lookup_tables()
+    table = lookup_table(func)
+    use_lookup_tables(False)
+    scalar = timeit(lambda: [func(v) for v in values], repeat=5)
+    vector = timeit(lambda: VECTORISED_TWEENS[func](n))
+    lut = timeit(lambda: _lookup(n, table))
+    print(
+        f"{name:<18} scalar {scalar * 1e3:7.3f} ms  "
+        f"numpy {vector * 1e3:7.3f} ms  lut {lut * 1e3:7.3f} ms"
+        f"  ({SAMPLES} values)"
+    )
+
+
+def bench_animate(n, name, lut):
+    use_lookup_tables(lut)
+    clock = Clock()
+    objs = [SimpleNamespace(x=0) for _ in range(n)]
+    for i, obj in enumerate(objs):
+        animate(obj, name, duration=10, clock=clock, x=i)
+    start = perf_counter()
+    for _ in range(FRAMES):
+        clock.tick(1 / 60)
+    elapsed = perf_counter() - start
+    use_lookup_tables(False)
+    mode = 'lut' if lut else 'direct'
+    print(
+        f"{n:6} animations {name:<18} {mode:<6} "
+        f"{elapsed * 1e3 / FRAMES:8.3f} ms/frame"
+    )
+
+
+if __name__ == '__main__':
+    cubic_bezier('ease', .25, .1, .25, 1)
+    for name in TWEENS:
+        bench_evaluate(name)
+    print()
+    for n in (10, 1000):
+        for name in TWEENS:
+            for lut in (False, True):
+                bench_animate(n, name, lut)
@@ -0,0 +1,57 @@
+"""Benchmark finding resources by name, by probing and from an index.
+
+Run with::
+
+    python benchmarks/bench_find.py
+
+"""
+import os
+from time import perf_counter
+
+from pgzero import loaders
+from pgzero.loaders import ImageLoader, validate_compatible_path
+
+IMAGES = 500
+
+
+def probe(directory, name):
+    """Find a file the way the loaders did before they kept an index."""
+    p = os.path.join(directory, name)
+    if not os.path.isfile(p):
+        for ext in ImageLoader.EXTNS:
+            p = os.path.join(directory, name + '.' + ext)
+            if os.path.exists(p):
+                break
+    validate_compatible_path(p)
+    return p
+
+
+def main(tmp):
+    loaders.root = tmp
+    directory = os.path.join(tmp, 'images')
+    os.mkdir(directory)
+    names = [f'img{i}' for i in range(IMAGES)]
+    for i, name in enumerate(names):
+        ext = ImageLoader.EXTNS[i % len(ImageLoader.EXTNS)]
+        open(os.path.join(directory, f'{name}.{ext}'), 'w').close()
+
+    start = perf_counter()
+    for name in names:
+        probe(directory, name)
+    probed = perf_counter() - start
+
+    images = ImageLoader('images')
+    start = perf_counter()
+    for name in names:
+        images._find(name)
+    indexed = perf_counter() - start
+
+    print(f'Finding {IMAGES} images, us per image')
+    print(f'probing:  {probed * 1e6 / IMAGES:7.2f}')
+    print(f'index:    {indexed * 1e6 / IMAGES:7.2f}  (including listing)')
+
+
+if __name__ == '__main__':
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        main(tmp)
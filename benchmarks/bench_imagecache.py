@@ -0,0 +1,69 @@
+"""Benchmark loading images by decoding them and from the image cache.
+
+Run with::
+
+    python benchmarks/bench_imagecache.py
+
+"""
+import os
+import random
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from pgzero.imagecache import ImageCache  # noqa: E402
+
+IMAGES = 20
+SIZE = (512, 512)
+
+
+def make_image(rng):
+    surf = pygame.Surface(SIZE, pygame.SRCALPHA)
+    for _ in range(200):
+        color = [rng.randrange(256) for _ in range(4)]
+        pos = rng.randrange(SIZE[0]), rng.randrange(SIZE[1])
+        pygame.draw.circle(surf, color, pos, rng.randint(5, 80))
+    return surf
+
+
+def timeit(load, paths):
+    start = perf_counter()
+    for path in paths:
+        load(path)
+    return (perf_counter() - start) * 1e3 / len(paths)
+
+
+def main(tmp):
+    pygame.display.set_mode((100, 100))
+    rng = random.Random(0)
+    paths = []
+    for i in range(IMAGES):
+        path = os.path.join(tmp, f'img{i}.png')
+        pygame.image.save(make_image(rng), path)
+        paths.append(path)
+
+    cache = ImageCache(os.path.join(tmp, 'cache'))
+
+    def load_cold(path):
+        surf = pygame.image.load(path)
+        cache.put(path, surf)
+        return surf.convert_alpha()
+
+    def load_warm(path):
+        return cache.get(path).convert_alpha()
+
+    def load_plain(path):
+        return pygame.image.load(path).convert_alpha()
+
+    print(f'{IMAGES} PNG images of {SIZE[0]}x{SIZE[1]}, ms per image')
+    print(f'decode:             {timeit(load_plain, paths):7.2f}')
+    print(f'decode and store:   {timeit(load_cold, paths):7.2f}')
+    print(f'cached:             {timeit(load_warm, paths):7.2f}')
+
+
+if __name__ == '__main__':
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp:
+        main(tmp)
@@ -0,0 +1,58 @@
+"""Benchmark loading images one by one against prefetching them.
+
+Run with::
+
+    python benchmarks/bench_loaders.py
+
+"""
+import os
+import tempfile
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from pgzero import loaders  # noqa: E402
+
+COUNT = 64
+SIZE = 512
+
+
+def make_images(root):
+    os.mkdir(os.path.join(root, 'images'))
+    rng = np.random.default_rng(0)
+    for i in range(COUNT):
+        surf = pygame.Surface((SIZE, SIZE), pygame.SRCALPHA)
+        pixels = rng.integers(0, 256, (SIZE, SIZE, 3), dtype=np.uint8)
+        pygame.surfarray.blit_array(surf, pixels)
+        pygame.image.save(surf, os.path.join(root, 'images', f'img{i}.png'))
+
+
+def bench(name, load):
+    loader = loaders.ImageLoader('images')
+    start = perf_counter()
+    load(loader)
+    elapsed = perf_counter() - start
+    assert len(loader._cache) == COUNT
+    print(f"{name:<10} {elapsed * 1e3:8.1f} ms for {COUNT} images")
+
+
+def sequential(loader):
+    for i in range(COUNT):
+        loader.load(f'img{i}')
+
+
+def prefetch(loader):
+    loader.preload().wait()
+
+
+if __name__ == '__main__':
+    pygame.display.init()
+    pygame.display.set_mode((100, 100))
+    with tempfile.TemporaryDirectory() as root:
+        make_images(root)
+        loaders.set_root(root)
+        bench('sequential', sequential)
+        bench('prefetch', prefetch)
@@ -0,0 +1,68 @@
+"""Benchmark spatial indexes against a naive all-pairs collision loop.
+
+Run with::
+
+    python benchmarks/bench_spatial.py
+
+"""
+import random
+from time import perf_counter
+
+from pgzero.rect import ZRect
+from pgzero.spatial import SpatialHash, QuadTree
+
+WIDTH, HEIGHT = 1600, 1200
+
+
+def make_rects(n):
+    rng = random.Random(0)
+    return [
+        ZRect(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT), 16, 16)
+        for _ in range(n)
+    ]
+
+
+def naive(rects):
+    hits = 0
+    for i, a in enumerate(rects):
+        for b in rects[i + 1:]:
+            if a.colliderect(b):
+                hits += 1
+    return hits
+
+
+def indexed(index, rects):
+    # Move everything a little, as in a real frame, then find collisions.
+    for r in rects:
+        r.x += 0.5
+    index.refresh()
+    hits = 0
+    for r in rects:
+        hits += len(index.collisions(r))
+    return hits // 2
+
+
+def timed(label, func, *args):
+    start = perf_counter()
+    result = func(*args)
+    print(f"    {label:<12} {(perf_counter() - start) * 1e3:9.1f} ms  "
+          f"({result} pairs)")
+
+
+def main():
+    for n in (100, 1000, 3000):
+        print(f"{n} rects:")
+        rects = make_rects(n)
+        timed("naive", naive, rects)
+
+        grid = SpatialHash(cell_size=32)
+        tree = QuadTree((0, 0, WIDTH, HEIGHT))
+        for r in rects:
+            grid.insert(r)
+            tree.insert(r)
+        timed("SpatialHash", indexed, grid, rects)
+        timed("QuadTree", indexed, tree, rects)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark a cutscene of chained animations against a Timeline.
+
+Run with::
+
+    python benchmarks/bench_timeline.py
+
+"""
+from time import perf_counter
+from types import SimpleNamespace
+
+from pgzero.animation import animate
+from pgzero.clock import Clock
+from pgzero.timeline import Timeline, tween, sequence, parallel
+
+STEPS = 10
+STEP_TIME = 0.5
+# Chained animations fall behind by up to a frame per step
+FRAMES = int(STEPS * STEP_TIME * 60) + STEPS
+
+
+def chained(clock, actors):
+    """Start each actor's next move from the last one's on_finished."""
+    def move(obj, step):
+        if step < STEPS:
+            animate(
+                obj, 'accel_decel', STEP_TIME, clock=clock,
+                on_finished=lambda: move(obj, step + 1),
+                pos=(step * 10, step * 5),
+            )
+    for obj in actors:
+        move(obj, 0)
+
+
+def timeline(clock, actors):
+    Timeline(
+        parallel(*(
+            sequence(*(
+                tween(obj, 'accel_decel', STEP_TIME, pos=(step * 10, step * 5))
+                for step in range(STEPS)
+            ))
+            for obj in actors
+        )),
+        clock=clock,
+    ).play()
+
+
+def bench(n, setup):
+    clock = Clock()
+    actors = [SimpleNamespace(pos=(0, 0)) for _ in range(n)]
+    setup(clock, actors)
+    start = perf_counter()
+    for _ in range(FRAMES):
+        clock.tick(1 / 60)
+    elapsed = perf_counter() - start
+    assert all(obj.pos == ((STEPS - 1) * 10, (STEPS - 1) * 5) for obj in actors)
+    print(
+        f"{n:5} actors {setup.__name__:<10} "
+        f"{elapsed * 1e3 / FRAMES:8.3f} ms/frame"
+    )
+
+
+if __name__ == '__main__':
+    for n in (10, 100, 1000):
+        for setup in (chained, timeline):
+            bench(n, setup)
@@ -1,10 +1,13 @@
 import pygame
+from collections import OrderedDict
+from functools import wraps
 from math import radians, sin, cos, atan2, degrees, sqrt
 
 from . import game
 from . import loaders
 from . import rect
 from . import spellcheck
+from .screen import screen_instance
 from .surface_painter import SurfacePainter
 
 ANCHORS = {
@@ -47,6 +50,10 @@ ANCHOR_CENTER = None
 
 MAX_ALPHA = 255  # Based on pygame's max alpha.
 
+# Angles are rounded to a multiple of this (in degrees) before rotating, so
+# that actors at almost the same angle can share a rotated surface.
+ANGLE_QUANTUM = 0.5
+
 
 def transform_anchor(ax, ay, w, h, angle):
     """Transform anchor based upon a rotation of a surface of size w x h."""
@@ -73,15 +80,82 @@ def transform_anchor(ax, ay, w, h, angle):
     )
 
 
+class RotationAtlas:
+    """A set of pre-rotated frames of an image.
+
+    The frames are rotated in equal steps of 360 / steps degrees. The
+    dimensions of each frame, and the position of an anchor point within each
+    frame, are computed once so that rotating an actor becomes a lookup.
+
+    """
+
+    def __init__(self, surf, steps):
+        if steps < 1:
+            raise ValueError("A rotation atlas needs at least one step.")
+        self.steps = steps
+        self.step = 360 / steps
+        self.frames = [surf]
+        self.sizes = [surf.get_size()]
+        w, h = self.size = surf.get_size()
+        for i in range(1, steps):
+            angle = i * self.step
+            self.frames.append(pygame.transform.rotate(surf, angle))
+            ra = radians(angle)
+            sin_a = sin(ra)
+            cos_a = cos(ra)
+            self.sizes.append((
+                abs(w * cos_a) + abs(h * sin_a),
+                abs(w * sin_a) + abs(h * cos_a),
+            ))
+        self._anchors = {}
+        self.anchors(w * 0.5, h * 0.5)
+
+    def index(self, angle):
+        """Get the index of the frame nearest to angle."""
+        return round(angle / self.step) % self.steps
+
+    def anchors(self, ax, ay):
+        """Get the position of the anchor (ax, ay) within each frame."""
+        try:
+            return self._anchors[ax, ay]
+        except KeyError:
+            w, h = self.size
+            anchors = self._anchors[ax, ay] = [
+                transform_anchor(ax, ay, w, h, i * self.step)
+                for i in range(self.steps)
+            ]
+            return anchors
+
+
+# Rotation atlases, by image name; see Actor.prerotate()
+rotation_atlases = {}
+
+
+def _angle_key(actor):
+    atlas = rotation_atlases.get(actor._image_name)
+    if atlas is not None:
+        return atlas.index(actor._angle) * atlas.step
+    return round(actor._angle % 360 / ANGLE_QUANTUM) * ANGLE_QUANTUM % 360
+
+
+def _alpha_key(actor):
+    return int(actor.opacity * MAX_ALPHA + 0.5)  # +0.5 for rounding up.
+
+
 def _set_angle(actor, current_surface):
-    if actor._angle % 360 == 0:
+    atlas = rotation_atlases.get(actor._image_name)
+    if atlas is not None and current_surface is atlas.frames[0]:
+        return atlas.frames[atlas.index(actor._angle)]
+
+    angle = _angle_key(actor)
+    if angle == 0:
         # No changes required for default angle.
         return current_surface
-    return pygame.transform.rotate(current_surface, actor._angle)
+    return pygame.transform.rotate(current_surface, angle)
 
 
 def _set_opacity(actor, current_surface):
-    alpha = int(actor.opacity * MAX_ALPHA + 0.5)  # +0.5 for rounding up.
+    alpha = _alpha_key(actor)
 
     if alpha == MAX_ALPHA:
         # No changes required for fully opaque surfaces (corresponds to the
@@ -98,6 +172,82 @@ def _set_opacity(actor, current_surface):
     return alpha_img
 
 
+# For each transform function that can share its results between actors, a
+# function returning the value (from the actor) that determines its output.
+TRANSFORM_KEYS = {
+    _set_opacity: _alpha_key,
+    _set_angle: _angle_key,
+}
+
+
+class TransformCache:
+    """A cache of transformed surfaces, shared between all Actors.
+
+    Surfaces are keyed on the image name, the source surface and the
+    (quantised) parameters of each transform applied, so that - for example -
+    500 bullets with the same image and angle share a single rotated surface.
+    Keying on the source surface means that reloading an image, or loading
+    one of the same name from another root, doesn't reuse stale surfaces.
+
+    When the cached surfaces take up more than max_bytes, the least recently
+    used surfaces are discarded.
+
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._surfs = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfs)
+
+    def __repr__(self):
+        return '<{} surfaces={} bytes={} hits={} misses={}>'.format(
+            type(self).__name__,
+            len(self._surfs),
+            self.bytes,
+            self.hits,
+            self.misses,
+        )
+
+    @staticmethod
+    def _surf_bytes(surf):
+        return surf.get_pitch() * surf.get_height()
+
+    def get(self, key):
+        """Get the surface cached under key, or None if it is not cached."""
+        try:
+            surf = self._surfs[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._surfs.move_to_end(key)
+        self.hits += 1
+        return surf
+
+    def put(self, key, surf):
+        """Store a surface in the cache, evicting old surfaces if needed."""
+        old = self._surfs.pop(key, None)
+        if old is not None:
+            self.bytes -= self._surf_bytes(old)
+        self._surfs[key] = surf
+        self.bytes += self._surf_bytes(surf)
+        while self.bytes > self.max_bytes and len(self._surfs) > 1:
+            _, evicted = self._surfs.popitem(last=False)
+            self.bytes -= self._surf_bytes(evicted)
+
+    def clear(self):
+        """Discard all cached surfaces and reset the hit/miss counters."""
+        self._surfs.clear()
+        self.bytes = self.hits = self.misses = 0
+
+
+transform_cache = TransformCache()
+
+
 class Actor:
     EXPECTED_INIT_KWARGS = SYMBOLIC_POSITIONS
     DELEGATED_ATTRIBUTES = [
@@ -108,6 +258,7 @@ class Actor:
     _anchor = _anchor_value = (0, 0)
     _angle = 0.0
     _opacity = 1.0
+    _mask = None
 
     def _build_transformed_surf(self):
         cache_len = len(self._surface_cache)
@@ -115,17 +266,38 @@ class Actor:
             last = self._orig_surf
         else:
             last = self._surface_cache[-1]
+
+        # The key identifying the output of each transform in the shared
+        # cache; None once we reach a transform that can't be shared.
+        key = (self._image_name, self._orig_surf)
+        for f in self.function_order[:cache_len]:
+            key = self._transform_key(key, f)
+
         for f in self.function_order[cache_len:]:
-            new_surf = f(self, last)
+            key = self._transform_key(key, f)
+            new_surf = None if key is None else transform_cache.get(key)
+            if new_surf is None:
+                new_surf = f(self, last)
+                if key is not None and new_surf is not last:
+                    transform_cache.put(key, new_surf)
             self._surface_cache.append(new_surf)
             last = new_surf
         return self._surface_cache[-1]
 
+    def _transform_key(self, key, function):
+        if key is None:
+            return None
+        try:
+            get_param = TRANSFORM_KEYS[function]
+        except KeyError:
+            return None
+        return key + (function, get_param(self))
+
     def __init__(self, image, pos=POS_TOPLEFT, anchor=ANCHOR_CENTER, **kwargs):
         self._handle_unexpected_kwargs(kwargs)
 
         self._surface_cache = []
-        self.__dict__["_rect"] = rect.ZRect((0, 0), (0, 0))
+        self._rect = rect.ZRect((0, 0), (0, 0))
         # Initialise it at (0, 0) for size (0, 0).
         # We'll move it to the right place and resize it later
 
@@ -133,19 +305,13 @@ class Actor:
         self._init_position(pos, anchor, **kwargs)
 
     def __getattr__(self, attr):
+        # Rect attributes are normally found through the descriptors created
+        # by _delegate_to_rect(); this is only reached for missing attributes.
         if attr in self.__class__.DELEGATED_ATTRIBUTES:
             return getattr(self._rect, attr)
         else:
             return object.__getattribute__(self, attr)
 
-    def __setattr__(self, attr, value):
-        """Assign rect attributes to the underlying rect."""
-        if attr in self.__class__.DELEGATED_ATTRIBUTES:
-            return setattr(self._rect, attr, value)
-        else:
-            # Ensure data descriptors are set normally
-            return object.__setattr__(self, attr, value)
-
     def __iter__(self):
         return iter(self._rect)
 
@@ -217,6 +383,7 @@ class Actor:
         if function in self.function_order:
             i = self.function_order.index(function)
             del self._surface_cache[i:]
+            self._mask = None
         else:
             raise IndexError(
                 "function {!r} does not have a registered order."
@@ -237,10 +404,16 @@ class Actor:
         ax = calculate_anchor(ax, 'x', ow)
         ay = calculate_anchor(ay, 'y', oh)
         self._untransformed_anchor = ax, ay
-        if self._angle == 0.0:
+        atlas = rotation_atlases.get(self._image_name)
+        if atlas is not None:
+            self._anchor = atlas.anchors(ax, ay)[atlas.index(self._angle)]
+            return
+        # Use the angle the surface is actually rotated by
+        angle = _angle_key(self)
+        if angle == 0:
             self._anchor = self._untransformed_anchor
         else:
-            self._anchor = transform_anchor(ax, ay, ow, oh, self._angle)
+            self._anchor = transform_anchor(ax, ay, ow, oh, angle)
 
     @property
     def angle(self):
@@ -249,8 +422,21 @@ class Actor:
     @angle.setter
     def angle(self, angle):
         self._angle = angle
+        atlas = rotation_atlases.get(self._image_name)
+        if atlas is not None:
+            i = atlas.index(angle)
+            self.width, self.height = atlas.sizes[i]
+            p = self.pos
+            self._anchor = atlas.anchors(*self._untransformed_anchor)[i]
+            self.pos = p
+            self._update_transform(_set_angle)
+            return
+
         w, h = self._orig_surf.get_size()
 
+        # The rect and anchor follow the angle the surface is rotated by, so
+        # that what is drawn and what is hit-tested agree
+        angle = _angle_key(self)
         ra = radians(angle)
         sin_a = sin(ra)
         cos_a = cos(ra)
@@ -262,6 +448,20 @@ class Actor:
         self.pos = p
         self._update_transform(_set_angle)
 
+    @staticmethod
+    def prerotate(image, steps=72):
+        """Pre-render rotated frames of an image, for fast rotation.
+
+        After this, actors using the image are drawn using the nearest of
+        `steps` pre-rotated frames (so rotation is in steps of 360 / steps
+        degrees) rather than rotating the image each time their angle
+        changes.
+
+        """
+        atlas = RotationAtlas(loaders.images.load(image), steps)
+        rotation_atlases[image] = atlas
+        return atlas
+
     @property
     def opacity(self):
         """Get/set the current opacity value.
@@ -329,6 +529,7 @@ class Actor:
         self._image_name = image
         self._orig_surf = loaders.images.load(image)
         self._surface_cache.clear()  # Clear out old image's cache.
+        self._mask = None
         self._update_pos()
 
     def _update_pos(self):
@@ -339,7 +540,34 @@ class Actor:
 
     def draw(self):
         s = self._build_transformed_surf()
-        game.screen.blit(s, self.topleft)
+        r = game.screen.blit(s, self.topleft)
+        dirty = screen_instance._dirty
+        if dirty is not None:
+            dirty.append(r)
+
+    def _get_mask(self):
+        """Get a mask of the visible pixels of the actor, as drawn."""
+        if self._mask is None:
+            self._mask = pygame.mask.from_surface(
+                self._build_transformed_surf()
+            )
+        return self._mask
+
+    def collide_mask(self, other):
+        """Return True if the visible pixels of this actor overlap other's.
+
+        This is more precise than colliderect(), which tests the actors'
+        bounding rectangles; those are still tested first, so that actors
+        that are far apart are rejected quickly.
+        """
+        r = self._rect
+        o = other._rect
+        if not (r.x < o.x + o.w and r.y < o.y + o.h and
+                r.x + r.w > o.x and r.y + r.h > o.y):
+            return False
+        # Offsets are truncated in the same way as the blits in draw()
+        offset = int(o.x) - int(r.x), int(o.y) - int(r.y)
+        return self._get_mask().overlap(other._get_mask(), offset) is not None
 
     def angle_to(self, target):
         """Return the angle from this actors position to target, in degrees."""
@@ -370,3 +598,67 @@ class Actor:
     @property
     def paint(self):
         return SurfacePainter(self.surface)
+
+
+def _delegate_to_rect(name):
+    """Create a descriptor for Actor that delegates name to the actor's rect.
+
+    Properties of ZRect become properties that read and write the
+    corresponding attribute of ``actor._rect``; methods become methods that
+    are called with ``actor._rect`` as self.
+    """
+    attr = getattr(rect.ZRect, name)
+    if not hasattr(attr, '__set__'):
+        @wraps(attr)
+        def method(self, *args, **kwargs):
+            return attr(self._rect, *args, **kwargs)
+        return method
+
+    get_attr = attr.__get__
+    set_attr = attr.__set__
+
+    def fget(self):
+        return get_attr(self._rect)
+
+    def fset(self, value):
+        set_attr(self._rect, value)
+
+    return property(fget, fset, doc=attr.__doc__)
+
+
+for _name in Actor.DELEGATED_ATTRIBUTES:
+    if _name not in vars(Actor):
+        setattr(Actor, _name, _delegate_to_rect(_name))
+del _name
+
+
+class SpriteGroup(list):
+    """A list of Actors that are drawn together.
+
+    Drawing a SpriteGroup gives the same result as calling ``.draw()`` on
+    each actor in turn, but all the actors are rendered with a single
+    ``Surface.blits()`` call, and actors that lie entirely off the screen are
+    skipped.
+
+    """
+
+    def draw(self):
+        """Draw all the actors in the group that are visible on the screen.
+
+        Actors are drawn in the order they appear in the group.
+        """
+        surf = game.screen
+        sw, sh = surf.get_size()
+        batch = []
+        for actor in self:
+            r = actor._rect
+            x = r.x
+            y = r.y
+            if x >= sw or y >= sh or x + r.w <= 0 or y + r.h <= 0:
+                continue
+            batch.append((actor._build_transformed_surf(), (x, y)))
+        dirty = screen_instance._dirty
+        if dirty is None:
+            surf.blits(batch, False)
+        else:
+            dirty.extend(surf.blits(batch))
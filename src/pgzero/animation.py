@@ -2,19 +2,40 @@
 #  http://www.clutter-project.org/docs/clutter/stable/ClutterAlpha.html
 
 
+import traceback
 from math import sin, pow, pi
+from weakref import WeakKeyDictionary, ref
 
-from .clock import each_tick, unschedule
+import numpy as np
+
+from . import clock as _clock
 from .spellcheck import suggest
 
 TWEEN_FUNCTIONS = {}
 
+# NumPy versions of tween functions, keyed by the scalar function. Tween
+# functions without a NumPy version are called once per animation.
+VECTORISED_TWEENS = {}
+
 
 def tweener(f):
+    previous = TWEEN_FUNCTIONS.get(f.__name__)
+    if previous is not None and previous is not f:
+        # Forget the version of the tween being replaced
+        VECTORISED_TWEENS.pop(previous, None)
+        _lookup_tables.pop(previous, None)
     TWEEN_FUNCTIONS[f.__name__] = f
     return f
 
 
+def vectorised(f):
+    """Register the decorated function as the NumPy version of tweener f."""
+    def register(vf):
+        VECTORISED_TWEENS[f] = vf
+        return vf
+    return register
+
+
 @tweener
 def linear(n):
     return n
@@ -112,6 +133,258 @@ def bounce_start_end(n):
     return _out_bounce_internal(p - 1., 1.) * .5 + .5
 
 
+@vectorised(linear)
+def _linear(n):
+    return n
+
+
+@vectorised(accelerate)
+def _accelerate(n):
+    return n * n
+
+
+@vectorised(decelerate)
+def _decelerate(n):
+    return -1.0 * n * (n - 2.0)
+
+
+@vectorised(accel_decel)
+def _accel_decel(n):
+    p = n * 2
+    q = p - 1.0
+    return np.where(p < 1, 0.5 * p * p, -0.5 * (q * (q - 2.0) - 1.0))
+
+
+@vectorised(in_elastic)
+def _in_elastic(n):
+    p = .3
+    s = p / 4.0
+    q = n - 1.0
+    return np.where(
+        n == 1, 1.0, -(np.power(2, 10 * q) * np.sin((q - s) * (2 * pi) / p))
+    )
+
+
+@vectorised(out_elastic)
+def _out_elastic(n):
+    p = .3
+    s = p / 4.0
+    return np.where(
+        n == 1, 1.0, np.power(2, -10 * n) * np.sin((n - s) * (2 * pi) / p) + 1.0
+    )
+
+
+@vectorised(in_out_elastic)
+def _in_out_elastic(n):
+    p = .3 * 1.5
+    s = p / 4.0
+    q = n * 2 - 1.0
+    wave = np.sin((q - s) * (2.0 * pi) / p)
+    return np.where(
+        n == 1,
+        1.0,
+        np.where(
+            q < 0,
+            -.5 * (np.power(2, 10 * q) * wave),
+            np.power(2, -10 * q) * wave * .5 + 1.0
+        )
+    )
+
+
+def _out_bounce_array(p):
+    return np.select(
+        [p < (1.0 / 2.75), p < (2.0 / 2.75), p < (2.5 / 2.75)],
+        [
+            7.5625 * p * p,
+            7.5625 * (p - 1.5 / 2.75) ** 2 + .75,
+            7.5625 * (p - 2.25 / 2.75) ** 2 + .9375,
+        ],
+        7.5625 * (p - 2.625 / 2.75) ** 2 + .984375
+    )
+
+
+@vectorised(bounce_end)
+def _bounce_end(n):
+    return _out_bounce_array(n)
+
+
+@vectorised(bounce_start)
+def _bounce_start(n):
+    return 1.0 - _out_bounce_array(1.0 - n)
+
+
+@vectorised(bounce_start_end)
+def _bounce_start_end(n):
+    p = n * 2.
+    return np.where(
+        p < 1.,
+        (1.0 - _out_bounce_array(1.0 - p)) * .5,
+        _out_bounce_array(p - 1.) * .5 + .5
+    )
+
+
+def _bezier_coefficients(p1, p2):
+    """Get polynomial coefficients of one axis of a cubic Bezier curve.
+
+    The curve runs from 0 to 1 with control points p1 and p2, so that
+    the value at t is ((a * t + b) * t + c) * t.
+    """
+    c = 3.0 * p1
+    b = 3.0 * (p2 - p1) - c
+    a = 1.0 - c - b
+    return a, b, c
+
+
+def cubic_bezier(name, x1, y1, x2, y2):
+    """Register a tween function following a cubic Bezier curve.
+
+    As with CSS's ``cubic-bezier()``, the curve runs from (0, 0) to (1, 1)
+    with control points (x1, y1) and (x2, y2); x is the progress through the
+    animation and y the progress between the start and end values. x1 and x2
+    must be between 0 and 1, while y1 and y2 may overshoot.
+
+    The new tween can be used by name with animate(). It is also returned.
+    """
+    if not (0 <= x1 <= 1 and 0 <= x2 <= 1):
+        raise ValueError(
+            'x1 and x2 must be between 0 and 1, not %r and %r' % (x1, x2)
+        )
+    ax, bx, cx = _bezier_coefficients(x1, x2)
+    ay, by, cy = _bezier_coefficients(y1, y2)
+
+    def solve(n):
+        # Newton's method usually converges in a few steps...
+        t = n
+        for _ in range(8):
+            err = ((ax * t + bx) * t + cx) * t - n
+            if abs(err) < 1e-9:
+                return t
+            slope = (3.0 * ax * t + 2.0 * bx) * t + cx
+            if abs(slope) < 1e-6:
+                break
+            t -= err / slope
+        # ...but may not where the curve is flat, so fall back to bisection
+        lo, hi = 0.0, 1.0
+        t = n
+        while hi - lo > 1e-9:
+            if ((ax * t + bx) * t + cx) * t < n:
+                lo = t
+            else:
+                hi = t
+            t = (lo + hi) / 2
+        return t
+
+    def bezier(n):
+        if n <= 0 or n >= 1:
+            return float(n >= 1)
+        t = solve(n)
+        return ((ay * t + by) * t + cy) * t
+
+    @vectorised(bezier)
+    def _bezier(n):
+        # Bisection converges everywhere, and costs little over an array
+        lo = np.zeros_like(n)
+        hi = np.ones_like(n)
+        for _ in range(32):
+            t = (lo + hi) * 0.5
+            below = ((ax * t + bx) * t + cx) * t < n
+            lo = np.where(below, t, lo)
+            hi = np.where(below, hi, t)
+        t = (lo + hi) * 0.5
+        y = ((ay * t + by) * t + cy) * t
+        return np.where(n <= 0, 0.0, np.where(n >= 1, 1.0, y))
+
+    bezier.__name__ = name
+    bezier.__qualname__ = name
+    return tweener(bezier)
+
+
+# Number of intervals each tween function is sampled at for lookup tables
+LOOKUP_RESOLUTION = 1024
+
+# Positions at which the lookup tables are sampled, or None if lookup
+# tables are not in use
+_lookup_x = None
+
+# Lookup tables, keyed by tween function
+_lookup_tables = {}
+
+
+def use_lookup_tables(enabled=True, resolution=LOOKUP_RESOLUTION):
+    """Evaluate tween functions for animations using lookup tables.
+
+    When enabled, each tween function is sampled at resolution + 1 evenly
+    spaced points, and animations interpolate linearly between the samples
+    instead of calling the function. This is faster for the elastic and
+    bounce tweens and for user-defined tweens, at the cost of a small error:
+    at the default resolution, up to about 0.002 of the animated distance
+    for the bounce tweens, and much less for smooth tweens.
+
+    Tables for the tweens registered so far are built immediately; tables
+    for tweens registered later are built when they are first used.
+    """
+    global _lookup_x
+    _lookup_tables.clear()
+    if not enabled:
+        _lookup_x = None
+        return
+    if resolution < 1:
+        raise ValueError('resolution must be at least 1, not %r' % resolution)
+    _lookup_x = np.linspace(0.0, 1.0, resolution + 1)
+    for func in TWEEN_FUNCTIONS.values():
+        lookup_table(func)
+
+
+def lookup_table(func):
+    """Get the lookup table for the tween function func.
+
+    Return None if lookup tables are not in use.
+    """
+    if _lookup_x is None:
+        return None
+    table = _lookup_tables.get(func)
+    if table is None:
+        vf = VECTORISED_TWEENS.get(func)
+        if vf is not None:
+            table = np.asarray(vf(_lookup_x), dtype=np.float64)
+        else:
+            table = np.array([func(v) for v in _lookup_x.tolist()])
+        _lookup_tables[func] = table
+    return table
+
+
+def _lookup(n, table):
+    """Interpolate linearly in a lookup table at the values in array n.
+
+    The table's samples are evenly spaced, so this indexes the table
+    directly rather than searching it as np.interp() does.
+    """
+    intervals = len(table) - 1
+    p = n * intervals
+    i = np.clip(p.astype(np.intp), 0, intervals - 1)
+    lo = table[i]
+    return lo + (p - i) * (table[i + 1] - lo)
+
+
+def get_tween(name):
+    """Get the tween function called name.
+
+    Raise KeyError, suggesting a similar name if there is one, if there is
+    no such tween.
+    """
+    try:
+        return TWEEN_FUNCTIONS[name]
+    except KeyError:
+        suggested_tween = suggest(name, TWEEN_FUNCTIONS.keys())
+        if len(suggested_tween) > 0:
+            raise KeyError(
+                'No tween called %s found, did you mean %s?'
+                % (name, suggested_tween[0])
+            )
+        else:
+            raise KeyError('No tween called %s found.' % name)
+
+
 def tween(n, start, end):
     return start + (end - start) * n
 
@@ -125,6 +398,257 @@ def tween_attr(n, start, end):
         return tween(n, start, end)
 
 
+def _number(v):
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+# Below this many values with the same tween function, calling the scalar
+# function is faster than the NumPy version
+VECTORISE_MIN = 32
+
+
+def ease_all(functions, ids, n):
+    """Apply tween functions to an array n of progress values.
+
+    ids is an array giving, for each value in n, the index in the list
+    functions of the tween function to apply to it.
+    """
+    if len(functions) == 1:
+        groups = [(functions[0], None)]
+    else:
+        groups = [
+            (functions[i], ids == i)
+            for i in np.unique(ids).tolist()
+        ]
+    eased = np.empty(len(n))
+    for func, mask in groups:
+        vf = VECTORISED_TWEENS.get(func)
+        x = n if mask is None else n[mask]
+        if _lookup_x is not None:
+            y = _lookup(x, lookup_table(func))
+        elif vf is not None and len(x) >= VECTORISE_MIN:
+            y = vf(x)
+        else:
+            y = [func(v) for v in x.tolist()]
+        if mask is None:
+            eased[:] = y
+        else:
+            eased[mask] = y
+    return eased
+
+
+class AnimationManager:
+    """Step all of the animations running on a clock at once.
+
+    The time, duration and tween function of each animation are kept in
+    NumPy arrays, as are the start and end values of every number being
+    animated (a "lane"; a tuple target has one lane per item). Each tick,
+    the tween functions are evaluated for all animations together and all
+    lanes are interpolated in one operation, so the per-animation Python
+    work is just setting the attributes.
+
+    Targets whose values aren't numbers, or tuples or lists of numbers, are
+    interpolated in Python with tween_attr().
+
+    """
+
+    INITIAL_CAPACITY = 16
+
+    def __init__(self, clock):
+        self._clock = ref(clock)
+        # Running animations, in the order they were started; stopped
+        # animations are replaced with None until the arrays are compacted
+        self.animations = []
+        self._dead = 0
+        self._updating = False
+        cap = self.INITIAL_CAPACITY
+        self._t = np.zeros(cap)
+        self._duration = np.ones(cap)
+        self._tween = np.zeros(cap, dtype=np.intp)
+        self._lanes = 0
+        self._lane_start = np.zeros(cap)
+        self._lane_end = np.zeros(cap)
+        self._lane_anim = np.zeros(cap, dtype=np.intp)
+        # Tween functions in use, and their ids in self._tween
+        self._tween_funcs = []
+        self._tween_ids = {}
+
+    def __len__(self):
+        return len(self.animations) - self._dead
+
+    @staticmethod
+    def _grow(arr, size):
+        if size <= len(arr):
+            return arr
+        new = np.zeros(max(size, 2 * len(arr)), dtype=arr.dtype)
+        new[:len(arr)] = arr
+        return new
+
+    def add(self, anim, lane_start, lane_end):
+        """Start stepping anim, which animates the given lanes."""
+        clock = self._clock()
+        if not len(self) or not clock._has_each_tick(self.update):
+            clock.each_tick(self.update)
+
+        i = len(self.animations)
+        self._t = self._grow(self._t, i + 1)
+        self._duration = self._grow(self._duration, i + 1)
+        self._tween = self._grow(self._tween, i + 1)
+        self._t[i] = 0.0
+        self._duration[i] = anim.duration
+        tween_id = self._tween_ids.get(anim.function)
+        if tween_id is None:
+            tween_id = self._tween_ids[anim.function] = len(self._tween_funcs)
+            self._tween_funcs.append(anim.function)
+        self._tween[i] = tween_id
+
+        base = self._lanes
+        end = base + len(lane_start)
+        self._lane_start = self._grow(self._lane_start, end)
+        self._lane_end = self._grow(self._lane_end, end)
+        self._lane_anim = self._grow(self._lane_anim, end)
+        self._lane_start[base:end] = lane_start
+        self._lane_end[base:end] = lane_end
+        self._lane_anim[base:end] = i
+        self._lanes = end
+
+        anim._index = i
+        anim._lane_base = base
+        anim._lane_count = end - base
+        self.animations.append(anim)
+
+    def remove(self, anim):
+        """Stop stepping anim."""
+        self.animations[anim._index] = None
+        self._dead += 1
+        if not len(self):
+            self._clock().unschedule(self.update)
+        if not self._updating and self._dead > len(self.animations) // 2:
+            self._compact()
+
+    def time(self, anim):
+        """Get the time anim has been running."""
+        return float(self._t[anim._index])
+
+    def _compact(self):
+        """Remove stopped animations from the arrays."""
+        anims = self.animations
+        alive = np.array([a is not None for a in anims], dtype=bool)
+        idx = np.flatnonzero(alive)
+        m = len(idx)
+        self._t[:m] = self._t[idx]
+        self._duration[:m] = self._duration[idx]
+        self._tween[:m] = self._tween[idx]
+
+        lanes = self._lanes
+        lane_anim = self._lane_anim[:lanes]
+        lidx = np.flatnonzero(alive[lane_anim])
+        remap = np.cumsum(alive) - 1
+        k = len(lidx)
+        self._lane_start[:k] = self._lane_start[lidx]
+        self._lane_end[:k] = self._lane_end[lidx]
+        self._lane_anim[:k] = remap[lane_anim[lidx]]
+        self._lanes = k
+
+        self.animations = [a for a in anims if a is not None]
+        base = 0
+        for i, a in enumerate(self.animations):
+            a._index = i
+            a._lane_base = base
+            base += a._lane_count
+        self._dead = 0
+
+    def step(self, anim, dt):
+        """Step only anim by dt seconds, as update() steps every animation."""
+        i = anim._index
+        self._t[i] += dt
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = self._t[i:i + 1] / self._duration[i:i + 1]
+        if n[0] > 1:
+            anim._finish()
+            return
+        eased = ease_all([anim.function], None, n)[0]
+        lanes = slice(anim._lane_base, anim._lane_base + anim._lane_count)
+        start = self._lane_start[lanes]
+        end = self._lane_end[lanes]
+        anim._apply(float(eased), (start + (end - start) * eased).tolist(), 0)
+
+    def set_time(self, anim, t):
+        """Set the time anim has been running."""
+        self._t[anim._index] = t
+
+    def _ease(self, n, count):
+        """Apply each animation's tween function to n."""
+        return ease_all(self._tween_funcs, self._tween[:count], n)
+
+    def update(self, dt):
+        """Step all animations by dt seconds."""
+        anims = self.animations
+        count = len(anims)
+        if not count:
+            return
+
+        t = self._t[:count]
+        t += dt
+        with np.errstate(divide='ignore', invalid='ignore'):
+            n = t / self._duration[:count]
+        finished = (n > 1).tolist()
+        np.minimum(n, 1.0, out=n)
+        eased = self._ease(n, count)
+
+        lanes = self._lanes
+        start = self._lane_start[:lanes]
+        end = self._lane_end[:lanes]
+        values = (
+            start + (end - start) * eased[self._lane_anim[:lanes]]
+        ).tolist()
+        eased = eased.tolist()
+
+        self._updating = True
+        try:
+            for i in range(count):
+                anim = anims[i]
+                if anim is None:
+                    continue
+                try:
+                    if finished[i]:
+                        anim._finish()
+                    else:
+                        anim._apply(eased[i], values, anim._lane_base)
+                except Exception:
+                    traceback.print_exc()
+                    if anims[i] is anim:
+                        anim.stop()
+        finally:
+            self._updating = False
+        if self._dead:
+            self._compact()
+
+
+# The AnimationManager for each clock
+_managers = WeakKeyDictionary()
+
+
+def get_manager(clock):
+    """Get the AnimationManager that steps animations on clock."""
+    manager = _managers.get(clock)
+    if manager is None:
+        manager = _managers[clock] = AnimationManager(clock)
+    return manager
+
+
+def _stop_animations(clock):
+    """Stop all of the animations on clock, which is being cleared."""
+    manager = _managers.pop(clock, None)
+    if manager is not None:
+        for anim in list(manager.animations):
+            if anim is not None:
+                anim.stop()
+
+
+_clock.clear_hooks.append(_stop_animations)
+
+
 class Animation:
     """An animation manager for object attribute animations.
 
@@ -135,8 +659,9 @@ class Animation:
     If the value is a list or tuple, then each value inside that will
     be tweened.
 
-    The update() method is automatically scheduled with the clock for
-    the duration of the animation.
+    The animation is stepped by the AnimationManager of a clock for the
+    duration of the animation. By default this is the default clock; clock
+    may be another Clock, or the name of a clock made with clock.create().
 
     """
     animations = []  # Stores strong references to objects being animated.
@@ -152,25 +677,20 @@ class Animation:
     _animation_dict = {}
 
     def __init__(self, object, tween='linear', duration=1, on_finished=None,
-                 **targets):
+                 clock=None, **targets):
         self.targets = targets
-        try:
-            self.function = TWEEN_FUNCTIONS[tween]
-        except KeyError:
-            suggested_tween = suggest(tween, TWEEN_FUNCTIONS.keys())
-            if len(suggested_tween) > 0:
-                raise KeyError(
-                    'No tween called %s found, did you mean %s?'
-                    % (tween, suggested_tween[0])
-                )
-            else:
-                raise KeyError('No tween called %s found.' % tween)
+        self.function = get_tween(tween)
+        if clock is None:
+            clock = _clock.clock
+        elif isinstance(clock, str):
+            clock = _clock.get(clock)
+        self.clock = clock
         self.duration = duration
         self.on_finished = on_finished
-        self.t = 0
         self.object = object
         self.initial = {}
         self._running = True
+        self._t = 0
         for k in self.targets:
             try:
                 a = getattr(object, k)
@@ -184,7 +704,33 @@ class Animation:
             if previous_animation is not None:
                 previous_animation._remove_target(k)
             self._animation_dict[key] = self
-        each_tick(self.update)
+
+        # For each target, (attribute, type, first lane, number of lanes)
+        self._writers = []
+        lane_start = []
+        lane_end = []
+        for k, end in self.targets.items():
+            start = self.initial[k]
+            if _number(start) and _number(end):
+                kind = float
+                starts = [start]
+                ends = [end]
+            elif (isinstance(start, (tuple, list))
+                    and all(map(_number, start))
+                    and isinstance(end, (tuple, list))
+                    and all(map(_number, end))):
+                kind = type(start)
+                starts = start[:len(end)]
+                ends = end[:len(start)]
+            else:
+                kind = None
+                starts = ends = ()
+            self._writers.append((k, kind, len(lane_start), len(starts)))
+            lane_start.extend(starts)
+            lane_end.extend(ends)
+
+        self._manager = get_manager(clock)
+        self._manager.add(self, lane_start, lane_end)
         self.animations.append(self)
 
     @property
@@ -196,19 +742,48 @@ class Animation:
         """
         return self._running
 
+    @property
+    def t(self):
+        """The time for which the animation has been running."""
+        if self._running:
+            return self._manager.time(self)
+        return self._t
+
+    @t.setter
+    def t(self, t):
+        if self._running:
+            self._manager.set_time(self, t)
+        else:
+            self._t = t
+
     def update(self, dt):
-        self.t += dt
-        n = self.t / self.duration
-        if n > 1:
-            n = 1
-            self.stop(complete=True)
-            if self.on_finished is not None:
-                self.on_finished()
-            return
-        n = self.function(n)
-        for k in self.targets:
-            v = tween_attr(n, self.initial[k], self.targets[k])
-            setattr(self.object, k, v)
+        """Step the animation by dt seconds.
+
+        Running animations are stepped by their clock, so this is only
+        needed to drive an animation by hand.
+        """
+        if self._running:
+            self._manager.step(self, dt)
+
+    def _apply(self, n, values, base):
+        """Set the targets given the tweened progress n and lane values."""
+        obj = self.object
+        for k, kind, lane, count in self._writers:
+            lane += base
+            if kind is float:
+                v = values[lane]
+            elif kind is tuple:
+                v = tuple(values[lane:lane + count])
+            elif kind is list:
+                v = values[lane:lane + count]
+            else:
+                v = tween_attr(n, self.initial[k], self.targets[k])
+            setattr(obj, k, v)
+
+    def _finish(self):
+        self.stop(complete=True)
+        if self.on_finished is not None:
+            self.on_finished()
 
     def stop(self, complete=False):
         """Stop the animation, optionally completing the transition to the final
@@ -223,22 +798,28 @@ class Animation:
             # Don't do anything if already stopped.
             return
 
+        self._t = self._manager.time(self)
         self._running = False
-        if complete:
-            for k in self.targets:
-                setattr(self.object, k, self.targets[k])
-        for k in list(self.targets):
-            self._remove_target(k, stop=False)
-        unschedule(self.update)
-        self.animations.remove(self)
+        try:
+            if complete:
+                for k in self.targets:
+                    setattr(self.object, k, self.targets[k])
+        finally:
+            # Forget the animation even if setting a target fails
+            for k in list(self.targets):
+                self._remove_target(k, stop=False)
+            self._manager.remove(self)
+            self.animations.remove(self)
 
     def _remove_target(self, target, stop=True):
         del self.targets[target]
         del self._animation_dict[id(self.object), target]
+        self._writers = [w for w in self._writers if w[0] != target]
         if not self.targets and stop:
             self.stop()
 
 
-def animate(object, tween='linear', duration=1, on_finished=None, **targets):
+def animate(object, tween='linear', duration=1, on_finished=None, clock=None,
+            **targets):
     return Animation(object, tween, duration, on_finished=on_finished,
-                     **targets)
+                     clock=clock, **targets)
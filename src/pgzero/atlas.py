@@ -0,0 +1,290 @@
+"""Texture atlases, which pack many small images into a few large surfaces.
+
+Each image in an atlas is a subsurface of one of the atlas's pages, so it
+can be used exactly like an image loaded on its own, but the images share a
+few large blocks of memory, and images on the same page can be drawn with a
+single call to ``Surface.blits()``.
+
+Atlases are normally built by the image loader::
+
+    images.build_atlas()
+
+or ahead of time with ``pgzrun --build-atlas game.py``, which saves the
+atlas into ``images/.atlas/``. A saved atlas is used automatically as long
+as none of the images have changed since it was built.
+
+"""
+import json
+import os
+
+import pygame
+
+__all__ = ['TextureAtlas', 'SkylinePacker', 'pack', 'build_atlas']
+
+
+# Size of each page of an atlas
+PAGE_SIZE = 1024
+
+# Images larger than this in either dimension are not packed
+MAX_IMAGE_SIZE = 256
+
+# Transparent pixels left between images, so that they don't bleed into each
+# other when scaled or rotated
+PADDING = 1
+
+# Name of the file indexing a saved atlas
+INDEX_FILE = 'index.json'
+INDEX_VERSION = 1
+
+
+class SkylinePacker:
+    """Pack rectangles into a fixed-size area, bottom-left first.
+
+    The packer keeps the "skyline" of the rectangles placed so far - the
+    height of the highest rectangle at each x position, as a list of
+    horizontal segments - and places each new rectangle where its top would
+    be lowest.
+
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # (x, y, width) of each segment of the skyline, left to right
+        self.skyline = [(0, 0, width)]
+
+    def _fit(self, i, w, h):
+        """Get the y position of a w x h rectangle at segment i, or None."""
+        skyline = self.skyline
+        x = skyline[i][0]
+        if x + w > self.width:
+            return None
+        y = 0
+        remaining = w
+        while remaining > 0:
+            _, sy, sw = skyline[i]
+            y = max(y, sy)
+            if y + h > self.height:
+                return None
+            remaining -= sw
+            i += 1
+        return y
+
+    def insert(self, w, h):
+        """Place a w x h rectangle, returning (x, y), or None if it won't fit.
+        """
+        best = None
+        for i, (x, _, _) in enumerate(self.skyline):
+            y = self._fit(i, w, h)
+            if y is not None and (best is None or (y + h, x) < best[0]):
+                best = (y + h, x), i, x, y
+        if best is None:
+            return None
+        _, i, x, y = best
+        self._place(i, x, y, w, h)
+        return x, y
+
+    def _place(self, i, x, y, w, h):
+        skyline = self.skyline
+        skyline.insert(i, (x, y + h, w))
+        # Trim the segments now under the new one
+        right = x + w
+        j = i + 1
+        while j < len(skyline):
+            sx, sy, sw = skyline[j]
+            if sx >= right:
+                break
+            if sx + sw <= right:
+                del skyline[j]
+            else:
+                skyline[j] = (right, sy, sx + sw - right)
+                break
+        # Merge neighbouring segments of the same height
+        j = 0
+        while j < len(skyline) - 1:
+            sx, sy, sw = skyline[j]
+            nx, ny, nw = skyline[j + 1]
+            if sy == ny:
+                skyline[j] = (sx, sy, sw + nw)
+                del skyline[j + 1]
+            else:
+                j += 1
+
+
+def pack(sizes, page_size=PAGE_SIZE, padding=PADDING):
+    """Pack rectangles of the given sizes onto as few pages as possible.
+
+    Return a list of (page, x, y) for each size, in the same order.
+    Raise ValueError if a rectangle is larger than a page.
+    """
+    # Placing the tallest rectangles first packs them more tightly
+    order = sorted(
+        range(len(sizes)),
+        key=lambda i: (-sizes[i][1], -sizes[i][0]),
+    )
+    pages = []
+    placed = [None] * len(sizes)
+    for i in order:
+        w, h = sizes[i]
+        w += padding
+        h += padding
+        if w > page_size or h > page_size:
+            raise ValueError(
+                'a %dx%d rectangle does not fit on a %dx%d page'
+                % (sizes[i] + (page_size, page_size))
+            )
+        for page, packer in enumerate(pages):
+            pos = packer.insert(w, h)
+            if pos is not None:
+                break
+        else:
+            page = len(pages)
+            packer = SkylinePacker(page_size, page_size)
+            pages.append(packer)
+            pos = packer.insert(w, h)
+        placed[i] = (page, *pos)
+    return placed
+
+
+class TextureAtlas:
+    """Images packed into the pages of a texture atlas.
+
+    Index an atlas by name to get an image, as a subsurface of its page.
+    source(name) gets the page and the rect of the image on it, for
+    Surface.blits().
+
+    """
+
+    def __init__(self, pages, regions):
+        self.pages = pages
+        # Map image names to (page number, Rect)
+        self.regions = regions
+        self._images = {}
+
+    def __repr__(self):
+        return '<TextureAtlas of {} images on {} pages>'.format(
+            len(self.regions), len(self.pages)
+        )
+
+    def __len__(self):
+        return len(self.regions)
+
+    def __contains__(self, name):
+        return name in self.regions
+
+    def __iter__(self):
+        return iter(self.regions)
+
+    def __getitem__(self, name):
+        image = self._images.get(name)
+        if image is None:
+            page, rect = self.regions[name]
+            image = self._images[name] = self.pages[page].subsurface(rect)
+        return image
+
+    def source(self, name):
+        """Get the page holding the named image, and its rect on the page."""
+        page, rect = self.regions[name]
+        return self.pages[page], rect
+
+    def convert_alpha(self):
+        """Convert the pages to the display's pixel format."""
+        self.pages = [page.convert_alpha() for page in self.pages]
+        self._images.clear()
+
+    def save(self, directory, sources=None, settings=None):
+        """Save the atlas into directory, as PNG pages and a JSON index.
+
+        sources maps each image name to a description of the file it was
+        built from, so that a later load() can tell if the atlas is stale.
+        """
+        os.makedirs(directory, exist_ok=True)
+        page_files = []
+        for i, page in enumerate(self.pages):
+            filename = 'page%d.png' % i
+            pygame.image.save(page, os.path.join(directory, filename))
+            page_files.append(filename)
+        index = {
+            'version': INDEX_VERSION,
+            'settings': settings or {},
+            'pages': page_files,
+            'regions': {
+                name: [page, *rect]
+                for name, (page, rect) in self.regions.items()
+            },
+            'sources': sources or {},
+        }
+        with open(os.path.join(directory, INDEX_FILE), 'w') as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+
+    @staticmethod
+    def read_index(directory):
+        """Read the index of an atlas saved in directory, or return None."""
+        try:
+            with open(os.path.join(directory, INDEX_FILE)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get('version') != INDEX_VERSION:
+            return None
+        return index
+
+    @classmethod
+    def load(cls, directory, index=None):
+        """Load an atlas saved in directory."""
+        if index is None:
+            index = cls.read_index(directory)
+            if index is None:
+                raise FileNotFoundError(
+                    'No atlas saved in %r' % directory
+                )
+        pages = [
+            pygame.image.load(os.path.join(directory, filename))
+            for filename in index['pages']
+        ]
+        regions = {
+            name: (page, pygame.Rect(x, y, w, h))
+            for name, (page, x, y, w, h) in index['regions'].items()
+        }
+        return cls(pages, regions)
+
+
+def build_atlas(paths, page_size=PAGE_SIZE, padding=PADDING,
+                max_image_size=MAX_IMAGE_SIZE):
+    """Build a TextureAtlas from a dict mapping image names to file paths.
+
+    Images larger than max_image_size in either dimension are left out.
+    """
+    names = []
+    images = []
+    for name, path in paths.items():
+        img = pygame.image.load(path)
+        if max(img.get_size()) <= max_image_size:
+            names.append(name)
+            images.append(img)
+    placed = pack([img.get_size() for img in images], page_size, padding)
+
+    pages = [
+        pygame.Surface((page_size, page_size), pygame.SRCALPHA)
+        for _ in range(max((p[0] + 1 for p in placed), default=0))
+    ]
+    regions = {}
+    for name, img, (page, x, y) in zip(names, images, placed):
+        if img.get_flags() & pygame.SRCALPHA:
+            # The page is transparent black, so this copies the pixels
+            # exactly, rather than blending them with it
+            pages[page].blit(img, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        else:
+            pages[page].blit(img, (x, y))
+        regions[name] = page, pygame.Rect((x, y), img.get_size())
+
+    # Trim the last page to the height used
+    if pages:
+        last = len(pages) - 1
+        bottom = max(
+            r.bottom for page, r in regions.values() if page == last
+        ) + padding
+        pages[last] = pages[last].subsurface(
+            (0, 0, page_size, min(bottom, page_size))
+        ).copy()
+    return TextureAtlas(pages, regions)
@@ -2,7 +2,7 @@
 from . import clock
 from . import music
 from . import tone
-from .actor import Actor
+from .actor import Actor, SpriteGroup
 from .storage import storage
 from .keyboard import keyboard
 from .animation import animate
@@ -17,7 +17,7 @@ from .screen import screen_instance as screen
 
 __all__ = [
     'screen',  # graphics output
-    'Actor', 'images',  # graphics
+    'Actor', 'SpriteGroup', 'images',  # graphics
     'sounds', 'music', 'tone',  # sound
     'clock', 'animate',  # timing
     'Rect', 'ZRect',  # geometry
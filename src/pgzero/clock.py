@@ -5,22 +5,31 @@ classes in Pyglet.
 
 """
 import heapq
+from bisect import insort
+from math import floor
 from weakref import ref
-from functools import total_ordering
 from types import MethodType
 
 __all__ = [
-    'Clock', 'schedule', 'schedule_interval', 'unschedule'
+    'Clock', 'schedule', 'schedule_interval', 'unschedule',
+    'create', 'get', 'remove',
 ]
 
+# Ways of handling missed calls to interval callbacks
+MISSED_POLICIES = ('once', 'all', 'skip')
+
+# Functions called with a clock when it is cleared, so that things stepped
+# by the clock, such as animations, are stopped too
+clear_hooks = []
+
 # This type can't be weakreffed in Python 3.4
 builtin_function_or_method = type(open)
 
 
-def weak_method(method):
+def weak_method(method, callback=None):
     """Quick weak method ref in case users aren't using Python 3.4"""
-    selfref = ref(method.__self__)
-    funcref = ref(method.__func__)
+    selfref = ref(method.__self__, callback)
+    funcref = ref(method.__func__, callback)
 
     def weakref():
         self = selfref()
@@ -31,38 +40,58 @@ def weak_method(method):
     return weakref
 
 
-def mkref(o):
+def mkref(o, callback=None):
+    """Make a weak reference to o.
+
+    If given, callback is called when o is about to be finalised.
+    """
     if isinstance(o, MethodType):
-        return weak_method(o)
+        return weak_method(o, callback)
     else:
         try:
-            return ref(o)
+            return ref(o, callback)
         except TypeError:
             if isinstance(o, builtin_function_or_method):
                 return lambda: o
             raise
 
 
-@total_ordering
-class Event:
-    """An event scheduled for a future time.
+def _dead_ref():
+    """A reference that has been cleared."""
+    return None
+
+
+def callback_key(cb):
+    """Get a key identifying the callback cb, for finding its events.
 
-    Events are ordered by their scheduled execution time.
+    Bound methods are created afresh each time they are accessed, so they
+    are identified by their object and function.
+
+    The key is based on ids, so it may be reused once the callback has been
+    garbage collected; events found by key must still be checked against
+    the callback.
 
     """
+    if isinstance(cb, MethodType):
+        return id(cb.__self__), id(cb.__func__)
+    return id(cb)
+
+
+class Event:
+    """An event scheduled for a future time."""
+
+    __slots__ = (
+        'time', 'repeat', 'missed', 'cb', 'name', 'key', 'cancelled'
+    )
 
-    def __init__(self, time, cb, repeat=None):
+    def __init__(self, time, cb, repeat=None, missed='once'):
         self.time = time
         self.repeat = repeat
+        self.missed = missed
         self.cb = mkref(cb)
         self.name = str(cb)
-        self.repeat = repeat
-
-    def __lt__(self, ano):
-        return self.time < ano.time
-
-    def __eq__(self, ano):
-        return self.time == ano.time
+        self.key = callback_key(cb)
+        self.cancelled = False
 
     @property
     def callback(self):
@@ -78,22 +107,85 @@ class Clock:
     tick() would typically be called from the game loop for the default clock.
 
     Additional clocks could be created - for example, a game clock that could
-    be suspended in pause screens. Your code must take care of calling tick()
-    or not. You could also run the clock at a different rate if desired, by
-    scaling dt before passing it to tick().
+    be suspended in pause screens. Clocks made with create() are ticked by the
+    game loop; otherwise your code must take care of calling tick() or not.
+
+    A clock's time runs at `scale` times real time, and stops while the clock
+    is paused.
 
     """
 
-    def __init__(self):
+    def __init__(self, scale=1.0, name=None):
+        self.name = name
+        self.scale = scale
+        self.paused = False
         self.t = 0
         self.fired = False
+        # A heap of (time, seq, Event) tuples, so that events due at the same
+        # time fire in the order they were scheduled. Unscheduled events are
+        # marked as cancelled and left in the heap until they reach the top,
+        # or until they make up more than half the heap.
         self.events = []
+        self._cancelled = 0
+        # Map callback_key(callback) to a list of the callback's events
+        self._index = {}
+        self._seq = 0
+        # A list of [priority, seq, ref] entries, in the order they are
+        # called. Removed entries have their ref replaced with _dead_ref, and
+        # stay in the list until _each_tick_dirty says it needs compacting.
         self._each_tick = []
+        self._each_tick_dirty = False
+        # Map callback_key(callback) to a list of the callback's entries
+        self._each_tick_index = {}
 
     def clear(self):
         """Remove all handlers from this clock."""
         self.events.clear()
-        self._each_tick.clear()
+        self._index.clear()
+        self._cancelled = 0
+        self._each_tick = []
+        self._each_tick_index.clear()
+        self._each_tick_dirty = False
+        for hook in clear_hooks:
+            hook(self)
+
+    def __repr__(self):
+        if self.name is None:
+            return super().__repr__()
+        return f'<Clock {self.name!r}>'
+
+    def pause(self):
+        """Stop time for this clock.
+
+        Nothing scheduled on the clock fires until it is resumed.
+        """
+        self.paused = True
+
+    def resume(self):
+        """Restart time for this clock after pause()."""
+        self.paused = False
+
+    @property
+    def queue_length(self):
+        """The number of events scheduled."""
+        return len(self.events) - self._cancelled
+
+    def _push(self, callback, time, repeat, missed='once'):
+        self._seq += 1
+        ev = Event(time, callback, repeat, missed)
+        heapq.heappush(self.events, (time, self._seq, ev))
+        self._index.setdefault(ev.key, []).append(ev)
+
+    def _forget(self, ev):
+        """Remove ev from the index."""
+        events = self._index.get(ev.key)
+        if not events:
+            return
+        if len(events) == 1:
+            if events[0] is ev:
+                del self._index[ev.key]
+        elif ev in events:
+            events.remove(ev)
 
     def schedule(self, callback, delay):
         """Schedule callback to be called once, at `delay` seconds from now.
@@ -102,7 +194,7 @@ class Clock:
         :param delay: The delay before the call (in clock time / seconds).
 
         """
-        heapq.heappush(self.events, Event(self.t + delay, callback, None))
+        self._push(callback, self.t + delay, None)
 
     def schedule_unique(self, callback, delay):
         """Schedule callback to be called once, at `delay` seconds from now.
@@ -116,16 +208,33 @@ class Clock:
         self.unschedule(callback)
         self.schedule(callback, delay)
 
-    def schedule_interval(self, callback, delay):
+    def schedule_interval(self, callback, delay, missed='once'):
         """Schedule callback to be called every `delay` seconds.
 
-        The first occurrence will be after `delay` seconds.
+        The first occurrence will be after `delay` seconds. Later calls are
+        scheduled from when the previous call was due, not when it happened,
+        so they don't drift.
+
+        If a tick passes over more than one call, `missed` says what to do:
+
+        * 'once' - call the callback once.
+        * 'all' - call the callback once for each interval that has passed.
+        * 'skip' - don't call the callback for calls that are more than
+          one interval late; only the most recent call that was due is made.
 
         :param callback: A parameterless callable to be called.
         :param delay: The interval in seconds.
+        :param missed: What to do about missed calls.
 
         """
-        heapq.heappush(self.events, Event(self.t + delay, callback, delay))
+        if delay <= 0:
+            raise ValueError("Interval must be greater than 0.")
+        if missed not in MISSED_POLICIES:
+            raise ValueError(
+                f"missed must be one of {', '.join(MISSED_POLICIES)}, "
+                f"not {missed!r}."
+            )
+        self._push(callback, self.t + delay, delay, missed)
 
     def unschedule(self, callback):
         """Unschedule the given callback.
@@ -133,27 +242,76 @@ class Clock:
         If scheduled multiple times all instances will be unscheduled.
 
         """
-        self.events = [
-            e for e in self.events
-            if e.callback != callback
-            if e.callback is not None
-        ]
+        key = callback_key(callback)
+        events = self._index.get(key)
+        if events:
+            keep = []
+            for ev in events:
+                cb = ev.callback
+                if cb is None or cb == callback:
+                    ev.cancelled = True
+                    self._cancelled += 1
+                else:
+                    # A different callback that happens to share the key
+                    keep.append(ev)
+            if keep:
+                self._index[key] = keep
+            else:
+                del self._index[key]
+            if self._cancelled > len(self.events) // 2:
+                self._compact()
+        entries = self._each_tick_index.pop(callback_key(callback), ())
+        for entry in entries:
+            cb = entry[2]()
+            if cb is None or cb == callback:
+                entry[2] = _dead_ref
+                self._each_tick_dirty = True
+
+    def _compact(self):
+        """Remove cancelled events from the heap."""
+        # Modify the heap in place, as tick() may be iterating over it
+        self.events[:] = [e for e in self.events if not e[2].cancelled]
         heapq.heapify(self.events)
-        self._each_tick = [e for e in self._each_tick if e() != callback]
+        self._cancelled = 0
 
-    def each_tick(self, callback):
+    def each_tick(self, callback, priority=0):
         """Schedule a callback to be called every tick.
 
         Unlike the standard scheduler functions, the callable is passed the
         elapsed clock time since the last call (the same value passed to tick).
 
+        Callbacks with a lower priority are called first; callbacks with the
+        same priority are called in the order they were scheduled.
+
         """
-        self._each_tick.append(mkref(callback))
+        self._seq += 1
+        entry = [priority, self._seq, mkref(callback, self._each_tick_died)]
+        self._each_tick_index.setdefault(callback_key(callback), []) \
+            .append(entry)
+        entries = self._each_tick
+        if not entries or entry > entries[-1]:
+            entries.append(entry)
+        else:
+            # Don't insert into the list in place, as it may be being
+            # iterated over by _fire_each_tick()
+            entries = entries[:]
+            insort(entries, entry)
+            self._each_tick = entries
+
+    def _has_each_tick(self, callback):
+        """Return True if callback is scheduled to be called every tick."""
+        for entry in self._each_tick_index.get(callback_key(callback), ()):
+            if entry[2]() == callback:
+                return True
+        return False
+
+    def _each_tick_died(self, _):
+        """Note that a weakly referenced each_tick callback has died."""
+        self._each_tick_dirty = True
 
     def _fire_each_tick(self, dt):
-        dead = [None]
-        for r in self._each_tick:
-            cb = r()
+        for entry in self._each_tick:
+            cb = entry[2]()
             if cb is not None:
                 self.fired = True
                 try:
@@ -161,8 +319,20 @@ class Clock:
                 except Exception:
                     import traceback
                     traceback.print_exc()
-                    dead.append(cb)
-        self._each_tick = [e for e in self._each_tick if e() not in dead]
+                    entry[2] = _dead_ref
+                    self._each_tick_dirty = True
+        if self._each_tick_dirty:
+            self._compact_each_tick()
+
+    def _compact_each_tick(self):
+        """Remove dead and unscheduled callbacks from the each_tick list."""
+        self._each_tick = [e for e in self._each_tick if e[2]() is not None]
+        index = self._each_tick_index
+        for key, entries in list(index.items()):
+            entries[:] = [e for e in entries if e[2]() is not None]
+            if not entries:
+                del index[key]
+        self._each_tick_dirty = False
 
     def tick(self, dt):
         """Update the clock time and fire all scheduled events.
@@ -170,18 +340,42 @@ class Clock:
         :param dt: The elapsed time in seconds.
 
         """
-        self.fired = False
-        self.t += float(dt)
+        dt = self._advance(dt)
+        if dt is None:
+            return
         self._fire_each_tick(dt)
-        while self.events and self.events[0].time <= self.t:
-            ev = heapq.heappop(self.events)
+        self._fire_events()
+
+    def _advance(self, dt):
+        """Update the clock time, without firing anything.
+
+        Return the elapsed clock time, or None if the clock is paused.
+        """
+        self.fired = False
+        if self.paused:
+            return None
+        dt = float(dt) * self.scale
+        self.t += dt
+        return dt
+
+    def _fire_events(self):
+        """Fire all scheduled events that are now due."""
+        events = self.events
+        while events and events[0][0] <= self.t:
+            ev = events[0][2]
+            if ev.cancelled:
+                heapq.heappop(events)
+                self._cancelled -= 1
+                continue
             cb = ev.callback
-            if not cb:
+            if ev.repeat is None or not cb:
+                heapq.heappop(events)
+                self._forget(ev)
+                if not cb:
+                    continue
+            elif not self._reschedule(ev):
                 continue
 
-            if ev.repeat is not None:
-                self.schedule_interval(cb, ev.repeat)
-
             self.fired = True
             try:
                 cb()
@@ -190,12 +384,65 @@ class Clock:
                 traceback.print_exc()
                 self.unschedule(cb)
 
+    def _reschedule(self, ev):
+        """Move the repeating event ev, at the top of the heap, to its next
+        due time.
+
+        Return False if the call that is now due should be skipped.
+        """
+        repeat = ev.repeat
+        ev.time += repeat
+        if ev.missed != 'all' and ev.time <= self.t:
+            # Jump to the first call after now, on the original schedule
+            ev.time += (floor((self.t - ev.time) / repeat) + 1) * repeat
+        self._seq += 1
+        heapq.heapreplace(self.events, (ev.time, self._seq, ev))
+        # With 'skip', make the latest call that was due, if it is less than
+        # an interval late; the ones before it have been jumped over
+        return ev.missed != 'skip' or self.t - (ev.time - repeat) < repeat
+
 
 # One instance of a clock is available by default, to simplify the API
-clock = Clock()
+clock = Clock(name='default')
 tick = clock.tick
 schedule = clock.schedule
 schedule_interval = clock.schedule_interval
 schedule_unique = clock.schedule_unique
 unschedule = clock.unschedule
 each_tick = clock.each_tick
+
+# Clocks made with create(), which are ticked by the game loop along with the
+# default clock
+named_clocks = {}
+
+
+def create(name, scale=1.0):
+    """Create a clock that will be ticked by the game loop.
+
+    :param name: A name to look up the clock with get().
+    :param scale: How fast the clock's time runs, relative to real time.
+
+    """
+    if name in named_clocks:
+        raise ValueError(f"There is already a clock named {name!r}.")
+    named_clocks[name] = c = Clock(scale=scale, name=name)
+    return c
+
+
+def get(name):
+    """Get the clock with the given name, made by create()."""
+    try:
+        return named_clocks[name]
+    except KeyError:
+        raise KeyError(f"No clock named {name!r}.") from None
+
+
+def remove(name):
+    """Stop ticking the named clock, cancelling everything scheduled on it."""
+    get(name).clear()
+    del named_clocks[name]
+
+
+def all_clocks():
+    """Get a list of the clocks ticked by the game loop."""
+    return [clock, *named_clocks.values()]
@@ -2,6 +2,7 @@ import sys
 import operator
 import time
 import types
+from itertools import islice
 from time import perf_counter, sleep
 
 import pygame
@@ -12,11 +13,18 @@ import pgzero.loaders
 import pgzero.screen
 
 from . import constants
+from .overlay import Overlay
+from .profiler import profiler
 
 
 screen = None  # This global surface is what actors draw to
 DISPLAY_FLAGS = pygame.SHOWN
 
+# With a fixed update rate, the most update steps to run in one frame when
+# catching up. Time beyond this is dropped, so that a game whose update() is
+# too slow to keep up runs slowly rather than freezing.
+MAX_UPDATE_STEPS = 5
+
 
 def exit():
     """Wait for up to a second for all sounds to play out
@@ -49,11 +57,30 @@ class PGZeroGame:
     def __init__(
         self,
         mod: types.ModuleType,
-        fps: bool = False
+        fps: bool = False,
+        max_frames: int = None,
+        sleep: bool = True,
+        draw: bool = True,
+        profile: str = None,
+        overlay: bool = False
     ):
         """Construct a game loop given the pgzero module mod.
 
         If fps is True, show a FPS count at the bottom left of the window.
+
+        If max_frames is given, stop after running that many frames.
+
+        If sleep is False, don't wait between frames: run as fast as possible,
+        passing a fixed time step to update() and the clock as if the game
+        were running at 60 FPS.
+
+        If draw is False, don't call draw() or update the display.
+
+        If profile is a filename, time each phase of the game loop, print a
+        summary at exit and write a Chrome trace to that file.
+
+        If overlay is True, start with the performance overlay shown. It can
+        be toggled at any time by pressing F12.
         """
         self.mod = mod
         self.screen = None
@@ -62,6 +89,11 @@ class PGZeroGame:
         self.title = None
         self.icon = None
         self.fps = fps
+        self.max_frames = max_frames
+        self.sleep = sleep
+        self.draw = draw
+        self.profile = profile
+        self.overlay = Overlay(visible=overlay)
         self.keyboard = pgzero.keyboard.keyboard
         self.handlers = {}
 
@@ -102,6 +134,10 @@ class PGZeroGame:
             pygame.display.set_caption(title)
             self.title = title
 
+        pgzero.screen.screen_instance._track_dirty(
+            getattr(mod, 'DIRTY_RECTS', False)
+        )
+
         return changed
 
     @staticmethod
@@ -218,29 +254,47 @@ class PGZeroGame:
             return update
 
     def get_draw_func(self):
-        """Get a draw function.
+        """Get a one-argument draw function.
 
-        If no draw function is define, raise an exception.
+        If the module defines a function matching ::
+
+            draw(alpha)
+
+        or ::
+
+            draw()
+
+        then this will be called. Otherwise return a no-op function.
 
         """
         try:
             draw = self.mod.draw
         except AttributeError:
-            return lambda: None
+            return lambda alpha: None
         else:
-            if draw.__code__.co_argcount != 0:
+            argcount = draw.__code__.co_argcount
+            if argcount == 0:
+                return lambda alpha: draw()
+            elif argcount != 1:
                 raise TypeError(
-                    "draw() must not take any arguments."
+                    "draw() must take no arguments, or one argument (alpha)."
                 )
             return draw
 
     def run(self):
         """Invoke the main loop, and then clean up."""
+        if self.profile:
+            profiler.reset()
+            profiler.enable(trace=True)
         try:
             self.mainloop()
         finally:
             pygame.display.quit()
             pygame.mixer.quit()
+            if self.profile:
+                profiler.disable()
+                print(profiler.summary())
+                profiler.write_trace(self.profile)
 
     def inject_global_handlers(self):
         """Inject handlers provide by the Pygame Zero system.
@@ -248,7 +302,8 @@ class PGZeroGame:
         Some of these wrap user handlers so must be injected later.
         """
         self.handlers[pygame.QUIT] = lambda e: sys.exit(0)
-        self.handlers[pygame.VIDEOEXPOSE] = lambda e: None
+        self.handlers[pygame.VIDEOEXPOSE] = \
+            lambda e: pgzero.screen.screen_instance._mark_all_dirty()
 
         user_key_down = self.handlers.get(pygame.KEYDOWN)
         user_key_up = self.handlers.get(pygame.KEYUP)
@@ -257,6 +312,10 @@ class PGZeroGame:
             if event.key == pygame.K_q and \
                     event.mod & (pygame.KMOD_CTRL | pygame.KMOD_META):
                 sys.exit(0)
+            if event.key == Overlay.TOGGLE_KEY:
+                self.overlay.toggle()
+                # Redraw the whole screen where the overlay was
+                pgzero.screen.screen_instance._mark_all_dirty()
             self.keyboard._press(event.key)
             if user_key_down:
                 return user_key_down(event)
@@ -272,25 +331,65 @@ class PGZeroGame:
     def handle_events(self, dt, update) -> bool:
         """Handle all events for the current frame.
 
+        Return True if an event was handled.
+        """
+        updated = self.dispatch_events()
+        updated |= self.step(dt, update)
+        updated |= self.reinit_screen()
+        return updated
+
+    def handle_events_fixed(self, dt, update, timestep) -> bool:
+        """Handle all events for the current frame, updating in fixed steps.
+
+        Return True if the screen needs to be redrawn.
+        """
+        # Redraw every frame if there is an update function, even if no step
+        # ran this frame, so that draw() can interpolate.
+        updated = bool(update)
+        updated |= self.dispatch_events()
+        for _ in range(timestep.advance(dt)):
+            updated |= self.step(timestep.step, update)
+        updated |= self.reinit_screen()
+        return updated
+
+    def dispatch_events(self) -> bool:
+        """Dispatch pending Pygame events to their handlers.
+
         Return True if an event was handled.
         """
         updated = False
+        with profiler.phase('events'):
+            for event in pygame.event.get():
+                handler = self.handlers.get(event.type)
+                if handler:
+                    handler(event)
+                    updated = True
+        return updated
 
-        for event in pygame.event.get():
-            handler = self.handlers.get(event.type)
-            if handler:
-                handler(event)
-                updated = True
+    def step(self, dt, update) -> bool:
+        """Advance the clocks and call update() for a step of dt seconds.
 
-        clock = pgzero.clock.clock
-        clock.tick(dt)
-        updated |= clock.fired
+        Return True if anything may have changed.
+        """
+        clocks = pgzero.clock.all_clocks()
+        phase = profiler.phase
+        running = []
+        for clock in clocks:
+            clock_dt = clock._advance(dt)
+            if clock_dt is not None:
+                running.append((clock, clock_dt))
+        with phase('animations'):
+            for clock, clock_dt in running:
+                clock._fire_each_tick(clock_dt)
+        with phase('clock'):
+            for clock, _ in running:
+                clock._fire_events()
+        updated = any(clock.fired for clock in clocks)
 
         if update:
-            update(dt)
+            with phase('update'):
+                update(dt)
             updated = True
-
-        updated |= self.reinit_screen()
         return updated
 
     def mainloop(self):
@@ -304,38 +403,206 @@ class PGZeroGame:
 
         logic_timer = Timer('logic', print=self.fps)
         draw_timer = Timer('draw', print=self.fps)
-        for i, dt in enumerate(frames(60)):
+        target_fps = getattr(self.mod, 'FPS', 60)
+        if self.sleep:
+            pacer = FramePacer(target_fps)
+            frame_times = iter(pacer)
+        else:
+            pacer = None
+            frame_times = fixed_frames(target_fps)
+        report_interval = max(round(target_fps), 1)
+        if self.max_frames is not None:
+            frame_times = islice(frame_times, self.max_frames)
+
+        rate = getattr(self.mod, 'UPDATE_RATE', None)
+        timestep = FixedTimestep(1 / rate) if rate else None
+        alpha = 1.0
+
+        overlay = self.overlay
+        # Draw the reference line on the frame time graph at this game's rate
+        overlay.target_ms = 1000 / target_fps
+        for i, dt in enumerate(frame_times):
+            overlay.record_frame(dt)
+            # Finish off resources loaded in the background
+            loaded = pgzero.loaders.poll()
             with logic_timer:
-                updated = self.handle_events(dt, update)
+                if timestep:
+                    updated = self.handle_events_fixed(dt, update, timestep)
+                    alpha = timestep.alpha
+                else:
+                    updated = self.handle_events(dt, update)
 
-            if updated:
-                with draw_timer:
-                    draw()
+            # Keep the overlay's graph moving, even if nothing else changed
+            updated |= overlay.visible or loaded
 
-                if self.fps and i and i % 60 == 0:
+            if updated and self.draw:
+                with draw_timer, profiler.phase('draw'):
+                    draw(alpha)
+
+                if self.fps and i and i % report_interval == 0:
                     ftime_ms = draw_timer.get_mean() + logic_timer.get_mean()
                     fps = 1000 / ftime_ms
 
                     print(f"fps: {fps:0.1f}  time per frame: {ftime_ms:0.1f}ms")
-                pygame.display.flip()
+                    if pacer:
+                        print(pacer.report())
+                        pacer.reset_stats()
+                if overlay.visible:
+                    self.draw_overlay()
+                with profiler.phase('flip'):
+                    self.update_display()
+                overlay.restore(self.screen)
+            profiler.end_frame()
+
+    def draw_overlay(self):
+        """Draw the performance overlay over the frame just drawn."""
+        rect = self.overlay.draw(self.screen)
+        dirty = pgzero.screen.screen_instance._dirty
+        if dirty is not None:
+            dirty.append(rect)
+
+    def update_display(self):
+        """Show the frame that has just been drawn.
+
+        If the game sets DIRTY_RECTS = True, only the areas of the screen
+        that were drawn to are updated; otherwise the whole display is.
+        """
+        screen = pgzero.screen.screen_instance
+        if screen._dirty is None:
+            pygame.display.flip()
+            return
+        rects = screen._take_dirty()
+        if rects:
+            pygame.display.update(rects)
 
 
 def frames(fps=60):
     """Iterate over frames at the given fps, yielding time delta (in s)."""
-    tgt = 1 / fps  # target frame time
+    return iter(FramePacer(fps))
+
+
+class FramePacer:
+    """Pace frames to start at regular deadlines, at a target frame rate.
+
+    sleep() often wakes up late, by an amount that depends on the OS and how
+    busy the machine is. To hit each deadline closely, we sleep until a
+    little before it and then spin for the rest of the time. The margin is
+    learned from how late previous sleeps have woken up.
+
+    Iterating over a FramePacer yields the time delta (in s) of each frame.
+    """
+
+    # Bounds on the margin left for sleep() waking up late, in seconds
+    MIN_MARGIN = 0.0002
+    MAX_MARGIN = 0.004
+
+    def __init__(self, fps=60):
+        self.fps = fps
+        self.interval = 1 / fps
+        self.margin = 0.001
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset the frame and missed deadline counts."""
+        self.frames = 0
+        self.missed = 0
+        self.worst_lateness = 0.0
+
+    def __iter__(self):
+        interval = self.interval
+        t = perf_counter()
+        deadline = t + interval
+        dt = interval
+
+        while True:
+            yield dt
+            self.frames += 1
+            now = perf_counter()
+            lateness = now - deadline
+            if lateness > 0:
+                # The frame took too long
+                self.missed += 1
+                if lateness > self.worst_lateness:
+                    self.worst_lateness = lateness
+                if lateness > interval:
+                    # Don't try to make up for lost frames by running the
+                    # next few frames with no wait
+                    deadline = now
+            else:
+                now = self.wait_until(deadline)
+            deadline += interval
+            dt = now - t
+            t = now
+
+    def wait_until(self, deadline) -> float:
+        """Wait until the given perf_counter() time, returning the time."""
+        now = perf_counter()
+        sleep_time = deadline - now - self.margin
+        if sleep_time > 0:
+            sleep(sleep_time)
+            woke = perf_counter()
+            self._learn_margin(woke - now - sleep_time)
+            now = woke
+        while now < deadline:
+            now = perf_counter()
+        return now
+
+    def _learn_margin(self, overshoot):
+        """Update the sleep margin given how late a sleep() woke up."""
+        if overshoot > self.margin:
+            # React quickly to sleeps waking up later
+            margin = overshoot
+        else:
+            margin = self.margin + (overshoot - self.margin) * 0.05
+        self.margin = min(max(margin, self.MIN_MARGIN), self.MAX_MARGIN)
+
+    def report(self) -> str:
+        """Describe the missed deadlines since the stats were last reset."""
+        return (
+            f"missed deadlines: {self.missed}/{self.frames}  "
+            f"worst: {self.worst_lateness * 1e3:0.1f}ms  "
+            f"sleep margin: {self.margin * 1e3:0.2f}ms"
+        )
 
-    t = perf_counter()
-    dt = tgt
 
+class FixedTimestep:
+    """Divide the time taken by each frame into fixed-length update steps.
+
+    Elapsed time accumulates until there is enough for a step; the remainder
+    is carried over to the next frame.
+    """
+
+    def __init__(self, step, max_steps=MAX_UPDATE_STEPS):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, dt) -> int:
+        """Add dt seconds of elapsed time; return the number of steps to run."""
+        self.accumulator += dt
+        # Allow for rounding error, so that eg. two 1/120s steps fit in 1/60s
+        steps = int(self.accumulator / self.step + 1e-9)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator %= self.step
+        else:
+            self.accumulator = max(self.accumulator - steps * self.step, 0.0)
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """How far we are between the last step and the next, from 0 to 1."""
+        return min(self.accumulator / self.step, 1.0)
+
+
+def fixed_frames(fps=60):
+    """Iterate over frames without waiting, yielding a fixed time delta.
+
+    This simulates running at the given fps, as fast as possible.
+    """
+    dt = 1 / fps
     while True:
         yield dt
-        nextt = perf_counter()
-        dt = nextt - t
-        if dt < tgt:
-            sleep(tgt - dt)
-            nextt = perf_counter()
-            dt = nextt - t
-        t = nextt
 
 
 class Timer:
@@ -0,0 +1,209 @@
+"""A cache of decoded images on disk, for faster loading.
+
+Decoding PNG, JPEG and WebP files takes much longer than reading the same
+pixels uncompressed. An ImageCache stores the decoded pixels of each image
+in a raw file, keyed by the image's path, modification time, size and the
+pixel format. Loading the image again maps the raw file into memory and
+makes a surface directly over it with ``pygame.image.frombuffer()``.
+
+The cache is limited in size; when it grows too large, the entries used
+least recently are deleted. Each entry's modification time records when it
+was last used.
+
+"""
+import hashlib
+import mmap
+import os
+import platform
+import struct
+import threading
+
+import pygame
+
+__all__ = ['ImageCache', 'default_directory']
+
+
+# Default limit on the total size of the cache, in bytes
+MAX_SIZE = 256 * 1024 * 1024
+
+# Pixel format of the cached images
+FORMAT = 'RGBA'
+
+# Each entry starts with a header giving the image's dimensions
+HEADER = struct.Struct('<4sII4x')
+MAGIC = b'PGZ1'
+
+SUFFIX = '.raw'
+
+
+def _get_platform_cache_path():
+    r"""Get the directory for Pygame Zero's caches.
+
+    Under Windows, return %LOCALAPPDATA%\pgzero\cache. Elsewhere, return
+    $XDG_CACHE_HOME/pgzero, or ~/.cache/pgzero.
+
+    """
+    if platform.system() == 'Windows':
+        appdata = os.environ.get('LOCALAPPDATA') or os.environ.get('APPDATA')
+        if appdata:
+            return os.path.join(appdata, 'pgzero', 'cache')
+    cache_home = os.environ.get('XDG_CACHE_HOME') or \
+        os.path.expanduser(os.path.join('~', '.cache'))
+    return os.path.join(cache_home, 'pgzero')
+
+
+def default_directory(game_root):
+    """Get the per-user directory to cache the images of a game in.
+
+    The game's own directory may be read-only, under version control, or
+    shipped to players, so the cache is kept outside it, in a subdirectory
+    named after the game root and a hash of its full path.
+    """
+    game_root = os.path.abspath(game_root)
+    root_hash = hashlib.sha1(game_root.encode('utf-8')).hexdigest()
+    name = '{}-{}'.format(os.path.basename(game_root), root_hash)
+    return os.path.join(_get_platform_cache_path(), 'images', name)
+
+
+class ImageCache:
+    """A size-limited cache of decoded images in directory."""
+
+    def __init__(self, directory, max_size=MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(size for _, size, _ in self._entries())
+
+    def __repr__(self):
+        return '<ImageCache {!r} {} KiB of {} KiB>'.format(
+            self.directory, self.size // 1024, self.max_size // 1024
+        )
+
+    def _entries(self):
+        """Get (mtime, size, path) for each entry in the cache."""
+        entries = []
+        for f in os.listdir(self.directory):
+            if not f.endswith(SUFFIX):
+                continue
+            p = os.path.join(self.directory, f)
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, p))
+        return entries
+
+    def _entry_path(self, path):
+        st = os.stat(path)
+        key = '{}|{}|{}|{}'.format(
+            os.path.abspath(path), st.st_mtime_ns, st.st_size, FORMAT
+        )
+        digest = hashlib.sha1(key.encode('utf8')).hexdigest()
+        return os.path.join(self.directory, digest + SUFFIX)
+
+    def get(self, path):
+        """Get the image at path from the cache, or None if it isn't cached.
+        """
+        entry = self._entry_path(path)
+        try:
+            f = open(entry, 'rb')
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        with f:
+            try:
+                # A private mapping, so that drawing on the surface can't
+                # change the cache
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+            except ValueError:
+                mm = None
+        if mm is not None and len(mm) >= HEADER.size:
+            magic, w, h = HEADER.unpack_from(mm)
+            if magic == MAGIC and len(mm) == HEADER.size + w * h * 4:
+                surf = pygame.image.frombuffer(
+                    memoryview(mm)[HEADER.size:], (w, h), FORMAT
+                )
+                self.hits += 1
+                self._touch(entry)
+                return surf
+        # The entry is damaged; forget it
+        self._remove(entry)
+        self.misses += 1
+        return None
+
+    def put(self, path, surf):
+        """Store the image surf, which was loaded from path."""
+        entry = self._entry_path(path)
+        if not surf.get_flags() & pygame.SRCALPHA:
+            # Make the colorkey, if there is one, into transparent pixels
+            alpha = pygame.Surface(surf.get_size(), pygame.SRCALPHA)
+            alpha.blit(surf, (0, 0))
+            surf = alpha
+        w, h = surf.get_size()
+        data = pygame.image.tostring(surf, FORMAT)
+        size = HEADER.size + len(data)
+        if size > self.max_size:
+            return
+
+        tmp = '{}.{}.{}.tmp'.format(entry, os.getpid(), threading.get_ident())
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, w, h))
+                f.write(data)
+            os.replace(tmp, entry)
+        except OSError:
+            # The cache is only an optimisation
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.size += size
+            if self.size > self.max_size:
+                self._evict()
+
+    def _touch(self, entry):
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    def _remove(self, entry):
+        try:
+            size = os.stat(entry).st_size
+            os.remove(entry)
+        except OSError:
+            return
+        with self._lock:
+            self.size -= size
+
+    def _evict(self):
+        """Delete the least recently used entries until under max_size.
+
+        Call this with the lock held.
+        """
+        entries = sorted(self._entries())
+        self.size = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if self.size <= self.max_size:
+                break
+            try:
+                os.remove(p)
+            except OSError:
+                # Perhaps still mapped, on Windows
+                continue
+            self.size -= size
+
+    def clear(self):
+        """Delete every entry in the cache."""
+        with self._lock:
+            for _, _, p in self._entries():
+                try:
+                    os.remove(p)
+                except OSError:
+                    pass
+            self.size = sum(size for _, size, _ in self._entries())
@@ -1,11 +1,17 @@
 import os
 import os.path
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
 
 import pygame.image
 import pygame.mixer
 
 from . import ptext
+from .atlas import TextureAtlas, build_atlas
+from . import atlas
+from .imagecache import ImageCache
+from . import imagecache
 
 
 # Root directory for loaders
@@ -29,6 +35,155 @@ def set_root(path):
     sys.path.insert(0, root)
 
 
+# Number of threads used to load resources in the background
+LOADER_THREADS = min(4, os.cpu_count() or 1)
+
+# Time in seconds that poll() may spend finishing resources loaded in the
+# background, each frame
+POLL_BUDGET = 0.004
+
+_executor = None
+
+# Loaders with resources being loaded in the background
+_loading = []
+
+
+def get_executor():
+    """Get the thread pool that loads resources in the background."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=LOADER_THREADS,
+            thread_name_prefix='pgzero-loader',
+        )
+    return _executor
+
+
+def poll(budget=POLL_BUDGET):
+    """Finish resources that have been loaded in the background.
+
+    This is called by the game loop once per frame. Some work, such as
+    converting images to the screen's pixel format, has to be done on the
+    main thread; poll() does this for as many resources as it can in budget
+    seconds.
+
+    Return True if any resources were finished.
+    """
+    if not _loading:
+        return False
+    deadline = perf_counter() + budget
+    finished = False
+    for loader in list(_loading):
+        finished |= loader.poll(deadline)
+        if perf_counter() >= deadline:
+            break
+    return finished
+
+
+# The cache of decoded images, if enabled
+image_cache = None
+
+
+def enable_image_cache(directory=None, max_size=imagecache.MAX_SIZE):
+    """Keep decoded images in a cache on disk, so they load faster next time.
+
+    directory defaults to a directory in the user's cache directory, such
+    as ~/.cache/pgzero/images/, named after the game. The cache is limited
+    to max_size bytes; the images used least recently are removed to make
+    room.
+
+    Return the ImageCache.
+    """
+    global image_cache
+    if directory is None:
+        directory = imagecache.default_directory(root)
+    image_cache = ImageCache(directory, max_size)
+    return image_cache
+
+
+def disable_image_cache():
+    """Stop using the cache of decoded images."""
+    global image_cache
+    image_cache = None
+
+
+def _failed(future):
+    return future.done() and future.exception() is not None
+
+
+class Progress:
+    """The progress of resources being loaded in the background.
+
+    This is returned by prefetch() and preload(), so that a game can show a
+    loading screen::
+
+        loading = images.preload()
+
+        def draw():
+            if not loading.done:
+                screen.draw.text(f"Loading {loading.fraction:.0%}", (10, 10))
+                return
+            ...
+
+    """
+
+    def __init__(self, loader, keys):
+        self.loader = loader
+        self.keys = keys
+
+    def __repr__(self):
+        return '<Progress {}/{} {}s>'.format(
+            self.loaded, self.total, self.loader.TYPE
+        )
+
+    @property
+    def total(self):
+        """The number of resources being loaded."""
+        return len(self.keys)
+
+    @property
+    def loaded(self):
+        """The number of resources that have finished loading."""
+        cache = self.loader._cache
+        return sum(key in cache for key in self.keys)
+
+    @property
+    def fraction(self):
+        """The fraction of the resources that have finished loading."""
+        return self.loaded / self.total if self.keys else 1.0
+
+    @property
+    def done(self):
+        """True if all of the resources have finished loading.
+
+        Resources that failed to load count as finished; the error is raised
+        when the resource is used.
+        """
+        pending = self.loader._pending
+        for key in self.keys:
+            future = pending.get(key)
+            if future is not None and not _failed(future):
+                return False
+        return True
+
+    @property
+    def failed(self):
+        """The names of the resources that failed to load."""
+        pending = self.loader._pending
+        return [
+            key[0] for key in self.keys
+            if key in pending and _failed(pending[key])
+        ]
+
+    def wait(self):
+        """Block until all of the resources have finished loading.
+
+        Raise the first error, if any failed to load.
+        """
+        for name, args, kwargs in self.keys:
+            self.loader.load(name, *args, **dict(kwargs))
+
+
 class InvalidCase(Exception):
     """Indicate case errors early so they don't bite cross-platform users."""
 
@@ -75,6 +230,135 @@ def validate_compatible_path(path):
         )
 
 
+class DirectoryIndex:
+    """An index of the resources in a directory and its subdirectories.
+
+    Finding a resource by name is a dictionary lookup, rather than a check
+    for a file with each extension. The directory is listed again when a
+    name isn't found, in case the file has been added since; and by
+    refresh(), when the directory has been modified.
+
+    Files whose names aren't lower case are left out of the index, but
+    asking for one raises InvalidCase rather than KeyError.
+
+    """
+
+    def __init__(self, path, extns):
+        self.path = path
+        self.extns = extns
+        self.mtime = None
+        # Map resource names, with or without an extension, to paths
+        self.paths = {}
+        # Map lower-cased file names and resource names to the names on disk
+        self.lower = {}
+        self.dirs = set()
+        # Names of the resources, in order
+        self.names = []
+        self._subdirs = {}
+
+    def refresh(self, force=False):
+        """List the directory again if it has been modified, or if force.
+
+        Return True if it was listed.
+        """
+        mtime = os.stat(self.path).st_mtime_ns
+        if mtime == self.mtime and not force:
+            return False
+        files = []
+        dirs = set()
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    dirs.add(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+
+        extns = self.extns
+        found = {}
+        lower = {}
+        for f in files:
+            lower[f.lower()] = f
+            stem, ext = os.path.splitext(f)
+            if ext[1:].lower() in extns:
+                lower.setdefault(stem.lower(), f)
+            if ext[1:] in extns and f == f.lower():
+                found.setdefault(stem, {})[ext[1:]] = f
+        paths = {}
+        for stem, by_ext in found.items():
+            # Use the first extension in extns, as for a file of that name
+            f = next(by_ext[ext] for ext in extns if ext in by_ext)
+            paths[stem] = os.path.join(self.path, f)
+        for f in files:
+            if f == f.lower():
+                paths[f] = os.path.join(self.path, f)
+        for d in dirs:
+            lower.setdefault(d.lower(), d)
+
+        self.mtime = mtime
+        self.paths = paths
+        self.lower = lower
+        self.dirs = dirs
+        self.names = sorted(found)
+        self._subdirs = {
+            d: index for d, index in self._subdirs.items() if d in dirs
+        }
+        return True
+
+    def isdir(self, name):
+        """Return True if name is a subdirectory."""
+        return name in self.dirs or (self.refresh() and name in self.dirs)
+
+    def find(self, name):
+        """Get the path of the resource called name.
+
+        name may be a path relative to the directory, using /. Raise
+        KeyError if there is no such resource.
+        """
+        path = self.paths.get(name)
+        if path is not None:
+            return path
+        if '/' in name or os.sep in name:
+            subdir, _, rest = name.replace(os.sep, '/').partition('/')
+            return self.subdir(subdir).find(rest)
+        self.refresh(force=True)
+        path = self.paths.get(name)
+        if path is None:
+            self._check_case(name)
+            raise KeyError(name)
+        return path
+
+    def subdir(self, name):
+        """Get the index of the subdirectory called name."""
+        index = self._subdirs.get(name)
+        if index is None:
+            if name not in self.dirs:
+                self.refresh(force=True)
+                if name not in self.dirs:
+                    self._check_case(name)
+                    raise KeyError(name)
+            validate_lowercase(self._relpath(name))
+            index = DirectoryIndex(os.path.join(self.path, name), self.extns)
+            index.refresh()
+            self._subdirs[name] = index
+        return index
+
+    def _relpath(self, name):
+        return os.path.relpath(os.path.join(self.path, name), root)
+
+    def _check_case(self, name):
+        """Raise InvalidCase if name is only missing because of its case."""
+        on_disk = self.lower.get(name.lower())
+        if on_disk is None:
+            return
+        validate_lowercase(self._relpath(name))
+        raise InvalidCase(
+            "%s is mis-capitalised on disk as %r.\nYou should rename it to be "
+            "correctly lowercase, for cross-platform portability." % (
+                self._relpath(name), self._relpath(on_disk)
+            )
+        )
+
+
 class ResourceLoader:
     """Abstract resource loader.
 
@@ -85,12 +369,19 @@ class ResourceLoader:
     Additionally, attribute access can be used to access and cache resources.
     Dotted paths can be used to traverse directories.
 
+    Resources can also be loaded in the background with `.prefetch()` and
+    `.preload()`. Loading is split into `._decode()`, which reads the file on
+    a worker thread, and `._finish()`, which is run on the main thread.
+
     """
 
     def __init__(self, subpath):
         self._subpath = subpath
         self._cache = {}
+        # Futures for resources being loaded in the background
+        self._pending = {}
         self._have_root = False
+        self._index = None
 
     def validate_root(self, name):
         r = self._root()
@@ -118,39 +409,157 @@ class ResourceLoader:
         if key in self._cache:
             return self._cache[key]
 
+        future = self._pending.get(key)
+        if future is not None:
+            # Wait for the background load, which raises any error it hit
+            try:
+                decoded = future.result()
+            finally:
+                self._forget_pending(key)
+            res = self._cache[key] = self._finish(decoded, *args, **kwargs)
+            return res
+
+        p = self._find(name)
+        res = self._cache[key] = self._load(p, *args, **kwargs)
+        return res
+
+    def _find(self, name):
+        """Get the path of the resource called name.
+
+        Raise KeyError if there is no such resource.
+        """
         if not self._have_root:
             self.validate_root(name)
-        p = os.path.join(self._root(), name)
-
-        if not os.path.isfile(p):
-            for ext in self.EXTNS:
-                p = os.path.join(self._root(), name + '.' + ext)
-                if os.path.exists(p):
-                    break
-            else:
-                raise KeyError(
-                    "No {type} found like '{name}'. "
-                    "Are you sure the {type} exists?".format(
-                        type=self.TYPE,
-                        name=name
-                    )
+        try:
+            return self._directory_index().find(name)
+        except KeyError:
+            raise KeyError(
+                "No {type} found like '{name}'. "
+                "Are you sure the {type} exists?".format(
+                    type=self.TYPE,
+                    name=name
                 )
+            ) from None
 
-        validate_compatible_path(p)
-        res = self._cache[key] = self._load(p, *args, **kwargs)
-        return res
+    def _directory_index(self, refresh=False):
+        """Get the index of the directory, listing it if necessary.
+
+        If refresh is True, list the directory again if it has changed.
+        """
+        r = self._root()
+        index = self._index
+        if index is None or index.path != r:
+            index = DirectoryIndex(r, self.EXTNS)
+            index.refresh()
+            self._index = index
+        elif refresh:
+            index.refresh()
+        return index
+
+    def _load(self, path, *args, **kwargs):
+        return self._finish(self._decode(path, *args, **kwargs), *args, **kwargs)
+
+    def _decode(self, path, *args, **kwargs):
+        """Read the resource at path; this may be run on a worker thread."""
+        raise NotImplementedError()
+
+    def _finish(self, decoded, *args, **kwargs):
+        """Make a decoded resource ready for use, on the main thread."""
+        return decoded
+
+    def prefetch(self, names, *args, **kwargs):
+        """Start loading the named resources in the background.
+
+        Any extra arguments are passed to the loader for every resource, as
+        for load(). Raise KeyError if any of the resources don't exist.
+
+        Return a Progress object. The resources are finished off by the game
+        loop over the following frames; using one before then waits for it
+        to load.
+        """
+        if isinstance(names, str):
+            names = [names]
+        keys = []
+        paths = {}
+        for name in names:
+            key = self.cache_key(name, args, kwargs)
+            keys.append(key)
+            if key not in self._cache and key not in self._pending:
+                paths[key] = self._find(name)
+
+        executor = get_executor()
+        for key, p in paths.items():
+            self._pending[key] = executor.submit(
+                self._decode, p, *args, **kwargs
+            )
+        if self._pending and self not in _loading:
+            _loading.append(self)
+        return Progress(self, keys)
+
+    def preload(self, *args, **kwargs):
+        """Start loading every resource in the directory in the background.
+
+        Subdirectories are not included. Return a Progress object, as for
+        prefetch().
+        """
+        return self.prefetch(self._resource_names(), *args, **kwargs)
+
+    def _resource_names(self):
+        """Get the names of the resources in the directory, in order."""
+        if not self._have_root:
+            self.validate_root('*')
+        return list(self._directory_index(refresh=True).names)
+
+    def poll(self, deadline=None):
+        """Finish resources that have been loaded in the background.
+
+        Stop once perf_counter() passes deadline, if given. Resources that
+        failed to load are left, so that the error is raised when they are
+        used.
+
+        Return True if any resources were finished.
+        """
+        finished = False
+        for key, future in list(self._pending.items()):
+            if not future.done() or future.exception() is not None:
+                continue
+            name, args, kwargs = key
+            self._cache[key] = self._finish(
+                future.result(), *args, **dict(kwargs)
+            )
+            self._forget_pending(key)
+            finished = True
+            if deadline is not None and perf_counter() >= deadline:
+                break
+        return finished
+
+    def _forget_pending(self, key):
+        del self._pending[key]
+        if not self._pending and self in _loading:
+            _loading.remove(self)
 
     def unload(self, name, *args, **kwargs):
         key = self.cache_key(name, args, kwargs)
         if key in self._cache:
             del self._cache[key]
+        if key in self._pending:
+            self._pending[key].cancel()
+            self._forget_pending(key)
 
     def unload_all(self):
         self._cache.clear()
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        if self in _loading:
+            _loading.remove(self)
 
     def __getattr__(self, name):
-        p = os.path.join(self._root(), name)
-        if os.path.isdir(p):
+        try:
+            is_dir = self._directory_index().isdir(name)
+        except OSError:
+            is_dir = False
+        if is_dir:
             resource = self.__class__(os.path.join(self._subpath, name))
         else:
             try:
@@ -164,10 +573,8 @@ class ResourceLoader:
     def __dir__(self):
         standard_attributes = [key for key in self.__dict__.keys()
                                if not key.startswith("_")]
-        resources = os.listdir(self._root())
-        resource_names = [os.path.splitext(r) for r in resources]
-        loadable_names = [name for name, ext in resource_names
-                          if name.isidentifier() and ext[1:] in self.EXTNS]
+        resources = self._directory_index(refresh=True).names
+        loadable_names = [name for name in resources if name.isidentifier()]
         return standard_attributes + loadable_names
 
 
@@ -175,8 +582,103 @@ class ImageLoader(ResourceLoader):
     EXTNS = ['png', 'gif', 'jpg', 'jpeg', 'bmp', 'webp']
     TYPE = 'image'
 
-    def _load(self, path):
-        return pygame.image.load(path).convert_alpha()
+    # Subdirectory in which an atlas of the images is saved
+    ATLAS_DIR = '.atlas'
+
+    def __init__(self, subpath):
+        super().__init__(subpath)
+        self._atlas = None
+        self._atlas_checked = False
+
+    def load(self, name, *args, **kwargs):
+        if not self._atlas_checked:
+            self._use_saved_atlas()
+        return super().load(name, *args, **kwargs)
+
+    def prefetch(self, names, *args, **kwargs):
+        if not self._atlas_checked:
+            self._use_saved_atlas()
+        return super().prefetch(names, *args, **kwargs)
+
+    def _atlas_dir(self):
+        return os.path.join(self._root(), self.ATLAS_DIR)
+
+    def _atlas_sources(self):
+        """Describe the image files, to tell if a saved atlas is stale."""
+        sources = {}
+        for name in self._resource_names():
+            p = self._find(name)
+            st = os.stat(p)
+            sources[name] = [os.path.basename(p), st.st_mtime_ns, st.st_size]
+        return sources
+
+    def build_atlas(
+            self,
+            page_size=atlas.PAGE_SIZE,
+            max_image_size=atlas.MAX_IMAGE_SIZE,
+            save=False):
+        """Pack the small images in this directory into a texture atlas.
+
+        Afterwards, loading any of the packed images gets a subsurface of
+        the atlas. Images in subdirectories are not included.
+
+        If an atlas saved with the same settings is up to date, it is used;
+        otherwise a new atlas is built, and saved if save is True.
+
+        Return the TextureAtlas.
+        """
+        settings = {
+            'page_size': page_size,
+            'max_image_size': max_image_size,
+            'padding': atlas.PADDING,
+        }
+        sources = self._atlas_sources()
+        directory = self._atlas_dir()
+        index = TextureAtlas.read_index(directory)
+        if index and index['sources'] == sources \
+                and index['settings'] == settings:
+            result = TextureAtlas.load(directory, index)
+        else:
+            paths = {name: self._find(name) for name in sources}
+            result = build_atlas(
+                paths, page_size, atlas.PADDING, max_image_size
+            )
+            if save:
+                result.save(directory, sources, settings)
+        self._install_atlas(result)
+        return result
+
+    def _install_atlas(self, result):
+        if pygame.display.get_surface() is not None:
+            result.convert_alpha()
+        self._atlas = result
+        for name in result:
+            self._cache[self.cache_key(name, (), {})] = result[name]
+
+    def _use_saved_atlas(self):
+        """Use the saved atlas for this directory, if it is up to date."""
+        self._atlas_checked = True
+        directory = self._atlas_dir()
+        if not os.path.isdir(directory):
+            return
+        index = TextureAtlas.read_index(directory)
+        if index is None or index['sources'] != self._atlas_sources():
+            return
+        self._install_atlas(TextureAtlas.load(directory, index))
+
+    def _decode(self, path):
+        cache = image_cache
+        if cache is None:
+            return pygame.image.load(path)
+        surf = cache.get(path)
+        if surf is None:
+            surf = pygame.image.load(path)
+            cache.put(path, surf)
+        return surf
+
+    def _finish(self, surf):
+        # Converting needs the display, so is done on the main thread
+        return surf.convert_alpha()
 
     def __repr__(self):
         return "<Images images={}>".format(self.__dir__())
@@ -190,7 +692,7 @@ class SoundLoader(ResourceLoader):
     EXTNS = ['wav', 'ogg', 'oga']
     TYPE = 'sound'
 
-    def _load(self, path):
+    def _decode(self, path):
         try:
             return pygame.mixer.Sound(path)
         except pygame.error as err:
@@ -232,7 +734,7 @@ class FontLoader(ResourceLoader):
     EXTNS = ['ttf']
     TYPE = 'font'
 
-    def _load(self, path, fontsize=None):
+    def _decode(self, path, fontsize=None):
         return pygame.font.Font(path, fontsize or ptext.DEFAULT_FONT_SIZE)
 
 
@@ -0,0 +1,142 @@
+"""An on-screen overlay showing performance statistics.
+
+The overlay shows a graph of recent frame times, and counts of the objects
+the game loop is managing: scheduled clock events, running animations, and
+the sizes of the text and resource caches.
+
+It is shown by running ``pgzrun --overlay``, or toggled by pressing F12.
+
+"""
+import pygame
+
+from . import clock
+from . import loaders
+from . import ptext
+
+__all__ = ['Overlay']
+
+
+class Overlay:
+    """Draw performance statistics over the top of the game.
+
+    The overlay is drawn after the game's draw() and removed again once the
+    frame has been displayed, so the game never sees it on the screen
+    surface.
+
+    """
+
+    TOGGLE_KEY = pygame.K_F12
+
+    WIDTH = 240
+    GRAPH_HEIGHT = 60
+    LINE_HEIGHT = 14
+    MARGIN = 4
+
+    # Frame time at the top of the graph, and the default for the reference
+    # line, in ms
+    GRAPH_MAX_MS = 50
+    TARGET_MS = 1000 / 60
+
+    # Re-render the text every this many frames
+    TEXT_INTERVAL = 15
+
+    def __init__(self, visible=False, history=WIDTH, target_ms=TARGET_MS):
+        self.visible = visible
+        # The frame time the game is aiming for, drawn as a line on the graph
+        self.target_ms = target_ms
+        self._frame_times = [0.0] * history
+        self._pos = 0
+        self._frames = 0
+        self._font = None
+        self._background = None
+        self._lines = []
+        self._under = None
+        self._rect = None
+
+    def toggle(self):
+        """Show the overlay if it is hidden, or hide it if it is shown."""
+        self.visible = not self.visible
+        self._lines = []
+
+    def record_frame(self, dt):
+        """Record the time taken by a frame, in seconds."""
+        self._frame_times[self._pos] = dt * 1e3
+        self._pos = (self._pos + 1) % len(self._frame_times)
+        self._frames += 1
+
+    def stats(self):
+        """Get a list of lines of text describing the game's state."""
+        from .animation import Animation
+
+        recent = self._frame_times
+        if self._frames < len(recent):
+            recent = recent[:self._frames]
+        mean = sum(recent) / len(recent) if recent else 0.0
+        worst = max(recent, default=0.0)
+        return [
+            f"frame {mean:.1f} ms  worst {worst:.1f} ms",
+            f"clock events {clock.clock.queue_length}  "
+            f"animations {len(Animation.animations)}",
+            f"text cache {len(ptext._surf_cache)} surfs  "
+            f"{ptext._surf_size_total // 1024} KiB",
+            f"images {len(loaders.images._cache)}  "
+            f"sounds {len(loaders.sounds._cache)}  "
+            f"fonts {len(loaders.fonts._cache)}",
+        ]
+
+    def _render_text(self):
+        if self._font is None:
+            self._font = pygame.font.Font(None, 16)
+        self._lines = [
+            self._font.render(line, True, (255, 255, 255))
+            for line in self.stats()
+        ]
+
+    def _make_background(self, height):
+        self._background = pygame.Surface((self.WIDTH, height))
+        self._background.set_alpha(192)
+        self._background.fill((0, 0, 0))
+
+    def draw(self, surface):
+        """Draw the overlay onto surface, returning the Rect drawn."""
+        if not self._lines or self._frames % self.TEXT_INTERVAL == 0:
+            self._render_text()
+
+        gh = self.GRAPH_HEIGHT
+        height = gh + len(self._lines) * self.LINE_HEIGHT + 2 * self.MARGIN
+        if self._background is None or \
+                self._background.get_height() != height:
+            self._make_background(height)
+
+        rect = pygame.Rect(0, 0, self.WIDTH, height).clip(surface.get_rect())
+        self._under = surface.subsurface(rect).copy()
+        self._rect = rect
+        surface.blit(self._background, rect)
+
+        # Frame time graph, oldest frame on the left
+        times = self._frame_times
+        n = len(times)
+        scale = gh / self.GRAPH_MAX_MS
+        target_y = gh - min(round(self.target_ms * scale), gh)
+        pygame.draw.line(
+            surface, (0, 160, 0), (0, target_y), (self.WIDTH - 1, target_y)
+        )
+        points = []
+        for i in range(n):
+            ms = times[(self._pos + i) % n]
+            y = gh - min(round(ms * scale), gh)
+            points.append((i * (self.WIDTH - 1) // max(n - 1, 1), y))
+        if len(points) > 1:
+            pygame.draw.lines(surface, (255, 200, 0), False, points)
+
+        y = gh + self.MARGIN
+        for line in self._lines:
+            surface.blit(line, (self.MARGIN, y))
+            y += self.LINE_HEIGHT
+        return rect
+
+    def restore(self, surface):
+        """Put back what was on surface before the overlay was drawn."""
+        if self._under is not None:
+            surface.blit(self._under, self._rect)
+            self._under = None
@@ -0,0 +1,193 @@
+"""Frame profiler for the Pygame Zero game loop.
+
+The game loop is divided into phases, which are timed when the profiler is
+enabled::
+
+    with profiler.phase('update'):
+        update(dt)
+
+The time spent in each phase is summed over a frame, and the totals for the
+last few hundred frames are kept in a ring buffer so that percentiles can be
+reported. Optionally every phase is also recorded as an event in a trace that
+can be written out in Chrome's trace event format, for viewing in
+chrome://tracing or https://ui.perfetto.dev/.
+
+When the profiler is disabled, phase() returns a context manager that does
+nothing.
+
+"""
+import json
+from time import perf_counter
+
+import numpy as np
+
+__all__ = ['Profiler', 'profiler', 'PHASES']
+
+
+# The phases of a frame. 'text' is part of 'draw', and 'animations' and
+# 'clock' are the clock's each_tick callbacks and scheduled events.
+PHASES = ('events', 'clock', 'animations', 'update', 'draw', 'text', 'flip')
+
+# Number of frames of history to keep for percentiles
+HISTORY = 600
+
+# Maximum number of trace events to record; further events are dropped
+TRACE_LIMIT = 1_000_000
+
+
+class _NullPhase:
+    """Context manager that does nothing, used when the profiler is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *_):
+        pass
+
+
+_null_phase = _NullPhase()
+
+
+class _Phase:
+    """Context manager that adds the time spent in it to a phase."""
+
+    __slots__ = ('profiler', 'index', 'start')
+
+    def __init__(self, profiler, index):
+        self.profiler = profiler
+        self.index = index
+
+    def __enter__(self):
+        self.start = perf_counter()
+
+    def __exit__(self, *_):
+        start = self.start
+        duration = perf_counter() - start
+        profiler = self.profiler
+        profiler._current[self.index] += duration
+        trace = profiler._trace
+        if trace is not None and len(trace) < TRACE_LIMIT:
+            trace.append((self.index, start, duration))
+
+
+class Profiler:
+    """Time the phases of each frame of the game loop."""
+
+    def __init__(self, phases=PHASES, history=HISTORY):
+        self.phases = tuple(phases)
+        self.history = history
+        self.enabled = False
+        self._indexes = {name: i for i, name in enumerate(self.phases)}
+        self._contexts = {
+            name: _Phase(self, i) for i, name in enumerate(self.phases)
+        }
+        # One row per phase, plus a last row for the whole frame
+        self._samples = np.zeros((len(self.phases) + 1, history))
+        self._current = [0.0] * len(self.phases)
+        self._trace = None
+        self.reset()
+
+    def enable(self, trace=False):
+        """Start profiling.
+
+        If trace is True, also record each phase as a trace event.
+        """
+        self.enabled = True
+        if trace and self._trace is None:
+            self._trace = []
+        self._t0 = self._frame_start = perf_counter()
+
+    def disable(self):
+        """Stop profiling."""
+        self.enabled = False
+
+    def reset(self):
+        """Discard all samples and trace events."""
+        self._samples[:] = 0
+        self._current[:] = [0.0] * len(self.phases)
+        self._pos = 0
+        self.frames = 0
+        if self._trace is not None:
+            self._trace.clear()
+        self._t0 = self._frame_start = perf_counter()
+
+    def phase(self, name):
+        """Get a context manager that times the named phase."""
+        if not self.enabled:
+            return _null_phase
+        return self._contexts[name]
+
+    def end_frame(self):
+        """Record the phase times of the frame that has just finished."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        current = self._current
+        column = self._samples[:, self._pos]
+        column[:-1] = current
+        column[-1] = now - self._frame_start
+        current[:] = [0.0] * len(current)
+        self._frame_start = now
+        self._pos = (self._pos + 1) % self.history
+        self.frames += 1
+
+    def _row(self, name):
+        if name == 'frame':
+            row = self._samples[-1]
+        else:
+            row = self._samples[self._indexes[name]]
+        return row[:min(self.frames, self.history)]
+
+    def percentiles(self, name, q=(50, 95, 99)):
+        """Get percentiles of the time per frame spent in a phase, in ms.
+
+        name may be any of the phases, or 'frame' for the whole frame. Only
+        the most recent frames are considered.
+        """
+        row = self._row(name)
+        if not len(row):
+            return [0.0] * len(q)
+        return (np.percentile(row, q) * 1e3).tolist()
+
+    def summary(self) -> str:
+        """Get a table of the percentiles of each phase."""
+        lines = [
+            f"{'phase':<12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        ]
+        for name in self.phases + ('frame',):
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:<12}{p50:9.2f}{p95:9.2f}{p99:9.2f}")
+        return '\n'.join(lines)
+
+    def trace_events(self):
+        """Get the recorded trace as a list of Chrome trace event dicts."""
+        t0 = self._t0
+        names = self.phases
+        return [
+            {
+                'name': names[index],
+                'ph': 'X',
+                'ts': (start - t0) * 1e6,
+                'dur': duration * 1e6,
+                'pid': 0,
+                'tid': 0,
+            }
+            for index, start, duration in self._trace or ()
+        ]
+
+    def write_trace(self, path):
+        """Write the recorded trace to path as Chrome trace event JSON."""
+        with open(path, 'w') as f:
+            json.dump(
+                {
+                    'traceEvents': self.trace_events(),
+                    'displayTimeUnit': 'ms',
+                },
+                f
+            )
+
+
+# The profiler used by the game loop
+profiler = Profiler()
@@ -21,7 +21,7 @@ from __future__ import division
 from math import ceil, sin, cos, radians
 import pygame
 
-from .font import Font
+Font = None  # TEMP-LOCAL
 DEFAULT_FONT_SIZE = 24
 REFERENCE_FONT_SIZE = 100
 DEFAULT_LINE_HEIGHT = 1.0
@@ -48,8 +48,14 @@ class ZRect:
     to convert from: this (or a subclass); a Pygame Rect; a 4-tuple or a
     pair of 2-tuples. In addition, they'll recognise any object which has
     an (optionally callable) .rect attribute whose value will be used instead.
+
+    The coordinates are stored in slots rather than an instance dict, which
+    keeps instances small; left, top, width and height are aliases for the
+    x, y, w and h slots so that reading them is as fast as reading x.
     """
 
+    __slots__ = ('x', 'y', 'w', 'h')
+
     _item_mapping = dict(enumerate("xywh"))
 
     def __init__(self, *args):
@@ -76,7 +82,10 @@ class ZRect:
                 % (self.__class__.__name__)
             )
 
-        self.rect = self
+    @property
+    def rect(self):
+        """This ZRect, so that pygame functions accept it as a rect."""
+        return self
 
     def _handle_one_arg(self, arg):
         """Handle -- possibly recursively -- the case of one parameter
@@ -138,7 +147,7 @@ class ZRect:
         except KeyError:
             raise IndexError
         else:
-            setattr(attribute, value)
+            setattr(self, attribute, value)
 
     def __bool__(self):
         return self.w != 0 and self.h != 0
@@ -185,34 +194,6 @@ class ZRect:
         else:
             return self.contains(*other)
 
-    def _get_width(self):
-        return self.w
-
-    def _set_width(self, width):
-        self.w = width
-    width = property(_get_width, _set_width)
-
-    def _get_height(self):
-        return self.h
-
-    def _set_height(self, height):
-        self.h = height
-    height = property(_get_height, _set_height)
-
-    def _get_top(self):
-        return self.y
-
-    def _set_top(self, top):
-        self.y = top
-    top = property(_get_top, _set_top)
-
-    def _get_left(self):
-        return self.x
-
-    def _set_left(self, left):
-        self.x = left
-    left = property(_get_left, _set_left)
-
     def _get_right(self):
         return self.x + self.w
 
@@ -520,4 +501,10 @@ class ZRect:
         return [i for i in dict.items() if self.colliderect(val(i))]
 
 
+# Alias the slot descriptors, so that these are as fast as x, y, w and h
+ZRect.left = ZRect.x
+ZRect.top = ZRect.y
+ZRect.width = ZRect.w
+ZRect.height = ZRect.h
+
 RECT_CLASSES = (pygame.rect.Rect, ZRect)
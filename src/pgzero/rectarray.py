@@ -0,0 +1,191 @@
+"""Arrays of rectangles, for testing collisions between many objects at once.
+
+A RectArray holds the coordinates of many rectangles in NumPy arrays, so that
+a collision test against all of them is a handful of array operations rather
+than a Python loop over ZRect.colliderect().
+
+"""
+import numpy as np
+
+from .rect import ZRect, RECT_CLASSES
+
+__all__ = ['RectArray']
+
+
+# Number of rows compared at once when finding all overlapping pairs; this
+# bounds the size of the temporary boolean matrices.
+PAIRS_BLOCK_SIZE = 1024
+
+
+def _coords(obj):
+    """Get (x, y, w, h) for anything accepted by ZRect (including Actors)."""
+    if isinstance(obj, RECT_CLASSES):
+        return obj.x, obj.y, obj.w, obj.h
+    r = getattr(obj, '_rect', None)
+    if isinstance(r, ZRect):
+        return r.x, r.y, r.w, r.h
+    r = ZRect(obj)
+    return r.x, r.y, r.w, r.h
+
+
+class RectArray:
+    """An array of rectangles, stored as columns of floating point numbers.
+
+    A RectArray can be constructed from any sequence of objects that ZRect
+    accepts - rects, Actors, 4-tuples and so on. The coordinates are copied,
+    so call update() after the objects have moved.
+
+    The x, y, w and h attributes are writable NumPy views of the columns.
+
+    """
+
+    def __init__(self, rects=()):
+        self._data = np.array(
+            [_coords(r) for r in rects],
+            dtype=np.float64
+        ).reshape(-1, 4)
+
+    @classmethod
+    def from_arrays(cls, x, y, w, h):
+        """Construct a RectArray from arrays of x, y, w and h values."""
+        arr = cls()
+        arr._data = np.column_stack(
+            np.broadcast_arrays(x, y, w, h)
+        ).astype(np.float64)
+        return arr
+
+    def update(self, rects):
+        """Replace the contents of this array with the given rects.
+
+        The sequence of rects may have a different length to the array.
+        """
+        coords = [_coords(r) for r in rects]
+        if len(coords) == len(self._data):
+            self._data[:] = coords
+        else:
+            self._data = np.array(coords, dtype=np.float64).reshape(-1, 4)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return '<{} of {} rects>'.format(type(self).__name__, len(self))
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return ZRect(*self._data[item].tolist())
+        arr = RectArray()
+        arr._data = self._data[item].reshape(-1, 4)
+        return arr
+
+    def __setitem__(self, item, rect):
+        self._data[item] = _coords(rect)
+
+    def __iter__(self):
+        for row in self._data.tolist():
+            yield ZRect(*row)
+
+    @property
+    def x(self):
+        return self._data[:, 0]
+
+    @property
+    def y(self):
+        return self._data[:, 1]
+
+    @property
+    def w(self):
+        return self._data[:, 2]
+
+    @property
+    def h(self):
+        return self._data[:, 3]
+
+    @property
+    def right(self):
+        return self._data[:, 0] + self._data[:, 2]
+
+    @property
+    def bottom(self):
+        return self._data[:, 1] + self._data[:, 3]
+
+    def collidepoint(self, *args):
+        """Get a boolean array of which rects contain the point (x, y)."""
+        if len(args) == 1:
+            x, y = args[0]
+        else:
+            x, y = args
+        d = self._data
+        return (
+            (d[:, 0] <= x) & (x < d[:, 0] + d[:, 2]) &
+            (d[:, 1] <= y) & (y < d[:, 1] + d[:, 3])
+        )
+
+    def colliderect(self, *other):
+        """Get a boolean array of which rects overlap the given rect."""
+        x, y, w, h = _coords(other[0] if len(other) == 1 else other)
+        d = self._data
+        return (
+            (d[:, 0] < x + w) &
+            (d[:, 1] < y + h) &
+            (d[:, 0] + d[:, 2] > x) &
+            (d[:, 1] + d[:, 3] > y)
+        )
+
+    def collidelist(self, rect):
+        """Get the index of the first rect overlapping rect, or -1."""
+        hits = np.flatnonzero(self.colliderect(rect))
+        return int(hits[0]) if len(hits) else -1
+
+    def collidelistall(self, rect):
+        """Get a list of the indices of all rects overlapping rect."""
+        return np.flatnonzero(self.colliderect(rect)).tolist()
+
+    def collide_pairs(self, other=None):
+        """Find all pairs of overlapping rects.
+
+        If other is given (a RectArray or a sequence of rects), return arrays
+        ``(i, j)`` such that ``self[i[k]]`` overlaps ``other[j[k]]``.
+
+        If other is not given, return the pairs of rects within this array
+        that overlap each other, with ``i < j``.
+
+        """
+        if other is None:
+            b = self._data
+        elif isinstance(other, RectArray):
+            b = other._data
+        else:
+            b = RectArray(other)._data
+        a = self._data
+
+        bx1 = b[:, 0]
+        by1 = b[:, 1]
+        bx2 = bx1 + b[:, 2]
+        by2 = by1 + b[:, 3]
+
+        found_i = []
+        found_j = []
+        for start in range(0, len(a), PAIRS_BLOCK_SIZE):
+            block = a[start:start + PAIRS_BLOCK_SIZE]
+            ax1 = block[:, 0:1]
+            ay1 = block[:, 1:2]
+            overlaps = (
+                (ax1 < bx2) &
+                (ay1 < by2) &
+                (ax1 + block[:, 2:3] > bx1) &
+                (ay1 + block[:, 3:4] > by1)
+            )
+            i, j = np.nonzero(overlaps)
+            i += start
+            if other is None:
+                keep = i < j
+                i = i[keep]
+                j = j[keep]
+            found_i.append(i)
+            found_j.append(j)
+
+        if not found_i:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty.copy()
+        return np.concatenate(found_i), np.concatenate(found_j)
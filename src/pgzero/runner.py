@@ -69,6 +69,44 @@ def main():
         action='store_true',
         help="Print periodic FPS measurements on the terminal."
     )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        help="Run without opening a window."
+    )
+    parser.add_argument(
+        '--max-frames',
+        type=int,
+        metavar='N',
+        help="Exit after running N frames."
+    )
+    parser.add_argument(
+        '--no-sleep',
+        action='store_true',
+        help="Run frames as fast as possible, with a fixed time step."
+    )
+    parser.add_argument(
+        '--no-draw',
+        action='store_true',
+        help="Don't call draw() or update the display."
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='FILE',
+        help="Time each phase of the game loop, print a summary on exit, "
+             "and write a Chrome trace to FILE."
+    )
+    parser.add_argument(
+        '--overlay',
+        action='store_true',
+        help="Show performance statistics over the game (toggle with F12)."
+    )
+    parser.add_argument(
+        '--build-atlas',
+        action='store_true',
+        help="Pack the game's small images into a texture atlas, saved in "
+             "images/.atlas, instead of running the game."
+    )
     parser.add_argument(
         '--version',
         action='version',
@@ -83,17 +121,53 @@ def main():
     if __debug__:
         warnings.simplefilter('default', DeprecationWarning)
 
+    if args.build_atlas:
+        try:
+            build_atlas(args.game)
+        except KeyError as e:
+            sys.exit(e.args[0])
+        return
+
     try:
-        load_and_run(args.game, fps=args.fps)
+        load_and_run(
+            args.game,
+            fps=args.fps,
+            headless=args.headless,
+            max_frames=args.max_frames,
+            sleep=not args.no_sleep,
+            draw=not args.no_draw,
+            profile=args.profile,
+            overlay=args.overlay,
+        )
     except NoMainModule as e:
         sys.exit(e)
 
 
+def build_atlas(path):
+    """Build and save the texture atlas for the game at path."""
+    loaders.set_root(path)
+    atlas = loaders.images.build_atlas(save=True)
+    print(
+        f"Packed {len(atlas)} images onto {len(atlas.pages)} pages in "
+        f"{loaders.images._atlas_dir()}"
+    )
+
+
 class NoMainModule(Exception):
     """Indicate that we couldn't find a main module to run."""
 
 
-def load_and_run(path, *, fps: bool = False):
+def load_and_run(
+    path,
+    *,
+    fps: bool = False,
+    headless: bool = False,
+    max_frames: int = None,
+    sleep: bool = True,
+    draw: bool = True,
+    profile: str = None,
+    overlay: bool = False
+):
     """Load and run the given Python file or directory.
 
     If a file, run this as the main PGZero game module.
@@ -108,6 +182,9 @@ def load_and_run(path, *, fps: bool = False):
     Note that the 'import pgzrun' IDE mode doesn't pass through this entry
     point, as the module is already loaded.
 
+    If headless is True, run with SDL's dummy video driver, so that no window
+    is opened. The other arguments are passed to PGZeroGame.
+
     """
     path = path.rstrip(os.sep)
     try:
@@ -153,6 +230,11 @@ You can also run a specific file with:
     # This disables the 'import pgzrun' module
     sys._pgzrun = True
 
+    if headless:
+        # The video driver is chosen when the display is initialised
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        pygame.display.quit()
+
     prepare_mod(mod)
     with temp_window():
         exec(code, mod.__dict__)
@@ -160,11 +242,20 @@ You can also run a specific file with:
     pygame.display.init()
     PGZeroGame.show_default_icon()
     try:
-        run_mod(mod, fps=fps)
+        run_mod(
+            mod,
+            fps=fps,
+            max_frames=max_frames,
+            sleep=sleep,
+            draw=draw,
+            profile=profile,
+            overlay=overlay,
+        )
     finally:
         # Clean some of the state we created, useful in testing
         pygame.display.quit()
         clock.clock.clear()
+        clock.named_clocks.clear()
         del sys.modules[name]
 
 
@@ -4,7 +4,7 @@ import pygame.draw
 from . import ptext
 from .rect import RECT_CLASSES, ZRect
 from . import loaders
-from .surface_painter import SurfacePainter
+from .surface_painter import SurfacePainter, make_color
 
 def blit_gradient(start, stop, dest_surface):
     """Blit a gradient into a destination surface.
@@ -29,11 +29,55 @@ def blit_gradient(start, stop, dest_surface):
                                  dest_surface=dest_surface)
 
 
+def merge_rects(rects, bounds):
+    """Merge overlapping rects into a list of non-overlapping rects.
+
+    Each rect in the result is the union of some of the input rects, clipped
+    to bounds. Empty rects are dropped.
+
+    """
+    merged = []
+    for r in rects:
+        r = pygame.Rect(r).clip(bounds)
+        if not r:
+            continue
+        i = r.collidelist(merged)
+        while i != -1:
+            r.union_ip(merged.pop(i))
+            i = r.collidelist(merged)
+        merged.append(r)
+    return merged
+
+
 class Screen:
     """Interface to the screen."""
+
+    # When dirty rect tracking is enabled, this is a list of the areas of the
+    # screen that have been drawn to since the display was last updated.
+    _dirty = None
+
     def _set_surface(self, surface):
         self.surface = surface
         self.width, self.height = surface.get_size()
+        self._mark_all_dirty()
+
+    def _track_dirty(self, enabled):
+        """Enable or disable tracking of the areas drawn to."""
+        if not enabled:
+            self._dirty = None
+        elif self._dirty is None:
+            self._dirty = []
+            self._mark_all_dirty()
+
+    def _mark_all_dirty(self):
+        if self._dirty is not None:
+            self._dirty[:] = [self.surface.get_rect()]
+
+    def _take_dirty(self):
+        """Get the merged dirty rects, and start a new list."""
+        rects = merge_rects(self._dirty, self.surface.get_rect())
+        self._dirty.clear()
+        return rects
 
     def bounds(self):
         """Return a Rect representing the bounds of the screen."""
@@ -51,6 +95,7 @@ class Screen:
             blit_gradient(start, stop, self.surface)
         else:
             self.surface.fill(make_color(color))
+        self._mark_all_dirty()
 
     def blit(self, image, pos):
         """Draw a sprite onto the screen.
@@ -70,11 +115,13 @@ class Screen:
         """
         if isinstance(image, str):
             image = loaders.images.load(image)
-        self.surface.blit(image, pos, None, pygame.BLEND_ALPHA_SDL2)
+        r = self.surface.blit(image, pos, None, pygame.BLEND_ALPHA_SDL2)
+        if self._dirty is not None:
+            self._dirty.append(r)
 
     @property
     def draw(self):
-        return SurfacePainter(self.surface)
+        return SurfacePainter(self.surface, self._dirty)
 
     def __repr__(self):
         return "<Screen width={} height={}>".format(self.width, self.height)
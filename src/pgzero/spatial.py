@@ -0,0 +1,345 @@
+"""Spatial indexes, for finding which objects are near a point or rect.
+
+Testing every object against every other with ``colliderect()`` takes time
+proportional to the square of the number of objects. A spatial index keeps
+track of where each object is, so that finding the objects overlapping a
+rect, point or circle only has to look at objects nearby.
+
+Two implementations are provided:
+
+* SpatialHash - a uniform grid of cells. This is the best choice when objects
+  are of similar sizes.
+* QuadTree - a tree that subdivides crowded regions of a fixed area. This
+  copes better with objects of very different sizes.
+
+The index does not notice objects moving by itself: call ``update(obj)`` after
+moving an object, or ``refresh()`` once per frame to update every object that
+has moved.
+
+"""
+from math import floor
+
+from .rectarray import _coords
+
+__all__ = ['SpatialHash', 'QuadTree']
+
+
+def _overlaps(a, b):
+    """Test whether (x, y, w, h) tuples a and b overlap, as colliderect()."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and ay < by + bh and ax + aw > bx and ay + ah > by
+
+
+def _touches(a, b):
+    """Test whether a and b overlap or share an edge."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax <= bx + bw and ay <= by + bh and ax + aw >= bx and ay + ah >= by
+
+
+def _inside(a, b):
+    """Test whether a lies entirely within b."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return bx <= ax and by <= ay and ax + aw <= bx + bw and ay + ah <= by + bh
+
+
+def _contains_point(r, px, py):
+    x, y, w, h = r
+    return x <= px < x + w and y <= py < y + h
+
+
+def _within_radius(r, cx, cy, radius):
+    """Test whether any point of rect r is within radius of (cx, cy)."""
+    x, y, w, h = r
+    dx = cx - max(x, min(cx, x + w))
+    dy = cy - max(y, min(cy, y + h))
+    return dx * dx + dy * dy <= radius * radius
+
+
+class SpatialIndex:
+    """Base class for spatial indexes.
+
+    Objects may be anything accepted by ZRect - Actors, ZRects, Rects, or
+    objects with a .rect attribute. Objects are tracked by identity, so they
+    need not be hashable.
+
+    Subclasses implement _add(), _discard() and _candidates().
+
+    """
+
+    def __init__(self):
+        # Map id(obj) to (obj, coords) for every object in the index
+        self._objects = {}
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __iter__(self):
+        for obj, _ in list(self._objects.values()):
+            yield obj
+
+    def __contains__(self, obj):
+        return id(obj) in self._objects
+
+    def insert(self, obj):
+        """Add an object to the index."""
+        if id(obj) in self._objects:
+            self.update(obj)
+            return
+        coords = _coords(obj)
+        self._objects[id(obj)] = obj, coords
+        self._add(id(obj), coords)
+
+    def remove(self, obj):
+        """Remove an object from the index.
+
+        Raise KeyError if the object is not in the index.
+        """
+        _, coords = self._objects.pop(id(obj))
+        self._discard(id(obj), coords)
+
+    def discard(self, obj):
+        """Remove an object from the index, if present."""
+        if id(obj) in self._objects:
+            self.remove(obj)
+
+    def clear(self):
+        """Remove all objects from the index."""
+        for key, (obj, coords) in list(self._objects.items()):
+            self._discard(key, coords)
+        self._objects.clear()
+
+    def update(self, obj):
+        """Update the position of obj in the index, after it has moved."""
+        key = id(obj)
+        _, old = self._objects[key]
+        coords = _coords(obj)
+        if coords != old:
+            self._objects[key] = obj, coords
+            self._move(key, old, coords)
+
+    def refresh(self):
+        """Update the positions of all objects that have moved."""
+        objects = self._objects
+        for key, (obj, old) in list(objects.items()):
+            coords = _coords(obj)
+            if coords != old:
+                objects[key] = obj, coords
+                self._move(key, old, coords)
+
+    def _move(self, key, old, new):
+        self._discard(key, old)
+        self._add(key, new)
+
+    def query_rect(self, rect):
+        """Get a list of the objects that overlap rect."""
+        r = _coords(rect)
+        objects = self._objects
+        found = []
+        for key in self._candidates(r):
+            obj, coords = objects[key]
+            if _overlaps(coords, r):
+                found.append(obj)
+        return found
+
+    def query_point(self, pos):
+        """Get a list of the objects that contain the point pos."""
+        px, py = pos
+        objects = self._objects
+        found = []
+        for key in self._candidates((px, py, 0, 0)):
+            obj, coords = objects[key]
+            if _contains_point(coords, px, py):
+                found.append(obj)
+        return found
+
+    def query_circle(self, pos, radius):
+        """Get a list of the objects within radius of the point pos."""
+        cx, cy = pos
+        box = (cx - radius, cy - radius, 2 * radius, 2 * radius)
+        objects = self._objects
+        found = []
+        for key in self._candidates(box):
+            obj, coords = objects[key]
+            if _within_radius(coords, cx, cy, radius):
+                found.append(obj)
+        return found
+
+    def collisions(self, obj):
+        """Get a list of the other objects that overlap obj."""
+        return [o for o in self.query_rect(obj) if o is not obj]
+
+
+class SpatialHash(SpatialIndex):
+    """A spatial index that sorts objects into a grid of square cells.
+
+    cell_size should be a little larger than a typical object.
+
+    """
+
+    def __init__(self, cell_size=64):
+        super().__init__()
+        self.cell_size = cell_size
+        self._cells = {}
+
+    def _cell_range(self, coords):
+        x, y, w, h = coords
+        cs = self.cell_size
+        return (
+            floor(x / cs), floor(y / cs),
+            floor((x + w) / cs), floor((y + h) / cs),
+        )
+
+    def _add(self, key, coords):
+        cells = self._cells
+        x1, y1, x2, y2 = self._cell_range(coords)
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cells[cx, cy] = {key}
+                else:
+                    cell.add(key)
+
+    def _discard(self, key, coords):
+        cells = self._cells
+        x1, y1, x2, y2 = self._cell_range(coords)
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                cell = cells[cx, cy]
+                cell.discard(key)
+                if not cell:
+                    del cells[cx, cy]
+
+    def _move(self, key, old, new):
+        # Most moves stay within the same cells, which needs no work
+        if self._cell_range(old) != self._cell_range(new):
+            self._discard(key, old)
+            self._add(key, new)
+
+    def _candidates(self, coords):
+        cells = self._cells
+        x1, y1, x2, y2 = self._cell_range(coords)
+        if x1 == x2 and y1 == y2:
+            return cells.get((x1, y1), ())
+        found = set()
+        for cx in range(x1, x2 + 1):
+            for cy in range(y1, y2 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    found |= cell
+        return found
+
+
+class _QuadNode:
+    __slots__ = ('bounds', 'depth', 'items', 'children')
+
+    def __init__(self, bounds, depth):
+        self.bounds = bounds
+        self.depth = depth
+        self.items = set()
+        self.children = None
+
+
+class QuadTree(SpatialIndex):
+    """A spatial index that recursively divides an area into quarters.
+
+    bounds is the area covered by the tree, as anything accepted by ZRect;
+    objects outside it are still found, but less efficiently. A node is
+    divided when it holds more than max_items objects, up to max_depth
+    levels deep.
+
+    """
+
+    def __init__(self, bounds, max_items=8, max_depth=8):
+        super().__init__()
+        self.max_items = max_items
+        self.max_depth = max_depth
+        self._root = _QuadNode(_coords(bounds), 0)
+        # Map each key to the node that holds it
+        self._nodes = {}
+
+    @staticmethod
+    def _child_for(node, coords):
+        """Get the child of node that entirely contains coords, if any."""
+        x, y, w, h = coords
+        bx, by, bw, bh = node.bounds
+        mx = bx + bw / 2
+        my = by + bh / 2
+        if x + w <= mx:
+            col = 0
+        elif x >= mx:
+            col = 1
+        else:
+            return None
+        if y + h <= my:
+            row = 0
+        elif y >= my:
+            row = 1
+        else:
+            return None
+        return node.children[row * 2 + col]
+
+    def _add(self, key, coords):
+        node = self._root
+        # Objects outside the tree's bounds are kept in the root node
+        while node.children is not None and _inside(coords, node.bounds):
+            child = self._child_for(node, coords)
+            if child is None:
+                break
+            node = child
+        node.items.add(key)
+        self._nodes[key] = node
+        if (node.children is None and len(node.items) > self.max_items
+                and node.depth < self.max_depth):
+            self._split(node)
+
+    def _split(self, node):
+        bx, by, bw, bh = node.bounds
+        hw = bw / 2
+        hh = bh / 2
+        depth = node.depth + 1
+        node.children = [
+            _QuadNode((bx, by, hw, hh), depth),
+            _QuadNode((bx + hw, by, hw, hh), depth),
+            _QuadNode((bx, by + hh, hw, hh), depth),
+            _QuadNode((bx + hw, by + hh, hw, hh), depth),
+        ]
+        items = node.items
+        node.items = set()
+        objects = self._objects
+        for key in items:
+            coords = objects[key][1]
+            child = None
+            if _inside(coords, node.bounds):
+                child = self._child_for(node, coords)
+            child = child or node
+            child.items.add(key)
+            self._nodes[key] = child
+
+    def _discard(self, key, coords):
+        self._nodes.pop(key).items.discard(key)
+
+    def _move(self, key, old, new):
+        node = self._nodes[key]
+        if _inside(new, node.bounds):
+            stays = node.children is None or self._child_for(node, new) is None
+        else:
+            stays = node is self._root
+        if not stays:
+            self._discard(key, old)
+            self._add(key, new)
+
+    def _candidates(self, coords):
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            found.extend(node.items)
+            if node.children is not None:
+                for child in node.children:
+                    if _touches(child.bounds, coords):
+                        stack.append(child)
+        return found
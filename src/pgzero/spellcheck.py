@@ -95,7 +95,10 @@ CONSTS = [
     'TITLE',
     'WIDTH',
     'HEIGHT',
-    'ICON'
+    'ICON',
+    'DIRTY_RECTS',
+    'UPDATE_RATE',
+    'FPS',
 ]
 
 # Available parameters for each hook
@@ -110,7 +113,7 @@ VALID_PARAMS = {
     'on_mouse_wheel': ['which', 'flipped', 'x', 'y', 'touch', 'precise_x', 'precise_y'],
     'on_key_up': ['key', 'mod'],
     'on_key_down': ['unicode', 'key', 'mod'],
-    'draw': [],
+    'draw': ['alpha'],
     'on_music_end': [],
 }
 
@@ -1,5 +1,7 @@
 import pygame
 
+from . import ptext
+from .profiler import profiler
 from .rect import RECT_CLASSES
 
 
@@ -23,27 +25,40 @@ def make_color(arg):
 
 
 class SurfacePainter:
-    """Interface to pygame.draw that is bound to a surface."""
+    """Interface to pygame.draw that is bound to a surface.
 
-    def __init__(self, surf):
+    If dirty is a list, the rects of the areas drawn to are appended to it.
+    """
+
+    def __init__(self, surf, dirty=None):
         self._surf = surf
+        self._dirty = dirty
 
+    def _mark_dirty(self, rect):
+        if self._dirty is not None:
+            self._dirty.append(rect)
 
     def line(self, start, end, color, width=1):
         """Draw a line from start to end."""
         start = round_pos(start)
         end = round_pos(end)
-        pygame.draw.line(self._surf, make_color(color), start, end, width)
+        self._mark_dirty(
+            pygame.draw.line(self._surf, make_color(color), start, end, width)
+        )
 
     def circle(self, pos, radius, color, width=1):
         """Draw a circle."""
         pos = round_pos(pos)
-        pygame.draw.circle(self._surf, make_color(color), pos, radius, width)
+        self._mark_dirty(
+            pygame.draw.circle(self._surf, make_color(color), pos, radius, width)
+        )
 
     def filled_circle(self, pos, radius, color):
         """Draw a filled circle."""
         pos = round_pos(pos)
-        pygame.draw.circle(self._surf, make_color(color), pos, radius, 0)
+        self._mark_dirty(
+            pygame.draw.circle(self._surf, make_color(color), pos, radius, 0)
+        )
 
     def polygon(self, points, color):
         """Draw a polygon."""
@@ -52,7 +67,9 @@ class SurfacePainter:
         except TypeError:
             raise TypeError("polygon() requires an iterable of points to draw") from None # noqa
         points = [round_pos(point) for point in points]
-        pygame.draw.polygon(self._surf, make_color(color), points, 1)
+        self._mark_dirty(
+            pygame.draw.polygon(self._surf, make_color(color), points, 1)
+        )
 
     def filled_polygon(self, points, color):
         """Draw a filled polygon."""
@@ -61,7 +78,9 @@ class SurfacePainter:
         except TypeError:
             raise TypeError("filled_polygon() requires an iterable of points to draw") from None # noqa
         points = [round_pos(point) for point in points]
-        pygame.draw.polygon(self._surf, make_color(color), points, 0)
+        self._mark_dirty(
+            pygame.draw.polygon(self._surf, make_color(color), points, 0)
+        )
 
     def rect(self, rect, color, width=1):
         """Draw a rectangle."""
@@ -69,7 +88,9 @@ class SurfacePainter:
             raise TypeError("rect() requires a rect to draw")
 
         if width <= 1:
-            pygame.draw.rect(self._surf, make_color(color), rect, width)
+            self._mark_dirty(
+                pygame.draw.rect(self._surf, make_color(color), rect, width)
+            )
             return
 
         c = make_color(color)
@@ -83,7 +104,7 @@ class SurfacePainter:
 
         def r(x1, y1, x2, y2):
             r = pygame.Rect(x1, y1, x2 - x1, y2 - y1)
-            pygame.draw.rect(self._surf, c, r, 0)
+            self._mark_dirty(pygame.draw.rect(self._surf, c, r, 0))
 
         r(l1, t1, r2, t2)  # top inclusive
         r(l1, t2, l2, b1)  # left exclusive
@@ -94,14 +115,20 @@ class SurfacePainter:
         """Draw a filled rectangle."""
         if not isinstance(rect, RECT_CLASSES):
             raise TypeError("screen.draw.filled_rect() requires a rect to draw")
-        pygame.draw.rect(self._surf, make_color(color), rect, 0)
+        self._mark_dirty(
+            pygame.draw.rect(self._surf, make_color(color), rect, 0)
+        )
 
     def text(self, *args, **kwargs):
         """Draw text to the surface."""
         # FIXME: expose ptext parameters, for autocompletion and autodoc
-        ptext.draw(*args, surf=self._surf, **kwargs)
+        with profiler.phase('text'):
+            tsurf, pos = ptext.draw(*args, surf=self._surf, **kwargs)
+        self._mark_dirty(pygame.Rect(pos, tsurf.get_size()))
 
     def textbox(self, *args, **kwargs):
         """Draw text to the surface, wrapped to fit a box"""
         # FIXME: expose ptext parameters, for autocompletion and autodoc
-        ptext.drawbox(*args, surf=self._surf, **kwargs)
+        with profiler.phase('text'):
+            tsurf, pos = ptext.drawbox(*args, surf=self._surf, **kwargs)
+        self._mark_dirty(pygame.Rect(pos, tsurf.get_size()))
@@ -0,0 +1,543 @@
+"""Timelines, for playing many animations in a planned order.
+
+Chaining animations with ``on_finished`` callbacks starts a new Animation
+for each step. A Timeline is instead built up front from steps::
+
+    timeline = Timeline(
+        tween(alien, pos=(400, 300), duration=2),
+        parallel(
+            tween(alien, angle=90, tween='bounce_end'),
+            tween(boss, opacity=0),
+        ),
+        delay(0.5),
+        call(sounds.explosion.play),
+        repeat=3,
+        yoyo=True,
+    )
+    timeline.play()
+
+When the timeline is created, the steps are flattened into a sorted list of
+segments for each attribute being animated, and the times at which segments
+start and end are collected. While it plays, a single clock callback finds
+by binary search which segments are in progress, and tweens them all with
+NumPy, as the AnimationManager does for animate(). Only attributes whose
+segments have started or ended since the last frame are looked at
+individually.
+
+"""
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from . import clock as _clock
+from .animation import Animation, ease_all, get_tween, tween_attr, _number
+
+__all__ = [
+    'Timeline', 'tween', 'delay', 'call', 'sequence', 'parallel',
+]
+
+
+class Step:
+    """Base class for the steps that make up a timeline."""
+
+    #: The time the step takes, in seconds
+    duration = 0.0
+
+    def _compile(self, start, timeline):
+        """Add this step to timeline, starting at time start."""
+        raise NotImplementedError()
+
+
+class Tween(Step):
+    """Animate attributes of an object from their values at that point."""
+
+    def __init__(self, object, tween, duration, targets):
+        if duration < 0:
+            raise ValueError('duration must not be negative, not %r' % duration)
+        for k in targets:
+            if not hasattr(object, k):
+                raise ValueError(
+                    'object %r has no attribute %s to animate' % (object, k)
+                )
+        self.object = object
+        self.function = get_tween(tween)
+        self.duration = duration
+        self.targets = targets
+
+    def _compile(self, start, timeline):
+        end = start + self.duration
+        for k, value in self.targets.items():
+            timeline._add_segment(
+                self.object, k, start, end, self.function, value
+            )
+
+
+class Delay(Step):
+    """Wait before the next step."""
+
+    def __init__(self, duration):
+        if duration < 0:
+            raise ValueError('duration must not be negative, not %r' % duration)
+        self.duration = duration
+
+    def _compile(self, start, timeline):
+        pass
+
+
+class Call(Step):
+    """Call a function, taking no time."""
+
+    def __init__(self, callback, args):
+        self.callback = callback
+        self.args = args
+
+    def _compile(self, start, timeline):
+        timeline._add_call(start, self.callback, self.args)
+
+
+class Sequence(Step):
+    """Run steps one after another."""
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.duration = sum(step.duration for step in steps)
+
+    def _compile(self, start, timeline):
+        for step in self.steps:
+            step._compile(start, timeline)
+            start += step.duration
+
+
+class Parallel(Step):
+    """Run steps at the same time, until the longest has finished."""
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.duration = max((step.duration for step in steps), default=0.0)
+
+    def _compile(self, start, timeline):
+        for step in self.steps:
+            step._compile(start, timeline)
+
+
+def tween(object, tween='linear', duration=1, **targets):
+    """A step animating attributes of object, as animate() does."""
+    return Tween(object, tween, duration, targets)
+
+
+def delay(duration):
+    """A step that waits for duration seconds."""
+    return Delay(duration)
+
+
+def call(callback, *args):
+    """A step that calls callback(*args)."""
+    return Call(callback, args)
+
+
+def sequence(*steps):
+    """A step that runs steps one after another."""
+    return Sequence(steps)
+
+
+def parallel(*steps):
+    """A step that runs steps at the same time."""
+    return Parallel(steps)
+
+
+def _delta(start, end):
+    """Get end - start, if start and end are numbers or tuples of numbers.
+
+    Return None for other values, which are tweened with tween_attr().
+    """
+    if _number(start) and _number(end):
+        return end - start
+    if (type(start) is tuple and type(end) is tuple
+            and all(map(_number, start)) and all(map(_number, end))):
+        return tuple([b - a for a, b in zip(start, end)])
+    return None
+
+
+class _Track:
+    """The segments animating one attribute of one object."""
+
+    __slots__ = (
+        'object', 'attr', 'starts', 'ends', 'functions', 'targets',
+        'initial', 'origins', 'deltas', 'state',
+    )
+
+    def __init__(self, object, attr):
+        self.object = object
+        self.attr = attr
+        self.starts = []
+        self.ends = []
+        self.functions = []
+        self.targets = []
+
+    def reset(self):
+        """Read the attribute's current value, before the timeline plays.
+
+        Each segment animates from the target of the one before it, or
+        from this value for the first segment.
+        """
+        self.initial = getattr(self.object, self.attr)
+        self.origins = [self.initial] + self.targets[:-1]
+        # For numbers, and tuples of numbers, precompute the differences
+        # between the values, so tweening is a multiply and an add
+        self.deltas = [
+            _delta(start, end) for start, end in zip(self.origins, self.targets)
+        ]
+        # What was last written: -1 for the initial value, 2 * i + 1 for the
+        # target of segment i, or None part way through a segment
+        self.state = -1
+
+    def seek(self, t):
+        """Set the attribute to its value at time t."""
+        starts = self.starts
+        i = bisect_right(starts, t) - 1
+        if i < 0:
+            state = -1
+            if self.state == state:
+                return
+            value = self.initial
+        elif t >= self.ends[i]:
+            state = 2 * i + 1
+            if self.state == state:
+                return
+            value = self.targets[i]
+        else:
+            state = None
+            start = starts[i]
+            n = self.functions[i]((t - start) / (self.ends[i] - start))
+            origin = self.origins[i]
+            delta = self.deltas[i]
+            if delta.__class__ is tuple:
+                value = tuple([a + d * n for a, d in zip(origin, delta)])
+            elif delta is None:
+                value = tween_attr(n, origin, self.targets[i])
+            else:
+                value = origin + delta * n
+        self.state = state
+        setattr(self.object, self.attr, value)
+
+
+class Timeline:
+    """A planned sequence of animations and function calls.
+
+    The steps are run in sequence. When played, the timeline runs repeat
+    times, or forever if repeat is None; if yoyo is True, every other
+    repetition runs backwards.
+
+    Timelines run on the default clock, or on clock, which may be a Clock
+    or the name of a clock made with clock.create().
+
+    """
+
+    # Stores strong references to timelines that are playing
+    playing = []
+
+    def __init__(self, *steps, repeat=1, yoyo=False, clock=None,
+                 on_finished=None):
+        if repeat is not None and repeat < 1:
+            raise ValueError('repeat must be at least 1, not %r' % repeat)
+        self.step = steps[0] if len(steps) == 1 else Sequence(steps)
+        self.duration = self.step.duration
+        self.repeat = repeat
+        self.yoyo = yoyo
+        if clock is None:
+            clock = _clock.clock
+        elif isinstance(clock, str):
+            clock = _clock.get(clock)
+        self.clock = clock
+        self.on_finished = on_finished
+
+        self._tracks = {}
+        self._calls = []
+        self.step._compile(0.0, self)
+        self._tracks = list(self._tracks.values())
+        self._index_segments()
+        self._calls.sort(key=lambda c: c[0])
+        self._call_times = [c[0] for c in self._calls]
+
+        self._t = 0.0
+        self._running = False
+        # Incremented by play() and stop(), so that a call that restarts or
+        # stops the timeline can be noticed
+        self._generation = 0
+
+    def _add_segment(self, object, attr, start, end, function, target):
+        key = id(object), attr
+        track = self._tracks.get(key)
+        if track is None:
+            track = self._tracks[key] = _Track(object, attr)
+        # Segments are almost always added in order of start time
+        i = bisect_right(track.starts, start)
+        track.starts.insert(i, start)
+        track.ends.insert(i, end)
+        track.functions.insert(i, function)
+        track.targets.insert(i, target)
+
+    def _add_call(self, time, callback, args):
+        self._calls.append((time, callback, args))
+
+    def _index_segments(self):
+        """Gather the segments of every track, to tween them together."""
+        # (track, index in track) for each segment
+        self._segments = []
+        starts = []
+        ends = []
+        functions = []
+        events = []
+        for ti, track in enumerate(self._tracks):
+            for i, (start, end) in enumerate(zip(track.starts, track.ends)):
+                self._segments.append((track, i))
+                starts.append(start)
+                ends.append(end)
+                functions.append(track.functions[i])
+                events.append((start, ti))
+                events.append((end, ti))
+
+        # The tracks with a segment starting or ending at each time
+        events.sort()
+        self._event_times = [time for time, _ in events]
+        self._event_tracks = [ti for _, ti in events]
+
+        # Between two consecutive bounds, the same segments are in progress
+        self._bounds = sorted(set(starts) | set(ends))
+
+        self._seg_start = np.array(starts, dtype=np.float64)
+        self._seg_end = np.array(ends, dtype=np.float64)
+        self._functions = list(dict.fromkeys(functions))
+        ids = {f: i for i, f in enumerate(self._functions)}
+        self._seg_function = np.array(
+            [ids[f] for f in functions], dtype=np.intp
+        )
+
+    def _prepare_lanes(self):
+        """Gather the numbers tweened by each segment into arrays.
+
+        As in the AnimationManager, each number is a "lane"; a segment
+        tweening a tuple has one lane per item, and one tweening other
+        values has none.
+        """
+        origins = []
+        deltas = []
+        # (type, first lane, number of lanes) for each segment
+        self._seg_lanes = []
+        for track, i in self._segments:
+            delta = track.deltas[i]
+            if delta is None:
+                self._seg_lanes.append((None, 0, 0))
+            elif type(delta) is tuple:
+                self._seg_lanes.append((tuple, len(origins), len(delta)))
+                origins.extend(track.origins[i][:len(delta)])
+                deltas.extend(delta)
+            else:
+                self._seg_lanes.append((float, len(origins), 1))
+                origins.append(track.origins[i])
+                deltas.append(delta)
+        self._lane_origin = np.array(origins, dtype=np.float64)
+        self._lane_delta = np.array(deltas, dtype=np.float64)
+        # The segments in progress between each pair of bounds, and how to
+        # tween them, found when first needed
+        self._in_progress = {}
+
+    @property
+    def running(self):
+        """True if the timeline is playing."""
+        return self._running
+
+    @property
+    def t(self):
+        """The time for which the timeline has been playing."""
+        return self._t
+
+    @property
+    def total_duration(self):
+        """The time the timeline takes to play, or None if it repeats forever.
+        """
+        if self.repeat is None:
+            return None
+        return self.duration * self.repeat
+
+    def play(self):
+        """Play the timeline from the beginning.
+
+        The attributes animated by the timeline start from their current
+        values, and any animations of them with animate() are stopped.
+        Return the timeline.
+        """
+        if self._running:
+            self.stop()
+        for track in self._tracks:
+            other = Animation._animation_dict.get((id(track.object), track.attr))
+            if other is not None:
+                other._remove_target(track.attr)
+            track.reset()
+        self._prepare_lanes()
+        self._t = 0.0
+        self._u = None
+        self._running = True
+        self._generation += 1
+        self.playing.append(self)
+        self.clock.each_tick(self._tick)
+        self._tick(0.0, first=True)
+        return self
+
+    def stop(self, complete=False):
+        """Stop the timeline.
+
+        If complete is True, set the animated attributes to their values at
+        the end of the timeline. Functions still to be called are not called.
+        """
+        if not self._running:
+            return
+        if complete and self.repeat is not None:
+            self._seek(self.total_duration, True)
+        self._stopped()
+
+    def _stopped(self):
+        self._running = False
+        self._generation += 1
+        self.clock.unschedule(self._tick)
+        self.playing.remove(self)
+
+    def _local_time(self, t, done):
+        """Get the time within a repetition corresponding to time t."""
+        d = self.duration
+        if d == 0:
+            return 0.0
+        if done:
+            # Past the end of every segment, whatever rounding errors there
+            # were in adding up their times
+            rep = self.repeat - 1
+            u = float('inf')
+        else:
+            rep = int(t // d)
+            u = t - rep * d
+        if self.yoyo and rep % 2:
+            u = 0.0 if done else d - u
+        return u
+
+    def _seek(self, t, done=False):
+        u = self._local_time(t, done)
+        prev = self._u
+        self._u = u
+        if prev is None:
+            changed = self._tracks
+        else:
+            # Tracks with segments starting or ending between the previous
+            # time and this one need their values set individually
+            lo, hi = (prev, u) if prev <= u else (u, prev)
+            times = self._event_times
+            i = bisect_left(times, lo)
+            j = bisect_right(times, hi)
+            tracks = self._tracks
+            changed = [
+                tracks[ti] for ti in dict.fromkeys(self._event_tracks[i:j])
+            ]
+        for track in changed:
+            track.seek(u)
+        self._tween_in_progress(u)
+
+    def _find_in_progress(self, u):
+        segs = np.flatnonzero((self._seg_start <= u) & (u < self._seg_end))
+        lanes = []
+        lane_segs = []
+        writers = []
+        for pos, s in enumerate(segs.tolist()):
+            track, i = self._segments[s]
+            kind, first, count = self._seg_lanes[s]
+            writers.append((track, i, kind, len(lanes), count))
+            lanes.extend(range(first, first + count))
+            lane_segs.extend([pos] * count)
+        return (
+            segs,
+            np.array(lanes, dtype=np.intp),
+            np.array(lane_segs, dtype=np.intp),
+            writers,
+        )
+
+    def _tween_in_progress(self, u):
+        """Set the values of all attributes part way through a segment."""
+        k = bisect_right(self._bounds, u)
+        found = self._in_progress.get(k)
+        if found is None:
+            found = self._in_progress[k] = self._find_in_progress(u)
+        segs, lanes, lane_segs, writers = found
+        if not writers:
+            return
+
+        start = self._seg_start[segs]
+        n = (u - start) / (self._seg_end[segs] - start)
+        eased = ease_all(self._functions, self._seg_function[segs], n)
+        values = (
+            self._lane_origin[lanes]
+            + self._lane_delta[lanes] * eased[lane_segs]
+        ).tolist()
+        eased = eased.tolist()
+        for pos, (track, i, kind, first, count) in enumerate(writers):
+            if kind is float:
+                value = values[first]
+            elif kind is tuple:
+                value = tuple(values[first:first + count])
+            else:
+                value = tween_attr(eased[pos], track.origins[i], track.targets[i])
+            setattr(track.object, track.attr, value)
+
+    def _tick(self, dt, first=False):
+        t0 = self._t
+        t = t0 + dt
+        total = self.total_duration
+        done = total is not None and t >= total
+        if done:
+            t = total
+        self._t = t
+        self._seek(t, done)
+        if self._calls:
+            generation = self._generation
+            # On the first tick, calls at time 0 are due
+            self._fire(-1.0 if first else t0, t)
+            if self._generation != generation:
+                return
+        if done:
+            self._stopped()
+            if self.on_finished is not None:
+                self.on_finished()
+
+    def _due(self, t0, t1):
+        """Get the calls due after time t0, up to and including t1."""
+        d = self.duration
+        times = self._call_times
+        if d == 0:
+            return self._calls if t0 < 0 <= t1 else []
+        first = max(int(t0 // d), 0)
+        last = int(t1 // d)
+        if self.repeat is not None:
+            last = min(last, self.repeat - 1)
+        due = []
+        for rep in range(first, last + 1):
+            lo = t0 - rep * d
+            hi = t1 - rep * d
+            if self.yoyo and rep % 2:
+                # Running backwards, a call at u is made at d - u into the
+                # repetition; calls at d were made at the turn
+                i = bisect_left(times, d - hi)
+                j = bisect_left(times, min(d - lo, d))
+                due.extend(reversed(self._calls[i:j]))
+            else:
+                i = bisect_right(times, lo)
+                j = bisect_right(times, hi)
+                if self.yoyo and rep > 0:
+                    # Calls at 0 were made at the turn
+                    i = max(i, bisect_right(times, 0.0))
+                due.extend(self._calls[i:j])
+        return due
+
+    def _fire(self, t0, t1):
+        generation = self._generation
+        for _, callback, args in self._due(t0, t1):
+            callback(*args)
+            if self._generation != generation:
+                # The timeline was stopped or restarted
+                return
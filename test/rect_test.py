@@ -767,6 +767,29 @@ class PGZeroRectText(unittest.TestCase):
         r = Rect(0, 0, 1, 1)
         self.assertTrue(r.collidepoint((0.5, 0.5)))
 
+    def test_setitem(self):
+        r = Rect(1, 2, 3, 4)
+        r[2] = 10
+        self.assertEqual(r, Rect(1, 2, 10, 4))
+
+    def test_no_instance_dict(self):
+        """ZRect stores its coordinates in slots."""
+        r = Rect(1, 2, 3, 4)
+        with self.assertRaises(AttributeError):
+            r.foo = 1
+
+    def test_aliases_share_storage(self):
+        r = Rect(1, 2, 3, 4)
+        r.left = 5
+        r.height = 6
+        self.assertEqual((r.x, r.h), (5, 6))
+
+    def test_used_in_pygame_draw(self):
+        """pygame functions accept a ZRect as a rect."""
+        surf = pygame.Surface((10, 10))
+        drawn = pygame.draw.rect(surf, (255, 0, 0), Rect(1.5, 2.5, 3, 4))
+        self.assertEqual(drawn, pygame.Rect(1, 2, 3, 4))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,11 @@ import unittest
 
 import pygame
 
-from pgzero.actor import calculate_anchor, Actor
+from pgzero import game
+from pgzero.actor import (
+    calculate_anchor, Actor, SpriteGroup, TransformCache, transform_cache,
+    rotation_atlases,
+)
 from pgzero.loaders import set_root
 
 
@@ -141,8 +145,160 @@ class ActorTest(unittest.TestCase):
 
         self.assertEqual(a.opacity, 1.0)
 
+    def test_transformed_surface_shared(self):
+        """Actors with the same image, angle and opacity share a surface."""
+        transform_cache.clear()
+        a = Actor('alien')
+        b = Actor('alien')
+        for actor in (a, b):
+            actor.angle = 45
+            actor.opacity = 0.5
+        self.assertIs(
+            a._build_transformed_surf(),
+            b._build_transformed_surf(),
+        )
+        self.assertEqual(transform_cache.hits, 2)
+
+    def test_transform_cache_reload(self):
+        """Reloading an image doesn't reuse the old image's surfaces."""
+        transform_cache.clear()
+        a = Actor('alien')
+        a.angle = 45
+        old = a._build_transformed_surf()
+        a.unload_image()
+        b = Actor('alien')
+        b.angle = 45
+        self.assertIsNot(b._orig_surf, a._orig_surf)
+        self.assertIsNot(b._build_transformed_surf(), old)
+
+    def test_small_angle_geometry(self):
+        """The rect matches the rotated surface, not the exact angle."""
+        a = Actor('alien', pos=(100, 100))
+        a.angle = 0.2
+        self.assertEqual(a._build_transformed_surf().get_size(), (66, 92))
+        self.assertEqual((a.width, a.height), (66, 92))
+        self.assertEqual(a.pos, (100, 100))
+        a.angle = 89.9
+        self.assertEqual(
+            (a.width, a.height), a._build_transformed_surf().get_size()
+        )
+
+    def test_transform_cache_eviction(self):
+        """The least recently used surfaces are evicted over budget."""
+        cache = TransformCache(max_bytes=250)
+        surfs = [pygame.Surface((5, 5), pygame.SRCALPHA) for _ in range(3)]
+        cache.put('a', surfs[0])
+        cache.put('b', surfs[1])
+        cache.get('a')
+        cache.put('c', surfs[2])
+        self.assertIs(cache.get('a'), surfs[0])
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.bytes, 200)
+
+    def test_prerotated_frames(self):
+        """Prerotated actors are drawn with the nearest prerotated frame."""
+        atlas = Actor.prerotate('alien', steps=4)
+        self.addCleanup(rotation_atlases.clear)
+        a = Actor('alien', pos=(100, 100))
+        a.angle = 80
+        self.assertEqual(a.angle, 80)
+        self.assertIs(a._build_transformed_surf(), atlas.frames[1])
+        self.assertEqual((a.width, a.height), (92, 66))
+        self.assertEqual(a.pos, (100, 100))
+
+    def test_prerotated_opacity(self):
+        """Prerotated actors snap their rotation even with opacity set."""
+        Actor.prerotate('alien', steps=4)
+        self.addCleanup(rotation_atlases.clear)
+        a = Actor('alien', pos=(100, 100))
+        a.opacity = 0.5
+        a.angle = 100
+        self.assertEqual(a._build_transformed_surf().get_size(), (92, 66))
+
+    def test_rect_attributes_delegated(self):
+        """Rect attributes read and write the actor's rect."""
+        a = Actor('alien')
+        a.left = 10
+        a.midbottom = (50, 100)
+        self.assertNotIn('left', vars(a))
+        self.assertEqual(a._rect.topleft, (17, 8))
+        self.assertTrue(a.collidepoint(20, 10))
+
+    def test_collide_mask_overlapping(self):
+        """Actors whose visible pixels overlap collide."""
+        a = Actor('alien', pos=(100, 100))
+        b = Actor('alien', pos=(120, 110))
+        self.assertTrue(a.collide_mask(b))
+        self.assertTrue(b.collide_mask(a))
+
+    def test_collide_mask_transparent_corners(self):
+        """Overlapping bounding rects alone are not a collision."""
+        a = Actor('alien', topleft=(0, 0))
+        b = Actor('alien', topleft=(60, 86))
+        self.assertTrue(a.colliderect(b))
+        self.assertFalse(a.collide_mask(b))
+
+    def test_collide_mask_far_apart(self):
+        a = Actor('alien', topleft=(0, 0))
+        b = Actor('alien', topleft=(500, 0))
+        self.assertFalse(a.collide_mask(b))
+        self.assertIsNone(a._mask)
+
+    def test_collide_mask_follows_transform(self):
+        """The mask is rebuilt when the actor's appearance changes."""
+        a = Actor('alien', pos=(100, 100))
+        b = Actor('alien', pos=(100, 100))
+        self.assertTrue(a.collide_mask(b))
+        a.opacity = 0
+        self.assertFalse(a.collide_mask(b))
+
     def test_dir_correct(self):
         """Everything returned by dir should be indexable as an attribute."""
         a = Actor("alien")
         for attribute in dir(a):
             a.__getattr__(attribute)
+
+
+class SpriteGroupTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        pygame.init()
+        game.screen = pygame.display.set_mode((TEST_DISP_W, TEST_DISP_H))
+        set_root(__file__)
+
+    @classmethod
+    def tearDownClass(self):
+        game.screen = None
+        pygame.display.quit()
+
+    def setUp(self):
+        game.screen.fill((0, 0, 0))
+
+    def test_draw_matches_actor_draw(self):
+        """Drawing a group is the same as drawing each actor in turn."""
+        actors = [
+            Actor('alien', pos=(30, 40)),
+            Actor('alien', pos=(60.5, 50)),
+            Actor('alien', pos=(190, 95)),
+        ]
+        actors[1].angle = 30
+        actors[2].opacity = 0.5
+        for a in actors:
+            a.draw()
+        expected = game.screen.copy()
+
+        game.screen.fill((0, 0, 0))
+        SpriteGroup(actors).draw()
+        self.assertEqual(
+            pygame.image.tostring(game.screen, 'RGBA'),
+            pygame.image.tostring(expected, 'RGBA'),
+        )
+
+    def test_draw_skips_offscreen(self):
+        """Actors entirely outside the screen are not drawn."""
+        drawn = Actor('alien', topleft=(0, 0))
+        offscreen = Actor('alien', topleft=(TEST_DISP_W, 0))
+        offscreen._build_transformed_surf = None
+        SpriteGroup([drawn, offscreen]).draw()
+        self.assertNotEqual(game.screen.get_at((33, 46)), (0, 0, 0, 255))
@@ -1,9 +1,16 @@
 from unittest import TestCase
 from types import SimpleNamespace
+import contextlib
 import gc
+import io
 import weakref
 
-from pgzero.animation import animate
+import numpy as np
+
+from pgzero.animation import (
+    animate, tweener, cubic_bezier, use_lookup_tables, lookup_table,
+    TWEEN_FUNCTIONS, VECTORISED_TWEENS
+)
 from pgzero import clock
 
 
@@ -292,3 +299,250 @@ class AnimationTest(TestCase):
         # Ensure animation stopped and attr as expected.
         self.assertFalse(anim.running)
         self.assertEqual(test_obj.attr, expected_attr_val)
+
+    def test_named_clock(self):
+        """Animations can run on a named clock, and are paused with it."""
+        game_clock = clock.create('game', scale=0.5)
+        self.addCleanup(clock.remove, 'game')
+        obj = SimpleNamespace(attr=0)
+        animate(obj, duration=2, attr=2, clock='game')
+        clock.tick(1)
+        self.assertEqual(obj.attr, 0)
+
+        game_clock.tick(2)
+        self.assertEqual(obj.attr, 1)
+        game_clock.pause()
+        game_clock.tick(2)
+        self.assertEqual(obj.attr, 1)
+        game_clock.resume()
+        game_clock.tick(2)
+        self.assertEqual(obj.attr, 2)
+
+    def test_vectorised_tweens(self):
+        """The NumPy tween functions match the scalar ones."""
+        n = np.linspace(0, 1, 101)
+        for name, func in TWEEN_FUNCTIONS.items():
+            with self.subTest(tween=name):
+                expected = [func(v) for v in n.tolist()]
+                np.testing.assert_allclose(
+                    VECTORISED_TWEENS[func](n), expected, atol=1e-12
+                )
+
+    def test_many_animations_one_callback(self):
+        """All animations on a clock are stepped by a single callback."""
+        c = clock.Clock()
+        objs = [SimpleNamespace(x=0, pos=(0, 0)) for _ in range(100)]
+        for i, obj in enumerate(objs):
+            animate(obj, 'accel_decel', duration=2, clock=c, x=i, pos=(i, -i))
+        self.assertEqual(len(c._each_tick), 1)
+
+        c.tick(1)
+        self.assertEqual(objs[10].x, 5)
+        self.assertEqual(objs[10].pos, (5, -5))
+        c.tick(1.1)
+        self.assertEqual(objs[10].x, 10)
+
+        # With no animations left, the clock has nothing to fire
+        c.tick(1)
+        self.assertFalse(c.fired)
+
+    def test_user_tween_and_values(self):
+        """User tween functions and non-numeric values are supported."""
+        class Vec(tuple):
+            def __add__(self, other):
+                return Vec(a + b for a, b in zip(self, other))
+
+            def __sub__(self, other):
+                return Vec(a - b for a, b in zip(self, other))
+
+            def __mul__(self, n):
+                return Vec(a * n for a in self)
+
+        @tweener
+        def half_step(n):
+            return 0.0 if n < 0.5 else 1.0
+
+        self.addCleanup(TWEEN_FUNCTIONS.pop, 'half_step')
+        obj = SimpleNamespace(v=None, x=0)
+        obj.v = Vec((0, 0))
+        animate(obj, 'half_step', duration=4, v=Vec((4, 8)), x=4)
+        clock.tick(1)
+        self.assertEqual((obj.v, obj.x), ((0, 0), 0))
+        clock.tick(1)
+        self.assertEqual((obj.v, obj.x), ((4, 8), 4))
+
+    def test_error_stops_one_animation(self):
+        """An error setting one animation's target doesn't stop others."""
+        class Fussy:
+            x = 0
+
+            def __setattr__(self, k, v):
+                raise ValueError(v)
+
+        obj = SimpleNamespace(x=0)
+        animate(Fussy(), duration=2, x=2)
+        animate(obj, duration=2, x=2)
+        with contextlib.redirect_stderr(io.StringIO()):
+            clock.tick(1)
+        self.assertEqual(obj.x, 1)
+
+    def test_error_forgets_animation(self):
+        """An animation that raised is stopped, and can't stop others."""
+        class Fussy:
+            fail = True
+            _x = 0
+
+            @property
+            def x(self):
+                return self._x
+
+            @x.setter
+            def x(self, v):
+                if self.fail:
+                    raise ValueError(v)
+                self._x = v
+
+        fussy = Fussy()
+        bad = animate(fussy, duration=4, x=4)
+        objs = [SimpleNamespace(x=0) for _ in range(3)]
+        anims = [animate(o, duration=4, x=4) for o in objs]
+        with contextlib.redirect_stderr(io.StringIO()):
+            clock.tick(1)
+        self.assertFalse(bad.running)
+        self.assertNotIn(bad, bad.animations)
+
+        # Animating the same attribute again leaves the others alone
+        fussy.fail = False
+        animate(fussy, duration=4, x=8)
+        clock.tick(1)
+        self.assertEqual([o.x for o in objs], [2, 2, 2])
+        self.assertTrue(all(a.running for a in anims))
+        self.assertEqual(fussy.x, 2)
+
+    def test_clock_clear_stops_animations(self):
+        """Clearing a clock stops its animations for good."""
+        c = clock.Clock()
+        a = SimpleNamespace(x=0)
+        b = SimpleNamespace(x=0)
+        anim = animate(a, x=10, duration=10, clock=c)
+        c.tick(1)
+        c.clear()
+        self.assertFalse(anim.running)
+        animate(b, x=10, duration=10, clock=c)
+        c.tick(1)
+        self.assertEqual((a.x, b.x), (1, 1))
+
+    def test_cubic_bezier(self):
+        """Cubic Bezier tweens follow the curve, as in CSS."""
+        ease = cubic_bezier('test_ease', .25, .1, .25, 1)
+        self.addCleanup(TWEEN_FUNCTIONS.pop, 'test_ease')
+        self.assertIs(TWEEN_FUNCTIONS['test_ease'], ease)
+        self.assertEqual((ease(0), ease(1)), (0, 1))
+        self.assertAlmostEqual(ease(0.5), 0.8024033877, places=6)
+
+        n = np.linspace(0, 1, 101)
+        np.testing.assert_allclose(
+            VECTORISED_TWEENS[ease](n), [ease(v) for v in n.tolist()],
+            atol=1e-8
+        )
+
+        obj = SimpleNamespace(x=0)
+        animate(obj, 'test_ease', duration=2, x=100)
+        clock.tick(1)
+        self.assertAlmostEqual(obj.x, 80.24033877, places=4)
+
+    def test_cubic_bezier_invalid(self):
+        """The x coordinates of the control points must be in [0, 1]."""
+        with self.assertRaises(ValueError):
+            cubic_bezier('test_bad', 1.5, 0, 0.5, 1)
+        self.assertNotIn('test_bad', TWEEN_FUNCTIONS)
+
+    def test_cubic_bezier_replaced(self):
+        """Registering a curve again replaces the NumPy version too."""
+        old = cubic_bezier('test_replace', 0, 0, 1, 1)
+        self.addCleanup(TWEEN_FUNCTIONS.pop, 'test_replace')
+        new = cubic_bezier('test_replace', 0, 1, 0, 1)
+        self.addCleanup(VECTORISED_TWEENS.pop, new)
+        self.assertNotIn(old, VECTORISED_TWEENS)
+        self.assertIn(new, VECTORISED_TWEENS)
+
+        # Enough animations to be eased with the NumPy version
+        objs = [SimpleNamespace(x=0) for _ in range(40)]
+        for obj in objs:
+            animate(obj, 'test_replace', duration=2, x=100)
+        clock.tick(1)
+        for obj in objs:
+            self.assertAlmostEqual(obj.x, 100 * new(0.5), places=4)
+
+    def test_update_by_hand(self):
+        """An animation can be stepped by hand with update()."""
+        obj = SimpleNamespace(x=0, pos=(0, 0))
+        finished = []
+        anim = animate(
+            obj, x=10, pos=(4, 8), duration=2,
+            on_finished=lambda: finished.append(True)
+        )
+        anim.update(1)
+        self.assertEqual((obj.x, obj.pos), (5, (2, 4)))
+        self.assertEqual(anim.t, 1)
+        anim.update(1.5)
+        self.assertEqual((obj.x, obj.pos), (10, (4, 8)))
+        self.assertFalse(anim.running)
+        self.assertEqual(finished, [True])
+
+    def test_set_t(self):
+        """Setting t moves the animation to that time."""
+        obj = SimpleNamespace(x=0)
+        anim = animate(obj, x=10, duration=2)
+        anim.t = 1.5
+        self.assertEqual(anim.t, 1.5)
+        clock.tick(0.25)
+        self.assertEqual(obj.x, 8.75)
+        anim.stop()
+        anim.t = 0
+        self.assertEqual(anim.t, 0)
+
+    def test_lookup_tables(self):
+        """Lookup tables approximate the tween functions closely."""
+        self.assertIsNone(lookup_table(TWEEN_FUNCTIONS['linear']))
+        use_lookup_tables()
+        self.addCleanup(use_lookup_tables, False)
+
+        n = np.linspace(0, 1, 777)
+        for name, func in TWEEN_FUNCTIONS.items():
+            with self.subTest(tween=name):
+                table = lookup_table(func)
+                self.assertEqual(len(table), 1025)
+                self.assertEqual((table[0], table[-1]), (func(0), func(1)))
+                np.testing.assert_allclose(
+                    np.interp(n, np.linspace(0, 1, 1025), table),
+                    [func(v) for v in n.tolist()],
+                    atol=0.002
+                )
+
+        obj = SimpleNamespace(x=0)
+        animate(obj, 'in_out_elastic', duration=2, x=100)
+        clock.tick(0.7)
+        expected = 100 * TWEEN_FUNCTIONS['in_out_elastic'](0.35)
+        self.assertAlmostEqual(obj.x, expected, delta=0.01)
+        clock.tick(2)
+        self.assertEqual(obj.x, 100)
+
+    def test_lookup_table_for_new_tween(self):
+        """Tweens registered later get tables when first used."""
+        use_lookup_tables(resolution=4)
+        self.addCleanup(use_lookup_tables, False)
+
+        @tweener
+        def test_square(n):
+            return n * n
+
+        self.addCleanup(TWEEN_FUNCTIONS.pop, 'test_square')
+        obj = SimpleNamespace(x=0)
+        animate(obj, 'test_square', duration=1, x=16)
+        clock.tick(0.125)
+        # Interpolated between the samples at 0 and 0.25
+        self.assertAlmostEqual(obj.x, 0.5)
+        np.testing.assert_allclose(
+            lookup_table(test_square), [0, 0.0625, 0.25, 0.5625, 1]
+        )
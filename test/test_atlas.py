@@ -0,0 +1,108 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import pygame
+
+from pgzero import loaders
+from pgzero.atlas import pack
+from pgzero.loaders import ImageLoader
+from pgzero.runner import build_atlas
+
+
+class PackTest(unittest.TestCase):
+    def test_no_overlaps(self):
+        """Packed rectangles lie within their page and don't overlap."""
+        rng = random.Random(0)
+        sizes = [(rng.randint(1, 60), rng.randint(1, 60)) for _ in range(300)]
+        placed = pack(sizes, page_size=256, padding=1)
+        rects = {}
+        for (w, h), (page, x, y) in zip(sizes, placed):
+            r = pygame.Rect(x, y, w + 1, h + 1)
+            self.assertTrue(pygame.Rect(0, 0, 256, 256).contains(r))
+            rects.setdefault(page, []).append(r)
+        for page, rs in rects.items():
+            for i, r in enumerate(rs):
+                self.assertEqual(r.collidelist(rs[i + 1:]), -1)
+        # The rectangles cover about 300 * 30 * 30 pixels, or 4 pages
+        self.assertLessEqual(len(rects), 6)
+
+    def test_too_large(self):
+        """A rectangle larger than a page can't be packed."""
+        with self.assertRaises(ValueError):
+            pack([(10, 10), (300, 10)], page_size=256)
+
+
+class ImageAtlasTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((200, 200))
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.old_root = loaders.root
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        os.mkdir(os.path.join(self.root, 'images'))
+        rng = random.Random(1)
+        self.colors = {}
+        for i in range(10):
+            size = rng.randint(5, 40), rng.randint(5, 40)
+            self.save(f'img{i}', size)
+        self.save('big', (300, 20))
+        loaders.root = self.root
+
+    def tearDown(self):
+        loaders.root = self.old_root
+
+    def save(self, name, size):
+        color = (len(self.colors) * 20, 100, 200, 128)
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf.fill(color)
+        path = os.path.join(self.root, 'images', name + '.png')
+        pygame.image.save(surf, path)
+        self.colors[name] = color
+        return path
+
+    def test_build(self):
+        """Small images load as subsurfaces of the atlas."""
+        images = ImageLoader('images')
+        atlas = images.build_atlas()
+        self.assertEqual(len(atlas), 10)
+        self.assertEqual(len(atlas.pages), 1)
+        img = images.img3
+        self.assertIs(img.get_parent(), atlas.pages[0])
+        self.assertEqual(img.get_at((0, 0)), self.colors['img3'])
+        self.assertEqual(
+            img.get_at((img.get_width() - 1, img.get_height() - 1)),
+            self.colors['img3']
+        )
+        page, rect = atlas.source('img3')
+        self.assertIs(page, atlas.pages[0])
+        self.assertEqual(rect.size, img.get_size())
+
+        big = images.big
+        self.assertNotIn('big', atlas)
+        self.assertIsNone(big.get_parent())
+
+    def test_saved_atlas(self):
+        """A saved atlas is used automatically while it is up to date."""
+        build_atlas(self.root)
+        index = os.path.join(self.root, 'images', '.atlas', 'index.json')
+        self.assertTrue(os.path.exists(index))
+
+        images = ImageLoader('images')
+        self.assertIsNotNone(images.img0.get_parent())
+        self.assertEqual(images.img0.get_at((0, 0)), self.colors['img0'])
+
+        # Changing an image makes the atlas stale
+        self.save('img0', (8, 8))
+        images = ImageLoader('images')
+        self.assertIsNone(images.img1.get_parent())
+        self.assertEqual(images.img0.get_size(), (8, 8))
@@ -0,0 +1,308 @@
+import contextlib
+import gc
+import io
+import unittest
+from unittest.mock import Mock
+
+from pgzero import clock
+from pgzero.clock import Clock
+from pgzero.game import PGZeroGame
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def increment(self):
+        self.calls += 1
+
+    def tick(self, dt):
+        self.calls += 1
+
+
+class ClockTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.calls = []
+
+    def callback(self, name):
+        def cb():
+            self.calls.append(name)
+        cb.__name__ = name
+        return cb
+
+    def test_schedule(self):
+        """A scheduled callback fires once its delay has elapsed."""
+        cb = self.callback('a')
+        self.clock.schedule(cb, 1)
+        self.clock.tick(0.5)
+        self.assertEqual(self.calls, [])
+        self.clock.tick(0.5)
+        self.assertEqual(self.calls, ['a'])
+        self.clock.tick(5)
+        self.assertEqual(self.calls, ['a'])
+
+    def test_order(self):
+        """Events fire in time order, and in the order scheduled for ties."""
+        a, b, c = map(self.callback, 'abc')
+        self.clock.schedule(c, 2)
+        self.clock.schedule(a, 1)
+        self.clock.schedule(b, 1)
+        self.clock.tick(3)
+        self.assertEqual(self.calls, ['a', 'b', 'c'])
+
+    def test_unschedule(self):
+        """All instances of an unscheduled callback are cancelled."""
+        a, b = map(self.callback, 'ab')
+        self.clock.schedule(a, 1)
+        self.clock.schedule(a, 2)
+        self.clock.schedule_interval(b, 1)
+        self.clock.unschedule(a)
+        self.assertEqual(self.clock.queue_length, 1)
+        self.clock.tick(1)
+        self.clock.tick(1)
+        self.assertEqual(self.calls, ['b', 'b'])
+
+    def test_schedule_unique(self):
+        """schedule_unique() postpones an already scheduled callback."""
+        a = self.callback('a')
+        self.clock.schedule(a, 1)
+        self.clock.schedule_unique(a, 2)
+        self.clock.tick(1.5)
+        self.assertEqual(self.calls, [])
+        self.clock.tick(1)
+        self.assertEqual(self.calls, ['a'])
+
+    def test_unschedule_bound_method(self):
+        """Bound methods can be unscheduled through a new bound method."""
+        counter = Counter()
+        self.clock.schedule_interval(counter.increment, 1)
+        self.clock.unschedule(counter.increment)
+        self.clock.tick(3)
+        self.assertEqual(counter.calls, 0)
+
+    def test_weak_references(self):
+        """The clock does not keep objects with scheduled methods alive."""
+        counter = Counter()
+        self.clock.schedule(counter.increment, 1)
+        del counter
+        gc.collect()
+        self.clock.tick(2)
+        self.assertEqual(self.clock.queue_length, 0)
+        self.assertEqual(self.clock._index, {})
+
+    def test_compaction(self):
+        """Cancelled events don't build up in the heap."""
+        callbacks = [self.callback(str(i)) for i in range(100)]
+        for cb in callbacks:
+            self.clock.schedule(cb, 1)
+        for cb in callbacks[:90]:
+            self.clock.unschedule(cb)
+        self.assertEqual(self.clock.queue_length, 10)
+        self.assertLessEqual(len(self.clock.events), 20)
+        self.clock.tick(1)
+        self.assertEqual(self.calls, [str(i) for i in range(90, 100)])
+
+    def test_unschedule_during_tick(self):
+        """A callback can unschedule events that are due in the same tick."""
+        callbacks = [self.callback(str(i)) for i in range(10)]
+
+        def cancel_all():
+            for cb in callbacks:
+                self.clock.unschedule(cb)
+
+        self.clock.schedule(cancel_all, 1)
+        for cb in callbacks:
+            self.clock.schedule(cb, 1)
+        self.clock.tick(1)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.clock.queue_length, 0)
+
+
+class IntervalTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.times = []
+
+    def record(self):
+        self.times.append(self.clock.t)
+
+    def test_no_drift(self):
+        """Interval calls are scheduled from when they were due."""
+        self.clock.schedule_interval(self.record, 1)
+        for _ in range(10):
+            self.clock.tick(0.7)
+        self.assertEqual(len(self.times), 7)
+
+    def test_reuses_event(self):
+        """Rescheduling an interval does not create a new event."""
+        self.clock.schedule_interval(self.record, 1)
+        (_, _, ev), = self.clock.events
+        self.clock.tick(1)
+        self.assertIs(self.clock.events[0][2], ev)
+        self.assertEqual(ev.time, 2)
+
+    def test_missed_once(self):
+        """By default, missed calls are made once."""
+        self.clock.schedule_interval(self.record, 1)
+        self.clock.tick(3.5)
+        self.assertEqual(self.times, [3.5])
+        self.clock.tick(0.5)
+        self.assertEqual(self.times, [3.5, 4])
+
+    def test_missed_all(self):
+        """With missed='all', every missed call is made."""
+        self.clock.schedule_interval(self.record, 1, missed='all')
+        self.clock.tick(3.5)
+        self.assertEqual(self.times, [3.5] * 3)
+        self.clock.tick(0.5)
+        self.assertEqual(self.times, [3.5] * 3 + [4])
+
+    def test_missed_skip(self):
+        """With missed='skip', calls more than an interval late are dropped."""
+        self.clock.schedule_interval(self.record, 1, missed='skip')
+        # Only the call due at 3 is less than an interval late
+        self.clock.tick(3.5)
+        self.assertEqual(self.times, [3.5])
+        self.clock.tick(0.5)
+        self.assertEqual(self.times, [3.5, 4])
+
+    def test_missed_skip_latest(self):
+        """With missed='skip', the most recent missed call is made."""
+        self.clock.schedule_interval(self.record, 0.1, missed='skip')
+        self.clock.tick(1.05)
+        self.assertEqual(self.times, [1.05])
+
+    def test_invalid(self):
+        """Invalid intervals and policies are rejected."""
+        with self.assertRaises(ValueError):
+            self.clock.schedule_interval(self.record, 0)
+        with self.assertRaises(ValueError):
+            self.clock.schedule_interval(self.record, 1, missed='never')
+
+
+class EachTickTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.calls = []
+
+    def callback(self, name):
+        def cb(dt):
+            self.calls.append(name)
+        return cb
+
+    def test_priority(self):
+        """Callbacks are called in priority order, then in schedule order."""
+        a, b, c, d = [self.callback(n) for n in 'abcd']
+        self.clock.each_tick(a)
+        self.clock.each_tick(b, priority=1)
+        self.clock.each_tick(c, priority=-1)
+        self.clock.each_tick(d)
+        self.clock.tick(1)
+        self.assertEqual(self.calls, ['c', 'a', 'd', 'b'])
+
+    def test_no_rebuild(self):
+        """The list of callbacks is not rebuilt if none have died."""
+        cb = self.callback('a')
+        self.clock.each_tick(cb)
+        entries = self.clock._each_tick
+        self.clock.tick(1)
+        self.clock.tick(1)
+        self.assertIs(self.clock._each_tick, entries)
+        self.assertEqual(self.calls, ['a', 'a'])
+
+    def test_unschedule(self):
+        """Unscheduled callbacks are not called again."""
+        counter = Counter()
+        cb = self.callback('a')
+        self.clock.each_tick(cb)
+        self.clock.each_tick(counter.tick)
+        self.clock.unschedule(cb)
+        self.clock.unschedule(lambda: None)
+        self.clock.tick(1)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(len(self.clock._each_tick), 1)
+        self.assertEqual(len(self.clock._each_tick_index), 1)
+        self.assertEqual(counter.calls, 1)
+
+    def test_dead_callbacks_removed(self):
+        """Callbacks that have been garbage collected are removed."""
+        counter = Counter()
+        self.clock.each_tick(lambda dt: counter.increment())
+        gc.collect()
+        self.assertTrue(self.clock._each_tick_dirty)
+        self.clock.tick(1)
+        self.assertEqual(self.clock._each_tick, [])
+        self.assertEqual(self.clock._each_tick_index, {})
+        self.assertEqual(counter.calls, 0)
+
+    def test_error_removes_callback(self):
+        """A callback that raises an exception is not called again."""
+        def fail(dt):
+            self.calls.append('fail')
+            raise ValueError()
+
+        self.clock.each_tick(fail)
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.clock.tick(1)
+        self.clock.tick(1)
+        self.assertEqual(self.calls, ['fail'])
+        self.assertEqual(self.clock._each_tick, [])
+
+
+class NamedClockTest(unittest.TestCase):
+    def tearDown(self):
+        clock.named_clocks.clear()
+
+    def test_create(self):
+        """Named clocks can be created and looked up."""
+        c = clock.create('game', scale=0.5)
+        self.assertIs(clock.get('game'), c)
+        self.assertEqual(clock.all_clocks(), [clock.clock, c])
+        with self.assertRaises(ValueError):
+            clock.create('game')
+
+    def test_remove(self):
+        """Removing a named clock cancels its events."""
+        c = clock.create('game')
+        c.schedule(print, 1)
+        clock.remove('game')
+        self.assertEqual(c.queue_length, 0)
+        with self.assertRaises(KeyError):
+            clock.get('game')
+
+    def test_scale(self):
+        """A clock's time runs at its scale."""
+        c = Clock(scale=0.5)
+        dts = []
+        record = dts.append
+        c.each_tick(record)
+        c.tick(1)
+        self.assertEqual(c.t, 0.5)
+        self.assertEqual(dts, [0.5])
+
+    def test_pause(self):
+        """Nothing fires on a paused clock."""
+        c = Clock()
+        calls = []
+
+        def callback():
+            calls.append('a')
+
+        c.schedule(callback, 1)
+        c.pause()
+        c.tick(2)
+        self.assertEqual((c.t, calls), (0, []))
+        c.resume()
+        c.tick(1)
+        self.assertEqual(calls, ['a'])
+
+    def test_game_loop_ticks_named_clocks(self):
+        """The game loop ticks all named clocks."""
+        fast = clock.create('fast', scale=2)
+        paused = clock.create('paused')
+        paused.pause()
+        game = PGZeroGame(Mock())
+        game.step(1, None)
+        self.assertEqual(fast.t, 2)
+        self.assertEqual(paused.t, 0)
@@ -0,0 +1,67 @@
+"""Tests for the game loop's timing helpers."""
+import unittest
+from time import perf_counter, sleep
+
+from pgzero.game import FixedTimestep, FramePacer
+
+
+class FixedTimestepTest(unittest.TestCase):
+    def test_whole_steps(self):
+        """A frame lasting a whole number of steps runs that many steps."""
+        timestep = FixedTimestep(1 / 120)
+        self.assertEqual(timestep.advance(1 / 60), 2)
+        self.assertEqual(timestep.alpha, 0.0)
+
+    def test_remainder_carried(self):
+        """Time left over from a frame counts towards the next step."""
+        timestep = FixedTimestep(0.1)
+        self.assertEqual(timestep.advance(0.06), 0)
+        self.assertAlmostEqual(timestep.alpha, 0.6)
+        self.assertEqual(timestep.advance(0.06), 1)
+        self.assertAlmostEqual(timestep.alpha, 0.2)
+
+    def test_catch_up_capped(self):
+        """A very long frame runs at most max_steps steps."""
+        timestep = FixedTimestep(0.1, max_steps=3)
+        self.assertEqual(timestep.advance(10.05), 3)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+        self.assertEqual(timestep.advance(0.05), 1)
+
+
+class FramePacerTest(unittest.TestCase):
+    def test_paces_frames(self):
+        """Frames are yielded at the target frame rate."""
+        pacer = FramePacer(200)
+        start = perf_counter()
+        for i, dt in zip(range(21), pacer):
+            pass
+        elapsed = perf_counter() - start
+        self.assertGreaterEqual(elapsed, 0.1)
+        self.assertLess(elapsed, 0.2)
+        self.assertEqual(pacer.frames, 20)
+
+    def test_missed_deadline(self):
+        """A frame that takes too long is counted as a missed deadline."""
+        pacer = FramePacer(100)
+        frames = iter(pacer)
+        next(frames)
+        sleep(0.03)
+        dt = next(frames)
+        self.assertGreaterEqual(dt, 0.03)
+        self.assertEqual(pacer.missed, 1)
+        self.assertGreaterEqual(pacer.worst_lateness, 0.02)
+
+        # The next frame is paced from the late frame rather than run early
+        start = perf_counter()
+        next(frames)
+        self.assertGreaterEqual(perf_counter() - start, 0.009)
+
+    def test_learn_margin(self):
+        """The sleep margin adapts to late wake-ups, within bounds."""
+        pacer = FramePacer()
+        pacer._learn_margin(0.003)
+        self.assertEqual(pacer.margin, 0.003)
+        pacer._learn_margin(1.0)
+        self.assertEqual(pacer.margin, FramePacer.MAX_MARGIN)
+        pacer._learn_margin(0.0)
+        self.assertLess(pacer.margin, FramePacer.MAX_MARGIN)
@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pygame
+
+from pgzero import loaders
+from pgzero.imagecache import ImageCache, default_directory
+from pgzero.loaders import ImageLoader
+
+
+class ImageCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((200, 200))
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.cache = ImageCache(os.path.join(self.root, 'cache'))
+
+    def save(self, name, size=(20, 10), color=(255, 0, 0, 128)):
+        surf = pygame.Surface(size, pygame.SRCALPHA)
+        surf.fill(color)
+        surf.set_at((0, 0), (1, 2, 3, 4))
+        path = os.path.join(self.root, name + '.png')
+        pygame.image.save(surf, path)
+        return path
+
+    def test_hit(self):
+        """A cached image has the same pixels as the file."""
+        path = self.save('a')
+        self.assertIsNone(self.cache.get(path))
+        self.cache.put(path, pygame.image.load(path))
+        surf = self.cache.get(path)
+        self.assertEqual(surf.get_size(), (20, 10))
+        self.assertEqual(surf.get_at((0, 0)), (1, 2, 3, 4))
+        self.assertEqual(surf.get_at((19, 9)), (255, 0, 0, 128))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_stale(self):
+        """Changing the file makes its cached image stale."""
+        path = self.save('a')
+        self.cache.put(path, pygame.image.load(path))
+        self.save('a', size=(5, 5))
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+        self.assertIsNone(self.cache.get(path))
+
+    def test_damaged(self):
+        """A damaged entry is deleted, and treated as a miss."""
+        path = self.save('a')
+        self.cache.put(path, pygame.image.load(path))
+        entry = self.cache._entry_path(path)
+        with open(entry, 'r+b') as f:
+            f.truncate(100)
+        self.assertIsNone(self.cache.get(path))
+        self.assertFalse(os.path.exists(entry))
+
+    def test_evict(self):
+        """The least recently used images are evicted to stay under size."""
+        # Each entry is 16 + 20 * 10 * 4 = 816 bytes
+        self.cache.max_size = 2000
+        paths = [self.save('img%d' % i) for i in range(3)]
+        self.cache.put(paths[0], pygame.image.load(paths[0]))
+        self.cache.put(paths[1], pygame.image.load(paths[1]))
+        entry = self.cache._entry_path(paths[1])
+        os.utime(entry, ns=(0, 0))
+        self.cache.put(paths[2], pygame.image.load(paths[2]))
+        self.assertLessEqual(self.cache.size, 2000)
+        self.assertIsNotNone(self.cache.get(paths[0]))
+        self.assertIsNone(self.cache.get(paths[1]))
+        self.assertIsNotNone(self.cache.get(paths[2]))
+
+    def test_default_directory(self):
+        """By default, images are cached outside the game's directory."""
+        cache_home = os.path.join(self.root, 'cache_home')
+        with mock.patch.dict(os.environ, {'XDG_CACHE_HOME': cache_home}), \
+                mock.patch('platform.system', return_value='Linux'):
+            a = default_directory(os.path.join(self.root, 'game'))
+            b = default_directory(os.path.join(self.root, 'other', 'game'))
+        self.assertTrue(a.startswith(os.path.join(cache_home, 'pgzero')))
+        self.assertIn('game-', os.path.basename(a))
+        self.assertNotEqual(a, b)
+
+    def test_loader(self):
+        """The image loader uses the cache once it is enabled."""
+        old_root = loaders.root
+        self.addCleanup(setattr, loaders, 'root', old_root)
+        self.addCleanup(loaders.disable_image_cache)
+        loaders.root = self.root
+        os.mkdir(os.path.join(self.root, 'images'))
+        shutil.move(self.save('a'), os.path.join(self.root, 'images'))
+
+        cache = loaders.enable_image_cache(self.cache.directory)
+        ImageLoader('images').a
+        a = ImageLoader('images').a
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(a.get_at((0, 0)), (1, 2, 3, 4))
+        self.assertEqual(
+            os.listdir(os.path.join(self.root, 'images')), ['a.png']
+        )
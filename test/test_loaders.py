@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import wait
+
+import pygame
+
+from pgzero import loaders
+from pgzero.loaders import (
+    DirectoryIndex, ImageLoader, InvalidCase, SoundLoader, UnsupportedFormat,
+    set_root
+)
+
+
+class PrefetchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((200, 200))
+        set_root(__file__)
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def setUp(self):
+        self.images = ImageLoader('images')
+        self.sounds = SoundLoader('sounds')
+
+    def tearDown(self):
+        self.images.unload_all()
+        self.sounds.unload_all()
+
+    def wait(self, loader):
+        """Wait for the worker threads to finish decoding."""
+        wait(list(loader._pending.values()))
+
+    def test_prefetch(self):
+        """Prefetched images are finished off by poll()."""
+        progress = self.images.prefetch(['alien'])
+        self.assertEqual(progress.total, 1)
+        self.assertIn(self.images, loaders._loading)
+        self.wait(self.images)
+        self.assertEqual(progress.loaded, 0)
+        self.assertFalse(progress.done)
+
+        self.assertTrue(loaders.poll())
+        self.assertEqual((progress.loaded, progress.fraction), (1, 1.0))
+        self.assertTrue(progress.done)
+        self.assertNotIn(self.images, loaders._loading)
+        alien = self.images.load('alien')
+        self.assertEqual(alien.get_size(), (66, 92))
+        self.assertIs(self.images.alien, alien)
+
+    def test_load_while_pending(self):
+        """Loading a resource waits for it to be prefetched."""
+        self.images.prefetch('alien')
+        alien = self.images.alien
+        self.assertEqual(self.images._pending, {})
+        self.assertIs(self.images.load('alien'), alien)
+        self.assertNotIn(self.images, loaders._loading)
+
+    def test_prefetch_missing(self):
+        """Prefetching a resource that doesn't exist raises KeyError."""
+        with self.assertRaises(KeyError):
+            self.images.prefetch(['alien', 'no_such_image'])
+        self.assertEqual(self.images._pending, {})
+
+    def test_preload(self):
+        """preload() loads every resource in the directory."""
+        progress = self.images.preload()
+        self.assertEqual(progress.total, 2)
+        self.assertEqual(progress.fraction, 0.0)
+        self.wait(self.images)
+        while self.images.poll():
+            pass
+        self.assertTrue(progress.done)
+        self.assertEqual((progress.loaded, progress.fraction), (2, 1.0))
+        self.assertEqual(progress.failed, [])
+        progress.wait()
+        self.assertEqual(self.images.alien_as_webp.get_size(), (66, 92))
+
+    def test_preload_failures(self):
+        """preload() leaves resources that fail to load to be raised."""
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            self.skipTest("The mixer is not available")
+        progress = self.sounds.preload()
+        self.assertEqual(progress.total, 13)
+        self.wait(self.sounds)
+        while self.sounds.poll():
+            pass
+        self.assertTrue(progress.done)
+        self.assertIn('wav22kgsm', progress.failed)
+        self.assertIn('wav22k16bitpcm', [k[0] for k in self.sounds._cache])
+        with self.assertRaises(UnsupportedFormat):
+            progress.wait()
+
+    def test_unload_pending(self):
+        """Unloading a resource cancels its background load."""
+        self.images.prefetch(['alien'])
+        self.images.unload('alien')
+        self.assertEqual(self.images._pending, {})
+        self.assertNotIn(self.images, loaders._loading)
+
+
+class DirectoryIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.old_root = loaders.root
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        loaders.root = self.root
+        os.mkdir(os.path.join(self.root, 'images'))
+        for f in ['b.png', 'a.jpg', 'a.png', 'Big.png', 'notes.txt']:
+            self.touch(f)
+        os.mkdir(os.path.join(self.root, 'images', 'sub'))
+        self.touch('sub', 'c.gif')
+        self.index = DirectoryIndex(
+            os.path.join(self.root, 'images'), ImageLoader.EXTNS
+        )
+        self.index.refresh()
+
+    def tearDown(self):
+        loaders.root = self.old_root
+
+    def touch(self, *names):
+        open(os.path.join(self.root, 'images', *names), 'w').close()
+
+    def test_find(self):
+        """Names are found with the first of the loader's extensions."""
+        self.assertEqual(self.index.names, ['a', 'b'])
+        self.assertEqual(os.path.basename(self.index.find('a')), 'a.png')
+        self.assertEqual(os.path.basename(self.index.find('a.jpg')), 'a.jpg')
+        self.assertEqual(
+            self.index.find('sub/c'),
+            os.path.join(self.root, 'images', 'sub', 'c.gif')
+        )
+        with self.assertRaises(KeyError):
+            self.index.find('notes')
+        with self.assertRaises(KeyError):
+            self.index.find('sub/d')
+
+    def test_case(self):
+        """Names that differ only in case raise InvalidCase."""
+        with self.assertRaises(InvalidCase):
+            self.index.find('big')
+        with self.assertRaises(InvalidCase):
+            self.index.find('Big')
+        with self.assertRaises(InvalidCase):
+            self.index.find('A')
+
+    def test_added(self):
+        """Files added after the directory was listed are found."""
+        self.touch('d.bmp')
+        self.assertTrue(self.index.find('d').endswith('d.bmp'))
+        self.assertIn('d', self.index.names)
+
+    def test_loader(self):
+        """The loader lists its directory once, not on every load."""
+        images = ImageLoader('images')
+        self.assertEqual(images._find('b'), self.index.find('b'))
+        index = images._index
+        self.assertTrue(images.sub)
+        self.assertIs(images._index, index)
+        self.assertIn('b', dir(images))
+        self.assertNotIn('Big', dir(images))
@@ -0,0 +1,71 @@
+import unittest
+
+import pygame
+
+from pgzero.overlay import Overlay
+from pgzero import clock
+
+
+class OverlayTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    def setUp(self):
+        self.overlay = Overlay(visible=True)
+        self.surf = pygame.Surface((320, 240))
+        self.surf.fill((10, 20, 30))
+
+    def tearDown(self):
+        clock.clock.clear()
+
+    def test_toggle(self):
+        """The overlay can be toggled on and off."""
+        self.overlay.toggle()
+        self.assertFalse(self.overlay.visible)
+        self.overlay.toggle()
+        self.assertTrue(self.overlay.visible)
+
+    def test_stats(self):
+        """The stats include the frame time and clock queue length."""
+        clock.schedule(print, 10)
+        self.overlay.record_frame(0.02)
+        self.overlay.record_frame(0.01)
+        frame, counts, *_ = self.overlay.stats()
+        self.assertEqual(frame, "frame 15.0 ms  worst 20.0 ms")
+        self.assertTrue(counts.startswith("clock events 1 "))
+
+    def test_draw_and_restore(self):
+        """The overlay draws in the corner, and can be removed again."""
+        for _ in range(300):
+            self.overlay.record_frame(1 / 60)
+        rect = self.overlay.draw(self.surf)
+        self.assertEqual(rect.topleft, (0, 0))
+        self.assertEqual(rect.width, Overlay.WIDTH)
+        self.assertNotEqual(self.surf.get_at((0, 0)), (10, 20, 30))
+        self.assertEqual(self.surf.get_at((300, 200)), (10, 20, 30))
+
+        self.overlay.restore(self.surf)
+        self.assertEqual(
+            pygame.transform.average_color(self.surf)[:3],
+            (10, 20, 30)
+        )
+
+    def test_text_cached(self):
+        """Text is only re-rendered every few frames."""
+        self.overlay.draw(self.surf)
+        lines = self.overlay._lines
+        self.overlay.record_frame(1 / 60)
+        self.overlay.draw(self.surf)
+        self.assertIs(self.overlay._lines, lines)
+
+    def test_target_line(self):
+        """The reference line is drawn at the target frame time."""
+        gh = Overlay.GRAPH_HEIGHT
+        scale = gh / Overlay.GRAPH_MAX_MS
+        for fps in (60, 30):
+            overlay = Overlay(visible=True, target_ms=1000 / fps)
+            self.surf.fill((10, 20, 30))
+            overlay.draw(self.surf)
+            y = gh - round(1000 / fps * scale)
+            self.assertEqual(self.surf.get_at((1, y)), (0, 160, 0))
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+from time import sleep
+
+from pgzero.profiler import Profiler, PHASES
+
+
+class ProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.profiler = Profiler(history=4)
+
+    def test_disabled(self):
+        """When disabled, phases are not timed."""
+        with self.profiler.phase('update'):
+            sleep(0.002)
+        self.profiler.end_frame()
+        self.assertEqual(self.profiler.frames, 0)
+        self.assertEqual(self.profiler.percentiles('update'), [0, 0, 0])
+
+    def test_phases_summed_per_frame(self):
+        """Time spent in a phase is added up over the frame."""
+        self.profiler.enable()
+        for _ in range(2):
+            with self.profiler.phase('update'):
+                sleep(0.002)
+        self.profiler.end_frame()
+        self.assertEqual(self.profiler.frames, 1)
+        p50, p95, p99 = self.profiler.percentiles('update')
+        self.assertGreaterEqual(p50, 4)
+        self.assertEqual(self.profiler.percentiles('draw'), [0, 0, 0])
+        self.assertGreaterEqual(self.profiler.percentiles('frame')[0], 4)
+
+    def test_ring_buffer(self):
+        """Only the most recent frames are used for percentiles."""
+        self.profiler.enable()
+        for duration in (0.1, 0, 0, 0, 0):
+            with self.profiler.phase('draw'):
+                sleep(duration)
+            self.profiler.end_frame()
+        self.assertEqual(self.profiler.frames, 5)
+        self.assertLess(self.profiler.percentiles('draw')[2], 50)
+
+    def test_summary(self):
+        """The summary has a line for each phase and the whole frame."""
+        self.profiler.enable()
+        self.profiler.end_frame()
+        lines = self.profiler.summary().splitlines()
+        self.assertEqual(len(lines), len(PHASES) + 2)
+        self.assertTrue(lines[-1].startswith('frame'))
+
+    def test_write_trace(self):
+        """We can write a trace of phases as Chrome trace event JSON."""
+        self.profiler.enable(trace=True)
+        with self.profiler.phase('draw'):
+            with self.profiler.phase('text'):
+                pass
+        self.profiler.end_frame()
+
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            self.profiler.write_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+        finally:
+            os.unlink(path)
+        events = trace['traceEvents']
+        self.assertEqual([e['name'] for e in events], ['text', 'draw'])
+        text, draw = events
+        self.assertEqual(draw['ph'], 'X')
+        self.assertLessEqual(draw['ts'], text['ts'])
+        self.assertGreaterEqual(draw['dur'], text['dur'])
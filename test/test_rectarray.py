@@ -0,0 +1,96 @@
+import unittest
+
+import numpy as np
+import pygame
+
+from pgzero.actor import Actor
+from pgzero.loaders import set_root
+from pgzero.rect import ZRect
+from pgzero.rectarray import RectArray
+
+
+class RectArrayTest(unittest.TestCase):
+    def setUp(self):
+        self.rects = [
+            ZRect(0, 0, 10, 10),
+            ZRect(5, 5, 10, 10),
+            ZRect(100, 100, 1, 1),
+            ZRect(9.5, 0, 10, 10),
+        ]
+        self.arr = RectArray(self.rects)
+
+    def test_len_and_getitem(self):
+        self.assertEqual(len(self.arr), 4)
+        self.assertEqual(self.arr[1], ZRect(5, 5, 10, 10))
+        self.assertEqual(list(self.arr), self.rects)
+
+    def test_columns(self):
+        np.testing.assert_array_equal(self.arr.x, [0, 5, 100, 9.5])
+        self.arr.x[0] = 3
+        self.assertEqual(self.arr[0], ZRect(3, 0, 10, 10))
+
+    def test_collidepoint(self):
+        """collidepoint() agrees with ZRect.collidepoint()."""
+        for pos in [(0, 0), (9.9, 9.9), (10, 10), (100, 100), (-1, 5)]:
+            expected = [r.collidepoint(pos) for r in self.rects]
+            self.assertEqual(self.arr.collidepoint(pos).tolist(), expected)
+
+    def test_colliderect(self):
+        """colliderect() agrees with ZRect.colliderect()."""
+        for other in [(0, 0, 5, 5), (10, 10, 1, 1), (-5, -5, 5, 5)]:
+            expected = [r.colliderect(other) for r in self.rects]
+            self.assertEqual(self.arr.colliderect(other).tolist(), expected)
+
+    def test_collidelist(self):
+        self.assertEqual(self.arr.collidelist((9, 9, 1, 1)), 0)
+        self.assertEqual(self.arr.collidelist((50, 50, 1, 1)), -1)
+        self.assertEqual(self.arr.collidelistall((9, 9, 1, 1)), [0, 1, 3])
+
+    def test_collide_pairs_self(self):
+        """Pairs within one array are found once each."""
+        i, j = self.arr.collide_pairs()
+        self.assertEqual(
+            sorted(zip(i.tolist(), j.tolist())),
+            [(0, 1), (0, 3), (1, 3)]
+        )
+
+    def test_collide_pairs_other(self):
+        """collide_pairs() finds the same pairs as a loop over ZRects."""
+        rng = np.random.default_rng(0)
+        a = RectArray.from_arrays(*rng.uniform(0, 100, (2, 1500)), 5, 5)
+        b = RectArray.from_arrays(*rng.uniform(0, 100, (2, 40)), 3, 8)
+        i, j = a.collide_pairs(b)
+        expected = [
+            (n, m)
+            for n, ra in enumerate(a)
+            for m, rb in enumerate(b)
+            if ra.colliderect(rb)
+        ]
+        self.assertEqual(sorted(zip(i.tolist(), j.tolist())), expected)
+
+    def test_empty(self):
+        i, j = RectArray().collide_pairs()
+        self.assertEqual(len(i), 0)
+        self.assertEqual(len(j), 0)
+
+
+class RectArrayActorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+        set_root(__file__)
+
+    @classmethod
+    def tearDownClass(cls):
+        pygame.display.quit()
+
+    def test_from_actors(self):
+        """Actors can be put into a RectArray, and updated when they move."""
+        actors = [Actor('alien', topleft=(0, 0)), Actor('alien')]
+        arr = RectArray(actors)
+        self.assertEqual(arr[0], actors[0]._rect)
+        actors[1].left = 200
+        arr.update(actors)
+        self.assertEqual(arr.collidelistall((150, 10, 60, 10)), [1])
+        self.assertEqual(arr.colliderect(actors[0]).tolist(), [True, False])
@@ -3,11 +3,15 @@
 This module is also a Pygame Zero game so that we can run it with pgzero.
 
 """
+import json
+import os
 import sys
+import tempfile
 import unittest
 from pathlib import Path
+from types import ModuleType
 
-from pgzero.runner import load_and_run
+from pgzero.runner import load_and_run, run_mod
 from pgzero import clock
 
 game_tests = Path(__file__).parent / 'game_tests'
@@ -45,3 +49,58 @@ class RunnerTest(unittest.TestCase):
     def test_run_directory_run_game(self):
         """We can run a directory containing run_game.py"""
         self.assert_runnable(game_tests / 'blue')
+
+    def test_headless_max_frames(self):
+        """A game run headless with max_frames exits after those frames."""
+        load_and_run(
+            str(game_tests / 'utf8.py'),
+            headless=True,
+            max_frames=3,
+            sleep=False,
+        )
+
+    def test_no_sleep(self):
+        """Without sleeping, update() is passed a fixed time step."""
+        dts = []
+        mod = ModuleType('simulated')
+        mod.WIDTH = mod.HEIGHT = 100
+        mod.update = lambda dt: dts.append(dt)
+
+        def draw():
+            raise AssertionError("draw() should not be called")
+
+        mod.draw = draw
+        run_mod(mod, max_frames=600, sleep=False, draw=False)
+        self.assertEqual(dts, [1 / 60] * 600)
+
+    def test_update_rate(self):
+        """With UPDATE_RATE, update() is called in fixed steps."""
+        dts = []
+        alphas = []
+        mod = ModuleType('simulated')
+        mod.WIDTH = mod.HEIGHT = 100
+        mod.UPDATE_RATE = 120
+        mod.update = lambda dt: dts.append(dt)
+        mod.draw = lambda alpha: alphas.append(alpha)
+
+        run_mod(mod, max_frames=60, sleep=False)
+        self.assertEqual(dts, [1 / 120] * 120)
+        self.assertEqual(alphas, [0.0] * 60)
+
+    def test_profile(self):
+        """We can profile a game, writing a trace file."""
+        mod = ModuleType('simulated')
+        mod.WIDTH = mod.HEIGHT = 100
+        mod.update = lambda: None
+        mod.draw = lambda: None
+
+        fd, path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            run_mod(mod, max_frames=5, sleep=False, profile=path)
+            with open(path) as f:
+                trace = json.load(f)
+        finally:
+            os.unlink(path)
+        names = {e['name'] for e in trace['traceEvents']}
+        self.assertLessEqual({'events', 'update', 'draw', 'flip'}, names)
@@ -9,7 +9,7 @@ import pygame
 import pygame.image
 import pygame.surfarray
 
-from pgzero.screen import Screen
+from pgzero.screen import Screen, merge_rects
 from pgzero.loaders import set_root, images
 from pgzero.rect import Rect, ZRect
 
@@ -238,6 +238,51 @@ class ScreenTest(unittest.TestCase):
             ZRect(0, 0, 200, 200)
         )
 
+    def test_dirty_not_tracked_by_default(self):
+        """Drawing does not record dirty rects unless enabled."""
+        self.screen.blit('alien', (0, 0))
+        self.assertIsNone(self.screen._dirty)
+
+    def test_dirty_rects(self):
+        """Blits and drawing record the areas of the screen changed."""
+        self.screen._track_dirty(True)
+        self.assertEqual(self.screen._take_dirty(), [Rect(0, 0, 200, 200)])
+
+        self.screen.blit('alien', (10, 20))
+        self.screen.draw.filled_rect(Rect(150, 150, 10, 10), 'red')
+        self.screen.draw.line((0, 199), (20, 199), 'red')
+        self.assertEqual(
+            self.screen._take_dirty(),
+            [Rect(10, 20, 66, 92), Rect(150, 150, 10, 10), Rect(0, 199, 21, 1)]
+        )
+        self.assertEqual(self.screen._take_dirty(), [])
+
+        self.screen.clear()
+        self.assertEqual(self.screen._take_dirty(), [Rect(0, 0, 200, 200)])
+        self.screen._track_dirty(False)
+
+    def test_merge_rects(self):
+        """Overlapping rects are merged, and rects are clipped to bounds."""
+        bounds = Rect(0, 0, 100, 100)
+        self.assertEqual(
+            merge_rects(
+                [(0, 0, 10, 10), (50, 50, 5, 5), (5, 5, 10, 10),
+                 (90, 90, 20, 20), (200, 200, 5, 5)],
+                bounds
+            ),
+            [Rect(50, 50, 5, 5), Rect(0, 0, 15, 15), Rect(90, 90, 10, 10)]
+        )
+
+    def test_merge_rects_chain(self):
+        """A rect that joins two merged rects merges all three."""
+        self.assertEqual(
+            merge_rects(
+                [(0, 0, 10, 10), (20, 0, 10, 10), (5, 0, 20, 5)],
+                Rect(0, 0, 100, 100)
+            ),
+            [Rect(0, 0, 30, 10)]
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,119 @@
+import random
+import unittest
+
+from pgzero.rect import ZRect
+from pgzero.spatial import SpatialHash, QuadTree
+
+
+def random_rects(rng, n, extent=500):
+    return [
+        ZRect(
+            rng.uniform(-20, extent),
+            rng.uniform(-20, extent),
+            rng.uniform(1, 40),
+            rng.uniform(1, 40),
+        )
+        for _ in range(n)
+    ]
+
+
+class SpatialIndexTests:
+    """Tests common to all spatial index implementations."""
+
+    def make_index(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.rng = random.Random(1)
+        self.rects = random_rects(self.rng, 300)
+        self.index = self.make_index()
+        for r in self.rects:
+            self.index.insert(r)
+
+    def assertSameObjects(self, found, expected):
+        self.assertEqual(
+            sorted(map(id, found)),
+            sorted(map(id, expected))
+        )
+
+    def test_len_contains(self):
+        self.assertEqual(len(self.index), 300)
+        self.assertIn(self.rects[0], self.index)
+        self.assertNotIn(ZRect(0, 0, 1, 1), self.index)
+
+    def test_query_rect(self):
+        """query_rect() finds the same objects as colliderect()."""
+        for q in random_rects(self.rng, 50):
+            self.assertSameObjects(
+                self.index.query_rect(q),
+                [r for r in self.rects if r.colliderect(q)]
+            )
+
+    def test_query_point(self):
+        for _ in range(50):
+            p = self.rng.uniform(0, 500), self.rng.uniform(0, 500)
+            self.assertSameObjects(
+                self.index.query_point(p),
+                [r for r in self.rects if r.collidepoint(p)]
+            )
+
+    def test_query_point_on_edge(self):
+        r = ZRect(250, 250, 10, 10)
+        self.index.insert(r)
+        self.assertIn(r, self.index.query_point((250, 250)))
+
+    def test_query_circle(self):
+        near = ZRect(100, 100, 10, 10)
+        far = ZRect(120, 120, 10, 10)
+        index = self.make_index()
+        index.insert(near)
+        index.insert(far)
+        self.assertSameObjects(index.query_circle((105, 90), 12), [near])
+
+    def test_refresh_after_move(self):
+        """Objects that have moved are found at their new position."""
+        for r in self.rects[:100]:
+            r.move_ip(self.rng.uniform(-100, 100), self.rng.uniform(-100, 100))
+        self.index.refresh()
+        for q in random_rects(self.rng, 50):
+            self.assertSameObjects(
+                self.index.query_rect(q),
+                [r for r in self.rects if r.colliderect(q)]
+            )
+
+    def test_remove(self):
+        r = self.rects[0]
+        self.index.remove(r)
+        self.assertNotIn(r, self.index.query_rect(r))
+        with self.assertRaises(KeyError):
+            self.index.remove(r)
+        self.index.discard(r)
+
+    def test_collisions_excludes_self(self):
+        r = self.rects[0]
+        found = self.index.collisions(r)
+        self.assertNotIn(r, found)
+        self.assertSameObjects(
+            found,
+            [o for o in self.rects if o is not r and o.colliderect(r)]
+        )
+
+    def test_outside_bounds(self):
+        r = ZRect(-1000, -1000, 5, 5)
+        self.index.insert(r)
+        self.assertSameObjects(self.index.query_point((-998, -998)), [r])
+
+    def test_clear(self):
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.query_rect((0, 0, 500, 500)), [])
+
+
+class SpatialHashTest(SpatialIndexTests, unittest.TestCase):
+    def make_index(self):
+        return SpatialHash(cell_size=32)
+
+
+class QuadTreeTest(SpatialIndexTests, unittest.TestCase):
+    def make_index(self):
+        return QuadTree((0, 0, 500, 500), max_items=4)
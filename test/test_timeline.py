@@ -0,0 +1,218 @@
+import unittest
+from fractions import Fraction
+from types import SimpleNamespace
+
+from pgzero.animation import animate, TWEEN_FUNCTIONS
+from pgzero.clock import Clock
+from pgzero.timeline import (
+    Timeline, tween, delay, call, sequence, parallel
+)
+
+
+class TimelineTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = Clock()
+        self.obj = SimpleNamespace(x=0, pos=(0, 0))
+        self.calls = []
+
+    def tearDown(self):
+        for tl in list(Timeline.playing):
+            tl.stop()
+
+    def record(self, name):
+        self.calls.append(name)
+
+    def timeline(self, *steps, **kwargs):
+        return Timeline(*steps, clock=self.clock, **kwargs)
+
+    def test_sequence(self):
+        """Steps run one after another, each from the last's target."""
+        obj = self.obj
+        tl = self.timeline(
+            tween(obj, x=10, duration=1),
+            delay(1),
+            tween(obj, x=20, pos=(4, 8), duration=2),
+        ).play()
+        self.assertEqual(tl.duration, 4)
+        self.clock.tick(0.5)
+        self.assertEqual(obj.x, 5)
+        self.clock.tick(1)
+        self.assertEqual(obj.x, 10)
+        self.clock.tick(1.5)
+        self.assertEqual((obj.x, obj.pos), (15, (2, 4)))
+        self.clock.tick(5)
+        self.assertEqual((obj.x, obj.pos), (20, (4, 8)))
+        self.assertFalse(tl.running)
+
+    def test_parallel(self):
+        """Parallel steps run together, for as long as the longest."""
+        a = SimpleNamespace(x=0)
+        b = SimpleNamespace(y=0)
+        tl = self.timeline(
+            parallel(
+                tween(a, x=4, duration=4),
+                tween(b, y=2, duration=2, tween='accelerate'),
+            ),
+            call(self.record, 'done'),
+        ).play()
+        self.assertEqual(tl.duration, 4)
+        self.clock.tick(1)
+        self.assertEqual((a.x, b.y), (1, 0.5))
+        self.clock.tick(2)
+        self.assertEqual((a.x, b.y), (3, 2))
+        self.assertEqual(self.calls, [])
+        self.clock.tick(1)
+        self.assertEqual(self.calls, ['done'])
+
+    def test_one_callback(self):
+        """A timeline over many objects uses one clock callback."""
+        objs = [SimpleNamespace(x=0) for _ in range(20)]
+        self.timeline(
+            parallel(*(tween(o, x=i, duration=1) for i, o in enumerate(objs))),
+            sequence(*(tween(o, x=0, duration=0.1) for o in objs)),
+        ).play()
+        self.assertEqual(len(self.clock._each_tick), 1)
+        self.clock.tick(1)
+        self.assertEqual([o.x for o in objs], list(range(20)))
+        self.clock.tick(2.5)
+        self.assertEqual([o.x for o in objs], [0] * 20)
+        self.assertEqual(len(self.clock._each_tick), 0)
+
+    def test_staggered(self):
+        """Segments starting and ending at different times are all tweened.
+        """
+        objs = [SimpleNamespace(x=0, pos=(0, 0), f=Fraction(0)) for _ in range(5)]
+        self.timeline(parallel(*(
+            sequence(
+                delay(i * 0.25),
+                tween(o, 'decelerate', 1, x=10, pos=(10, -10), f=Fraction(10)),
+            )
+            for i, o in enumerate(objs)
+        ))).play()
+        decelerate = TWEEN_FUNCTIONS['decelerate']
+        for _ in range(12):
+            self.clock.tick(0.125)
+            for i, o in enumerate(objs):
+                n = min(max(self.clock.t - i * 0.25, 0), 1)
+                x = 10 * decelerate(n)
+                self.assertAlmostEqual(o.x, x)
+                self.assertEqual(o.pos, (o.x, -o.x))
+                self.assertAlmostEqual(o.f, x)
+
+    def test_calls(self):
+        """Calls are made once their time has passed, in order."""
+        self.timeline(
+            call(self.record, 'a'),
+            delay(1),
+            call(self.record, 'b'),
+            call(self.record, 'c'),
+            delay(1),
+            on_finished=lambda: self.record('finished'),
+        ).play()
+        self.assertEqual(self.calls, ['a'])
+        self.clock.tick(5)
+        self.assertEqual(self.calls, ['a', 'b', 'c', 'finished'])
+
+    def test_repeat(self):
+        """Repeats restart from the initial values."""
+        obj = self.obj
+        tl = self.timeline(
+            tween(obj, x=10, duration=1),
+            call(self.record, 'end'),
+            repeat=3,
+        ).play()
+        self.assertEqual(tl.total_duration, 3)
+        self.clock.tick(1.5)
+        self.assertEqual(obj.x, 5)
+        self.assertEqual(self.calls, ['end'])
+        # A long tick makes all of the calls it passes
+        self.clock.tick(5)
+        self.assertEqual(obj.x, 10)
+        self.assertEqual(self.calls, ['end'] * 3)
+        self.assertFalse(tl.running)
+
+    def test_yoyo(self):
+        """With yoyo, every other repetition runs backwards."""
+        obj = self.obj
+        tl = self.timeline(
+            call(self.record, 'start'),
+            tween(obj, x=10, duration=1),
+            call(self.record, 'end'),
+            repeat=None,
+            yoyo=True,
+        ).play()
+        self.assertIsNone(tl.total_duration)
+        self.clock.tick(0.5)
+        self.assertEqual(obj.x, 5)
+        self.clock.tick(1)
+        self.assertEqual(obj.x, 5)
+        self.clock.tick(0.25)
+        self.assertEqual(obj.x, 2.5)
+        self.clock.tick(0.5)
+        self.assertEqual(obj.x, 2.5)
+        # Calls at the turns are made once
+        self.assertEqual(self.calls, ['start', 'end', 'start'])
+        tl.stop()
+        self.clock.tick(1)
+        self.assertEqual(obj.x, 2.5)
+
+    def test_stop_complete(self):
+        """Stopping with complete=True sets the final values."""
+        obj = self.obj
+        tl = self.timeline(
+            tween(obj, x=10, duration=1),
+            repeat=2,
+            yoyo=True,
+            on_finished=lambda: self.record('finished'),
+        ).play()
+        self.clock.tick(0.5)
+        tl.stop(complete=True)
+        self.assertEqual(obj.x, 0)
+        self.assertFalse(tl.running)
+        self.assertEqual(self.calls, [])
+        self.assertNotIn(tl, Timeline.playing)
+
+    def test_play_again(self):
+        """Playing again starts from the attributes' current values."""
+        obj = self.obj
+        tl = self.timeline(tween(obj, x=10, duration=1))
+        tl.play()
+        self.clock.tick(0.5)
+        obj.x = 20
+        tl.play()
+        self.clock.tick(0.5)
+        self.assertEqual(obj.x, 15)
+
+    def test_call_stops_timeline(self):
+        """A call may stop the timeline that made it."""
+        obj = self.obj
+        tl = self.timeline(
+            tween(obj, x=10, duration=1),
+            call(lambda: tl.stop()),
+            call(self.record, 'never'),
+            tween(obj, x=20, duration=1),
+        ).play()
+        self.clock.tick(1)
+        self.clock.tick(1)
+        self.assertEqual(obj.x, 10)
+        self.assertFalse(tl.running)
+        self.assertEqual(self.calls, [])
+
+    def test_stops_animation(self):
+        """Playing a timeline stops animate() on the same attributes."""
+        obj = self.obj
+        animate(obj, x=100, duration=1, clock=self.clock)
+        self.timeline(tween(obj, x=10, duration=1)).play()
+        self.clock.tick(0.5)
+        self.assertEqual(obj.x, 5)
+
+    def test_invalid(self):
+        """Bad steps are reported when the timeline is made."""
+        with self.assertRaises(ValueError):
+            tween(self.obj, y=1)
+        with self.assertRaises(KeyError):
+            tween(self.obj, 'bounce_ned', x=1)
+        with self.assertRaises(ValueError):
+            delay(-1)
+        with self.assertRaises(ValueError):
+            self.timeline(delay(1), repeat=0)